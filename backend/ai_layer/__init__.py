@@ -16,6 +16,13 @@ Usage:
     pipeline.run_scraper()
 """
 
-from ai_layer.pipeline import ArgusAIPipeline
-
 __all__ = ["ArgusAIPipeline"]
+
+
+def __getattr__(name):
+    # Imported lazily so that `from ai_layer import admission` (and the API
+    # process start-up) does not pull in the whole pipeline.
+    if name == "ArgusAIPipeline":
+        from ai_layer.pipeline import ArgusAIPipeline
+        return ArgusAIPipeline
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
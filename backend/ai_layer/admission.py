@@ -0,0 +1,159 @@
+"""
+ai_layer/admission.py
+=====================
+Per-engine admission control and graceful load shedding.
+
+Every expensive engine (Bedrock text, Bedrock vision, the LLM explainer and
+Playwright extraction) is guarded by a concurrency limit and a queue-time
+budget. A caller waits at most `queue_budget` seconds for a slot; if none
+frees up it is *not* queued further — the caller degrades to the engine's
+local fallback instead, so a slow upstream cannot pile requests up without
+bound.
+
+Limits are configured per engine from the environment:
+    ADMISSION_<ENGINE>_CONCURRENCY   max in-flight calls      (e.g. ADMISSION_LLM_TEXT_CONCURRENCY)
+    ADMISSION_<ENGINE>_QUEUE_BUDGET  max seconds to wait for a slot
+
+Usage (sync, from a worker thread):
+    with admission.admit("llm_text") as admitted:
+        if not admitted:
+            return local_fallback()
+        return call_bedrock()
+
+Usage (async, from the event loop):
+    async with admission.admit_async("extraction") as admitted:
+        ...
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from typing import Optional
+
+from ai_layer import metrics
+
+logger = logging.getLogger(__name__)
+
+LLM_TEXT      = "llm_text"
+LLM_VISION    = "llm_vision"
+LLM_EXPLAINER = "llm_explainer"
+EXTRACTION    = "extraction"
+
+# engine → (max concurrency, queue budget in seconds)
+_DEFAULT_LIMITS: dict[str, tuple[int, float]] = {
+    LLM_TEXT:      (16, 2.0),
+    LLM_VISION:    (8, 2.0),
+    LLM_EXPLAINER: (16, 1.0),
+    EXTRACTION:    (4, 3.0),
+}
+
+
+class EngineLimiter:
+    """
+    Concurrency limit + queue-time budget for a single engine.
+
+    A limiter is used either from worker threads (admit) or from the event
+    loop (admit_async); each mode has its own slot pool.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, queue_budget: float):
+        self.name            = name
+        self.max_concurrency = max_concurrency
+        self.queue_budget    = queue_budget
+        self._sem            = threading.BoundedSemaphore(max_concurrency)
+        self._async_sem: Optional[asyncio.Semaphore] = None
+        self._lock           = threading.Lock()
+        self._in_flight      = 0
+        self._admitted       = 0
+        self._degraded       = 0
+
+    def _record(self, admitted: bool) -> None:
+        with self._lock:
+            if admitted:
+                self._admitted  += 1
+                self._in_flight += 1
+            else:
+                self._degraded += 1
+        if not admitted:
+            metrics.FALLBACKS.inc(engine=self.name, reason="admission")
+            logger.warning(
+                f"Admission: {self.name} saturated ({self.max_concurrency} in flight, "
+                f"waited {self.queue_budget}s) — degrading to local fallback"
+            )
+
+    def _release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    @contextmanager
+    def admit(self):
+        """Yield True if a slot was obtained within the budget, else False."""
+        acquired = self._sem.acquire(timeout=self.queue_budget)
+        self._record(acquired)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                self._sem.release()
+                self._release()
+
+    @asynccontextmanager
+    async def admit_async(self):
+        """Async variant of admit() for engines that run on the event loop."""
+        if self._async_sem is None:
+            self._async_sem = asyncio.Semaphore(self.max_concurrency)
+        sem = self._async_sem
+        acquired = False
+        if not sem.locked():
+            await sem.acquire()
+            acquired = True
+        elif self.queue_budget > 0:
+            try:
+                await asyncio.wait_for(sem.acquire(), timeout=self.queue_budget)
+                acquired = True
+            except asyncio.TimeoutError:
+                pass
+        self._record(acquired)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                sem.release()
+                self._release()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "queue_budget":    self.queue_budget,
+                "in_flight":       self._in_flight,
+                "admitted":        self._admitted,
+                "degraded":        self._degraded,
+            }
+
+
+def _from_env(name: str) -> EngineLimiter:
+    concurrency, budget = _DEFAULT_LIMITS[name]
+    prefix = f"ADMISSION_{name.upper()}"
+    return EngineLimiter(
+        name,
+        max_concurrency=int(os.getenv(f"{prefix}_CONCURRENCY", str(concurrency))),
+        queue_budget=float(os.getenv(f"{prefix}_QUEUE_BUDGET", str(budget))),
+    )
+
+
+limiters: dict[str, EngineLimiter] = {name: _from_env(name) for name in _DEFAULT_LIMITS}
+
+
+def admit(name: str):
+    return limiters[name].admit()
+
+
+def admit_async(name: str):
+    return limiters[name].admit_async()
+
+
+def stats() -> dict:
+    return {name: limiter.stats() for name, limiter in limiters.items()}
@@ -0,0 +1,132 @@
+"""
+ai_layer/aws_clients.py
+=======================
+Process-wide registry of pooled boto3 clients and resources.
+
+Creating a boto3 client resolves credentials, loads the endpoint model and
+opens a fresh connection pool, which costs 100-300 ms on a cold path. Every
+module that talks to Bedrock or DynamoDB should fetch its client from here
+so that work happens once per process and TLS connections are kept alive.
+
+Low-level clients are thread-safe and shared by every thread. boto3 resources
+are not, so resources (and the DynamoDB Table objects built from them) are
+cached once per thread instead.
+
+Callers with a latency budget can ask for a variant client with a shorter
+read timeout and fewer attempts; each variant is created once and shared
+like the default one.
+
+Usage:
+    from ai_layer.aws_clients import get_client, get_table
+
+    bedrock = get_client("bedrock-runtime")
+    fast    = get_client("bedrock-runtime", read_timeout=10, max_attempts=1)
+    table   = get_table()
+"""
+
+import os
+import threading
+from typing import Optional
+
+# ---------------------------------------------------------------------------
+# Connection tuning (overridable via environment)
+# ---------------------------------------------------------------------------
+MAX_POOL_CONNECTIONS: int = int(os.getenv("AWS_MAX_POOL_CONNECTIONS", "50"))
+CONNECT_TIMEOUT: float = float(os.getenv("AWS_CONNECT_TIMEOUT", "3"))
+READ_TIMEOUT: float = float(os.getenv("AWS_READ_TIMEOUT", "30"))
+MAX_ATTEMPTS: int = int(os.getenv("AWS_MAX_ATTEMPTS", "3"))
+
+_lock = threading.Lock()
+_clients: dict[tuple, object] = {}
+_local = threading.local()
+_generation = 0   # bumped by reset() so other threads drop their resources
+
+
+def _region(region_name: Optional[str]) -> str:
+    return region_name or os.getenv("AWS_REGION", "ap-south-1")
+
+
+def _config(read_timeout: Optional[float] = None, max_attempts: Optional[int] = None):
+    from botocore.config import Config
+
+    return Config(
+        max_pool_connections=MAX_POOL_CONNECTIONS,
+        connect_timeout=CONNECT_TIMEOUT,
+        read_timeout=READ_TIMEOUT if read_timeout is None else read_timeout,
+        tcp_keepalive=True,
+        retries={
+            "max_attempts": MAX_ATTEMPTS if max_attempts is None else max_attempts,
+            "mode": "adaptive",
+        },
+    )
+
+
+def get_client(
+    service_name: str,
+    region_name: Optional[str] = None,
+    read_timeout: Optional[float] = None,
+    max_attempts: Optional[int] = None,
+):
+    """
+    Return the shared low-level client for (service, region), creating it once.
+
+    read_timeout / max_attempts override AWS_READ_TIMEOUT / AWS_MAX_ATTEMPTS;
+    every distinct combination is its own cached client.
+    """
+    key = (service_name, _region(region_name), read_timeout, max_attempts)
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                import boto3
+
+                client = boto3.client(
+                    key[0], region_name=key[1], config=_config(read_timeout, max_attempts)
+                )
+                _clients[key] = client
+    return client
+
+
+def _thread_cache(name: str) -> dict:
+    if getattr(_local, "generation", None) != _generation:
+        _local.__dict__.clear()
+        _local.generation = _generation
+    cache = getattr(_local, name, None)
+    if cache is None:
+        cache = {}
+        setattr(_local, name, cache)
+    return cache
+
+
+def get_resource(service_name: str, region_name: Optional[str] = None):
+    """Return this thread's cached resource for (service, region)."""
+    key = (service_name, _region(region_name))
+    resources = _thread_cache("resources")
+    resource = resources.get(key)
+    if resource is None:
+        import boto3
+
+        resource = boto3.resource(key[0], region_name=key[1], config=_config())
+        resources[key] = resource
+    return resource
+
+
+def get_table(table_name: Optional[str] = None, region_name: Optional[str] = None):
+    """Return this thread's cached DynamoDB Table (defaults to DYNAMODB_TABLE)."""
+    name = table_name or os.getenv("DYNAMODB_TABLE", "argus-submissions")
+    key = (name, _region(region_name))
+    tables = _thread_cache("tables")
+    table = tables.get(key)
+    if table is None:
+        table = get_resource("dynamodb", region_name).Table(name)
+        tables[key] = table
+    return table
+
+
+def reset() -> None:
+    """Drop every cached client and resource (e.g. after rotating credentials)."""
+    global _generation
+    with _lock:
+        _clients.clear()
+        _generation += 1
@@ -8,13 +8,28 @@ Changing a value here propagates it across the entire pipeline automatically.
 
 Example usage:
     from ai_layer.config import CITIES, MAX_PAGES, DATASET_PATH
+
+Environment variables from .env are loaded by the entry points that read
+settings (main.py, setup_aws.py, test_aws.py, python -m
+services.submission_export, ArgusAIPipeline) calling load_env(), not as an
+import side effect. The scraper / preprocessing / training CLIs read no
+environment variables and do not load it.
 """
 
 import pathlib
-from dotenv import load_dotenv
 
-# Load environment variables from .env
-load_dotenv()
+_env_loaded = False
+
+
+def load_env() -> None:
+    """Load environment variables from .env (once per process)."""
+    global _env_loaded
+    if _env_loaded:
+        return
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    _env_loaded = True
 
 # ---------------------------------------------------------------------------
 # Target cities (lowercase, used to build search URLs)
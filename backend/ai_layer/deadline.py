@@ -0,0 +1,60 @@
+"""
+ai_layer/deadline.py
+====================
+Request deadlines shared by every pipeline stage.
+
+A URL analysis used to be bounded only by each stage's own timeouts (5 s page
+load, 15 s × 2 LLM attempts, ...), so one request could exceed 30 s. A
+Deadline is created once per request and passed through analyze_url →
+extract_listing → ScamPredictor.predict → LLMExplainer.explain. Each stage
+sizes its own timeout from what is left, and the optional ones are cut short
+or skipped (synthetic listing instead of scraping, template explanation
+instead of the LLM) so the whole request stays within the SLA.
+
+Usage:
+    deadline = Deadline(10.0)
+    timeout  = deadline.budget(share=0.5, cap=5.0)   # seconds for this stage
+    if not deadline.allows(1.5):
+        ...skip the optional stage...
+"""
+
+import os
+import time
+from typing import Optional
+
+# Default end-to-end budget for a URL analysis (seconds)
+DEFAULT_DEADLINE: float = float(os.getenv("ANALYSIS_DEADLINE", "12"))
+
+
+class Deadline:
+    """An absolute point in time (monotonic clock) a request must finish by."""
+
+    def __init__(self, seconds: float = DEFAULT_DEADLINE):
+        self.total      = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    @classmethod
+    def ensure(cls, deadline: Optional["Deadline"]) -> "Deadline":
+        """Return `deadline`, or a fresh default one if None."""
+        return deadline if deadline is not None else cls()
+
+    def remaining(self) -> float:
+        """Seconds left, never negative."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def allows(self, seconds: float) -> bool:
+        """True if at least `seconds` remain."""
+        return self.remaining() >= seconds
+
+    def budget(self, share: float = 1.0, cap: Optional[float] = None) -> float:
+        """
+        Time a stage may spend: `share` of what remains, capped at `cap`.
+        """
+        seconds = self.remaining() * share
+        return min(seconds, cap) if cap is not None else seconds
+
+    def __repr__(self) -> str:
+        return f"Deadline(remaining={self.remaining():.2f}s of {self.total:.2f}s)"
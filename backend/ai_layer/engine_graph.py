@@ -0,0 +1,199 @@
+"""
+ai_layer/engine_graph.py
+========================
+Declarative, dependency-aware execution of analysis engines.
+
+Each Engine names the values it needs (graph inputs or other engines'
+outputs). A run is asked for target engines; only those and their
+dependencies execute, each one starting as soon as its own dependencies are
+done, so independent engines (price, text, image; extraction → model →
+explanation) overlap without any hand-written gather() chains. A value
+supplied as an input is never recomputed — e.g. the form path passes
+"listing" directly, so the URL extraction engine is skipped.
+
+Blocking engines run in a worker thread. An engine with a fallback has
+its timeout and errors absorbed (recorded in FALLBACKS / ERRORS); without
+one, its exception fails the run and cancels the engines still in flight.
+
+Threads cannot be cancelled: a blocking engine that times out (or whose run
+is cancelled) keeps running in its worker thread until `run` returns, and
+holds whatever it acquired — an admission slot, a connection — until then.
+Blocking engines must therefore bound their own I/O; the LLM engines do
+(single-attempt clients with read timeouts, the explainer's Bedrock pool),
+so an abandoned call frees its thread within one LLM timeout.
+
+Usage:
+    graph = EngineGraph([
+        Engine("listing", extract, deps=("url",)),
+        Engine("model", score, deps=("listing",), blocking=True),
+    ])
+    results = await graph.run({"url": url}, targets=("model",))
+"""
+
+import asyncio
+import inspect
+import logging
+from typing import Any, AsyncIterator, Callable, Iterable, Optional, Union
+
+from ai_layer import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class Engine:
+    """
+    One node of the graph.
+
+    Args:
+        name:     Key its output is stored under.
+        run:      fn(results) → value, or a coroutine function. `results`
+                  holds the graph inputs plus every finished engine's output.
+        deps:     Names (inputs or engines) that must be available first.
+        blocking: Run `run` in a worker thread (sync I/O or CPU work).
+        timeout:  Seconds before the engine is abandoned (None: no limit), or
+                  fn(results) → seconds for per-run limits (e.g. a deadline).
+        fallback: Returned (copied) on timeout or error instead of raising, or
+                  fn(results) → value to build it from the inputs.
+        latency_label: When set, the engine is timed in ENGINE_LATENCY under
+                  this label (engines that time their own stages leave it unset).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[dict], Any],
+        deps: Iterable[str] = (),
+        blocking: bool = False,
+        timeout: Union[float, Callable[[dict], float], None] = None,
+        fallback: Union[dict, Callable[[dict], Any], None] = None,
+        latency_label: Optional[str] = None,
+    ):
+        self.name          = name
+        self.run           = run
+        self.deps          = tuple(deps)
+        self.blocking      = blocking
+        self.timeout       = timeout
+        self.fallback      = fallback
+        self.latency_label = latency_label
+
+    async def execute(self, results: dict) -> Any:
+        if self.latency_label is None:
+            return await self._guarded(results)
+        with metrics.ENGINE_LATENCY.time(engine=self.latency_label):
+            return await self._guarded(results)
+
+    async def _guarded(self, results: dict) -> Any:
+        if self.fallback is None:
+            return await self._call(results)
+        try:
+            return await self._call(results)
+        except asyncio.TimeoutError:
+            logger.warning(f"Engine '{self.name}' timed out — using fallback")
+            metrics.FALLBACKS.inc(engine=self.name, reason="timeout")
+        except Exception as exc:
+            logger.warning(f"Engine '{self.name}' failed ({exc}) — using fallback")
+            metrics.ERRORS.inc(component=f"engine.{self.name}")
+            metrics.FALLBACKS.inc(engine=self.name, reason="error")
+        if callable(self.fallback):
+            return self.fallback(results)
+        return dict(self.fallback)
+
+    async def _call(self, results: dict) -> Any:
+        if self.blocking:
+            awaitable = asyncio.to_thread(self.run, results)
+        elif inspect.iscoroutinefunction(self.run):
+            awaitable = self.run(results)
+        else:
+            return self.run(results)
+        timeout = self.timeout(results) if callable(self.timeout) else self.timeout
+        if timeout is None:
+            return await awaitable
+        return await asyncio.wait_for(awaitable, timeout=timeout)
+
+    def __repr__(self) -> str:
+        return f"Engine({self.name!r}, deps={self.deps})"
+
+
+class EngineGraph:
+    """A set of engines executed in dependency order with maximal overlap."""
+
+    def __init__(self, engines: Iterable[Engine]):
+        self.engines: dict[str, Engine] = {}
+        for engine in engines:
+            if engine.name in self.engines:
+                raise ValueError(f"Duplicate engine: {engine.name}")
+            self.engines[engine.name] = engine
+        self._check_acyclic()
+
+    def _check_acyclic(self) -> None:
+        state: dict[str, int] = {}   # 1 = visiting, 2 = done
+
+        def visit(name: str, path: tuple) -> None:
+            if state.get(name) == 2 or name not in self.engines:
+                return
+            if state.get(name) == 1:
+                raise ValueError(f"Engine dependency cycle: {' → '.join(path + (name,))}")
+            state[name] = 1
+            for dep in self.engines[name].deps:
+                visit(dep, path + (name,))
+            state[name] = 2
+
+        for name in self.engines:
+            visit(name, ())
+
+    def plan(self, targets: Iterable[str], provided: Iterable[str] = ()) -> list[str]:
+        """Engines needed for `targets` given the provided inputs, in dependency order."""
+        provided = set(provided)
+        order: list[str] = []
+        seen: set[str] = set()
+
+        def visit(name: str) -> None:
+            if name in seen or name in provided:
+                return
+            seen.add(name)
+            engine = self.engines.get(name)
+            if engine is None:
+                raise KeyError(f"'{name}' is neither a graph input nor an engine")
+            for dep in engine.deps:
+                visit(dep)
+            order.append(name)
+
+        for target in targets:
+            visit(target)
+        return order
+
+    async def iter_run(
+        self, inputs: dict, targets: Iterable[str]
+    ) -> AsyncIterator[tuple[str, Any]]:
+        """Yield (engine name, output) for every planned engine as it finishes."""
+        results = dict(inputs)
+        pending_names = self.plan(targets, results)
+        running: dict[asyncio.Task, str] = {}
+
+        def start_ready() -> None:
+            for name in list(pending_names):
+                if all(dep in results for dep in self.engines[name].deps):
+                    pending_names.remove(name)
+                    task = asyncio.ensure_future(self.engines[name].execute(results))
+                    running[task] = name
+
+        start_ready()
+        try:
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = running.pop(task)
+                    results[name] = task.result()
+                    yield name, results[name]
+                start_ready()
+        finally:
+            # Failed engine or caller went away: don't leave engines running
+            for task in running:
+                task.cancel()
+
+    async def run(self, inputs: dict, targets: Iterable[str]) -> dict:
+        """Run to completion; returns the inputs plus every executed engine's output."""
+        results = dict(inputs)
+        async for name, value in self.iter_run(inputs, targets):
+            results[name] = value
+        return results
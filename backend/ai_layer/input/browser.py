@@ -0,0 +1,53 @@
+"""
+ai_layer/input/browser.py
+=========================
+Shared headless Chromium for single-listing extraction.
+
+Launching Chromium costs around a second per request. The browser is
+launched once per process (on first use, or during startup warm-up) and each
+extraction gets its own isolated BrowserContext, which is cheap to create and
+throw away. A crashed or disconnected browser is relaunched transparently.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+_playwright = None
+_browser = None
+_lock: Optional[asyncio.Lock] = None
+
+
+async def get_browser():
+    """Return the shared Chromium instance, launching it if needed."""
+    global _playwright, _browser, _lock
+    if _browser is not None and _browser.is_connected():
+        return _browser
+
+    if _lock is None:
+        _lock = asyncio.Lock()
+    async with _lock:
+        if _browser is None or not _browser.is_connected():
+            from playwright.async_api import async_playwright
+
+            if _playwright is None:
+                _playwright = await async_playwright().start()
+            logger.info("Launching shared Chromium instance")
+            _browser = await _playwright.chromium.launch(headless=True)
+    return _browser
+
+
+async def close_browser() -> None:
+    """Close the shared browser and Playwright driver (called on shutdown)."""
+    global _playwright, _browser
+    if _browser is not None:
+        try:
+            await _browser.close()
+        except Exception as e:
+            logger.warning(f"Error closing shared browser: {e}")
+        _browser = None
+    if _playwright is not None:
+        await _playwright.stop()
+        _playwright = None
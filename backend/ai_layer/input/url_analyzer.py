@@ -1,9 +1,21 @@
+import asyncio
 import logging
 from typing import Optional
 from urllib.parse import urlparse
 
+from ai_layer import admission, metrics
+from ai_layer.deadline import Deadline
+
 logger = logging.getLogger(__name__)
 
+# Scraping may use up to half of the request's remaining time (admission wait,
+# page load and parsing together), never more than 8s; with less than 1s left
+# it is skipped in favour of the URL-based fallback.
+_EXTRACTION_SHARE      = 0.5
+_EXTRACTION_CAP        = 8.0
+_MIN_EXTRACTION_BUDGET = 1.0
+_PAGE_LOAD_TIMEOUT_MS  = 5000
+
 class ListingURLAnalyzer:
     """
     Analyzes a raw property URL, determines the platform, 
@@ -11,13 +23,21 @@ class ListingURLAnalyzer:
     """
     
     def __init__(self):
-        # We try to use the playwright scraper to parse a single page
-        try:
-            from ai_layer.scraper.playwright_scraper import PlaywrightScraper
-            self.scraper = PlaywrightScraper()
-        except ImportError:
-            from ai_layer.scraper.bs4_scraper import BS4Scraper
-            self.scraper = BS4Scraper()
+        self._scraper = None
+
+    @property
+    def scraper(self):
+        # Created on first use: importing the scrapers costs more than a
+        # whole fallback extraction and this object is built per request
+        if self._scraper is None:
+            # We try to use the playwright scraper to parse a single page
+            try:
+                from ai_layer.scraper.playwright_scraper import PlaywrightScraper
+                self._scraper = PlaywrightScraper()
+            except ImportError:
+                from ai_layer.scraper.bs4_scraper import BS4Scraper
+                self._scraper = BS4Scraper()
+        return self._scraper
 
     def _identify_platform(self, url: str) -> str:
         """Naive platform identifier from hostname."""
@@ -41,11 +61,18 @@ class ListingURLAnalyzer:
             return "delhi"
         return "unknown"
 
-    async def extract_listing(self, url: str) -> dict:
+    async def extract_listing(self, url: str, deadline: Optional[Deadline] = None) -> dict:
         """
         Takes a URL, scrapes it, and returns a single listing dict 
         that conforms to the expected feature schema for the ML model.
+        
+        Scraping is bounded by the request deadline; when it cannot finish
+        in time the URL-based fallback is returned (extraction_degraded).
         """
+        with metrics.STAGE_LATENCY.time(stage="url_extraction"):
+            return await self._extract_listing(url, Deadline.ensure(deadline))
+
+    async def _extract_listing(self, url: str, deadline: Deadline) -> dict:
         logger.info(f"ListingURLAnalyzer: Extracting from {url}")
         platform = self._identify_platform(url)
         city = self._extract_city(url)
@@ -67,29 +94,66 @@ class ListingURLAnalyzer:
                 logger.warning(f"Unsupported platform: {platform}")
                 return self._generate_fallback(url, platform, city)
                 
-            from playwright.async_api import async_playwright
-            async with async_playwright() as pw:
-                browser = await pw.chromium.launch(headless=True)
-                page = await browser.new_page()
-                logger.info(f"Navigating to {url}")
-                await page.goto(url, wait_until="domcontentloaded", timeout=5000)
-                
-                listings = await source.scrape_page(page, city)
-                await browser.close()
+            budget = deadline.budget(share=_EXTRACTION_SHARE, cap=_EXTRACTION_CAP)
+            if budget < _MIN_EXTRACTION_BUDGET:
+                logger.warning(f"Deadline: {deadline} — skipping scrape of {url}")
+                return self._degraded_fallback(url, platform, city, reason="deadline")
+
+            listings = await asyncio.wait_for(self._scrape(url, city, source, budget), timeout=budget)
+            if listings is None:
+                return self._degraded_fallback(url, platform, city, reason="admission")
                 
-                if listings and len(listings) > 0:
-                    listing = listings[0]
-                    listing["listing_url"] = url
-                    listing["platform_source"] = platform
-                    return listing
-                else:
-                    logger.warning(f"No listings extracted from {url}. Falling back to mock.")
-                    return self._generate_fallback(url, platform, city)
+            if listings and len(listings) > 0:
+                listing = listings[0]
+                listing["listing_url"] = url
+                listing["platform_source"] = platform
+                return listing
+            else:
+                logger.warning(f"No listings extracted from {url}. Falling back to mock.")
+                metrics.FALLBACKS.inc(engine=admission.EXTRACTION, reason="empty")
+                return self._generate_fallback(url, platform, city)
                     
+        except asyncio.TimeoutError:
+            logger.warning(f"Deadline: scraping {url} cut short after {budget:.1f}s")
+            return self._degraded_fallback(url, platform, city, reason="deadline")
         except Exception as e:
             logger.error(f"Error extracting listing from {url}: {e}")
+            metrics.ERRORS.inc(component=admission.EXTRACTION)
+            metrics.FALLBACKS.inc(engine=admission.EXTRACTION, reason="error")
             return self._generate_fallback(url, platform, city)
 
+    async def _scrape(self, url: str, city: str, source, budget: float) -> Optional[list]:
+        """Scrape one listing page; returns None if extraction was not admitted."""
+        # Browser launches are the scarce resource — shed load past the budget
+        async with admission.admit_async(admission.EXTRACTION) as admitted:
+            if not admitted:
+                return None
+
+            from ai_layer.input.browser import get_browser
+            browser = await get_browser()
+            context = await browser.new_context()
+            try:
+                page = await context.new_page()
+                logger.info(f"Navigating to {url}")
+                await page.goto(
+                    url,
+                    wait_until="domcontentloaded",
+                    timeout=min(_PAGE_LOAD_TIMEOUT_MS, int(budget * 1000)),
+                )
+                
+                return await source.scrape_page(page, city)
+            finally:
+                await context.close()
+
+    def _degraded_fallback(self, url: str, platform: str, city: str, reason: str) -> dict:
+        """URL-based fallback used when scraping was shed or ran out of time."""
+        if reason != "admission":
+            # admission refusals are already counted by the limiter
+            metrics.FALLBACKS.inc(engine=admission.EXTRACTION, reason=reason)
+        listing = self._generate_fallback(url, platform, city)
+        listing["extraction_degraded"] = True
+        return listing
+
     def _generate_fallback(self, url: str, platform: str, city: str) -> dict:
         """Generate a valid mock listing so the ML pipeline doesn't crash on network failure."""
         import random
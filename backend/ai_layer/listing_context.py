@@ -0,0 +1,146 @@
+"""
+ai_layer/listing_context.py
+===========================
+Per-request view of a listing with its derived text computed once.
+
+The same description used to be lower-cased and scanned by every engine —
+FeatureEngineer's urgency count, the mock text analysis (one .lower() per
+keyword check), the Bedrock prompt, the price engine's key normalization.
+A ListingContext is built once per request and handed to each of them;
+every derived value is computed on first use and then shared.
+
+Usage:
+    ctx = ListingContext.from_listing(listing)       # URL / batch path
+    ctx = ListingContext(title, description, price=..., city=..., ...)   # form path
+    ctx.count(["urgent", "token"])                    # occurrences in the description
+    ctx.contains_any(["hurry"], include_title=True)
+    ctx.content_hash                                  # key for per-text result caches
+"""
+
+import hashlib
+import re
+from functools import cached_property
+from typing import Iterable, Optional
+
+_NON_DIGIT_RE = re.compile(r"[^\d.]")
+
+
+def normalize_key(value) -> str:
+    """Lookup key for city / locality / property type: lower-cased and stripped."""
+    return str(value or "").lower().strip()
+
+
+def parse_price(value) -> Optional[int]:
+    """Price as an int from a number or a string like '₹25,000'; None if absent."""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    digits = _NON_DIGIT_RE.sub("", str(value))
+    try:
+        return int(float(digits)) if digits else None
+    except ValueError:
+        return None
+
+
+class ListingContext:
+    """The raw listing fields plus lazily computed, cached derived values."""
+
+    def __init__(
+        self,
+        title: str = "",
+        description: str = "",
+        price=None,
+        city: str = "",
+        locality: str = "",
+        property_type: str = "",
+        contact_number: Optional[str] = None,
+    ):
+        self.title          = title or ""
+        self.description    = description or ""
+        self.raw_price      = price
+        self.city           = city or ""
+        self.locality       = locality or ""
+        self.property_type  = property_type or ""
+        self.contact_number = contact_number
+
+    @classmethod
+    def from_listing(cls, listing: dict) -> "ListingContext":
+        """Build from an extracted listing dict (listings_dataset.json schema)."""
+        description = listing.get("description")
+        return cls(
+            title=listing.get("title") or "",
+            description=description if isinstance(description, str) else "",
+            price=listing.get("price"),
+            city=listing.get("city") or "",
+            locality=listing.get("locality") or "",
+            property_type=listing.get("property_type") or "",
+            contact_number=listing.get("phone_number"),
+        )
+
+    # ------------------------------------------------------------------
+    # Derived values (each computed at most once)
+    # ------------------------------------------------------------------
+
+    @cached_property
+    def text(self) -> str:
+        """Lower-cased description."""
+        return self.description.lower()
+
+    @cached_property
+    def title_text(self) -> str:
+        """Lower-cased title."""
+        return self.title.lower()
+
+    @cached_property
+    def content_hash(self) -> str:
+        """
+        sha256 of the whitespace-normalized title, description and contact
+        number — everything the LLM text engine sees — keying its result cache.
+        """
+        digest = hashlib.sha256()
+        for part in (self.title_text, self.text, self.contact_number or ""):
+            digest.update(" ".join(part.split()).encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    @cached_property
+    def price(self) -> Optional[int]:
+        return parse_price(self.raw_price)
+
+    @cached_property
+    def city_key(self) -> str:
+        return normalize_key(self.city)
+
+    @cached_property
+    def locality_key(self) -> str:
+        return normalize_key(self.locality)
+
+    @cached_property
+    def property_type_key(self) -> str:
+        return normalize_key(self.property_type)
+
+    @cached_property
+    def prompt_text(self) -> str:
+        """Listing text as sent to the LLM text engine."""
+        text = f"Title: {self.title}\n\nDescription: {self.description}"
+        if self.contact_number:
+            text += f"\n\nContact: {self.contact_number}"
+        return text
+
+    # ------------------------------------------------------------------
+    # Keyword scans over the normalized text
+    # ------------------------------------------------------------------
+
+    def count(self, terms: Iterable[str]) -> int:
+        """Total occurrences of the (lower-case) terms in the description."""
+        text = self.text
+        return sum(text.count(term) for term in terms)
+
+    def contains_any(self, terms: Iterable[str], include_title: bool = False) -> bool:
+        """True if any (lower-case) term appears in the description (or title)."""
+        text, title = self.text, self.title_text
+        return any(term in text or (include_title and term in title) for term in terms)
+
+    def __repr__(self) -> str:
+        return f"ListingContext(title={self.title[:40]!r}, city={self.city!r}, price={self.price!r})"
@@ -21,6 +21,13 @@ Environment variables:
 import json
 import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Optional
+
+from ai_layer import metrics
+from ai_layer.deadline import Deadline
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +47,38 @@ _SYSTEM_PROMPT = (
 _OPENROUTER_MODEL = "anthropic/claude-3-5-haiku-20241022"
 _OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
 
+# Per-attempt LLM timeout (seconds); the request deadline can only shorten it
+_LLM_TIMEOUT = 15.0
+# Below this much remaining time an LLM call is not attempted at all
+MIN_LLM_BUDGET = 1.5
+# Kept back from the deadline for the fallback explanation and the response
+_DEADLINE_RESERVE = 0.25
+
+# Bedrock calls run on this pool so the caller can stop waiting at the
+# deadline; an abandoned call still ends within one _LLM_TIMEOUT (single attempt)
+BEDROCK_WORKERS: int = int(os.getenv("BEDROCK_EXPLAIN_WORKERS", "8"))
+_bedrock_pool: Optional[ThreadPoolExecutor] = None
+_bedrock_pool_lock = threading.Lock()
+
+
+def _get_bedrock_pool() -> ThreadPoolExecutor:
+    global _bedrock_pool
+    if _bedrock_pool is None:
+        with _bedrock_pool_lock:
+            if _bedrock_pool is None:
+                _bedrock_pool = ThreadPoolExecutor(
+                    max_workers=BEDROCK_WORKERS, thread_name_prefix="bedrock-explain"
+                )
+    return _bedrock_pool
+
+
+def _bedrock_client():
+    # One attempt with a read timeout no longer than an LLM attempt may take,
+    # instead of the shared client's 30 s × 3 adaptive retries
+    from ai_layer.aws_clients import get_client
+
+    return get_client("bedrock-runtime", read_timeout=_LLM_TIMEOUT, max_attempts=1)
+
 
 class LLMExplainer:
     """
@@ -56,18 +95,31 @@ class LLMExplainer:
             provider: One of "openrouter" | "bedrock" | "openai" | "mock".
         """
         self.provider = provider
+        self._openrouter_client = None
+
+    def warm_up(self) -> None:
+        """Create the provider's API client ahead of the first request."""
+        if self.provider == "openrouter" and os.getenv("OPENROUTER_API_KEY"):
+            self._get_openrouter_client(os.getenv("OPENROUTER_API_KEY"))
+        elif self.provider == "bedrock":
+            _bedrock_client()
 
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
 
-    def explain(self, listing: dict, prediction: dict) -> str:
+    def explain(
+        self, listing: dict, prediction: dict, deadline: Optional[Deadline] = None
+    ) -> str:
         """
         Generate a plain-English explanation for a scam prediction.
 
         Args:
             listing:    Full listing dict.
             prediction: Output of ScamPredictor.predict().
+            deadline:   Request deadline; LLM calls are given at most the time
+                        remaining and skipped (template explanation) when
+                        less than MIN_LLM_BUDGET is left.
 
         Returns:
             Explanation string (≤ 120 words).
@@ -77,29 +129,54 @@ class LLMExplainer:
         if self.provider == "mock":
             return self._fallback_explanation(listing, prediction)
 
+        if deadline is not None and not deadline.allows(MIN_LLM_BUDGET):
+            logger.warning(f"Deadline: {deadline} — using template explanation")
+            metrics.FALLBACKS.inc(engine="llm_explainer", reason="deadline")
+            return self._fallback_explanation(listing, prediction)
+
         if self.provider == "openrouter":
             try:
-                return self._call_openrouter(prompt)
+                return self._timed_call("openrouter", self._call_openrouter, prompt, deadline)
             except Exception as exc:
                 logger.warning(f"OpenRouter unavailable ({exc}). Using fallback.")
+                metrics.FALLBACKS.inc(engine="llm_explainer", reason="error")
                 return self._fallback_explanation(listing, prediction)
 
         if self.provider == "bedrock":
             try:
-                return self._call_bedrock(prompt)
+                return self._timed_call("bedrock", self._call_bedrock, prompt, deadline)
+            except TimeoutError as exc:
+                logger.warning(f"Bedrock too slow ({exc}). Using fallback.")
+                metrics.FALLBACKS.inc(engine="llm_explainer", reason="timeout")
+                return self._fallback_explanation(listing, prediction)
             except Exception as exc:
                 logger.warning(f"Bedrock unavailable ({exc}). Using fallback.")
+                metrics.FALLBACKS.inc(engine="llm_explainer", reason="error")
                 return self._fallback_explanation(listing, prediction)
 
         if self.provider == "openai":
             try:
-                return self._call_openai(prompt)
+                return self._timed_call("openai", self._call_openai, prompt, deadline)
             except Exception as exc:
                 logger.warning(f"OpenAI unavailable ({exc}). Using fallback.")
+                metrics.FALLBACKS.inc(engine="llm_explainer", reason="error")
                 return self._fallback_explanation(listing, prediction)
 
         return self._fallback_explanation(listing, prediction)
 
+    @staticmethod
+    def _timed_call(provider: str, call, prompt: str, deadline: Optional[Deadline]) -> str:
+        """Run a provider call, recording its latency and outcome."""
+        with metrics.llm_call(provider, engine="llm_explainer"):
+            return call(prompt, deadline)
+
+    @staticmethod
+    def _timeout(deadline: Optional[Deadline]) -> float:
+        """Per-attempt timeout: the default, shortened to the time remaining."""
+        if deadline is None:
+            return _LLM_TIMEOUT
+        return max(0.1, min(_LLM_TIMEOUT, deadline.remaining() - _DEADLINE_RESERVE))
+
     # ------------------------------------------------------------------
     # Prompt builder
     # ------------------------------------------------------------------
@@ -134,8 +211,11 @@ class LLMExplainer:
     # LLM backends
     # ------------------------------------------------------------------
 
-    def _call_openrouter(self, prompt: str) -> str:
-        """Call OpenRouter using the OpenAI-compatible Python SDK with retry logic."""
+    def _call_openrouter(self, prompt: str, deadline: Optional[Deadline] = None) -> str:
+        """
+        Call OpenRouter using the OpenAI-compatible Python SDK with retry logic.
+        Each attempt is bounded by the deadline; no retry without time for it.
+        """
         import time
 
         api_key = os.getenv("OPENROUTER_API_KEY")
@@ -145,23 +225,7 @@ class LLMExplainer:
             )
         logger.info(f"OpenRouter: API key loaded (ends ...{api_key[-6:]})")
 
-        try:
-            from openai import OpenAI
-        except ImportError as exc:
-            raise ImportError(
-                "openai package required for OpenRouter. "
-                "Install it: pip install openai"
-            ) from exc
-
-        client = OpenAI(
-            api_key=api_key,
-            base_url=_OPENROUTER_BASE_URL,
-            timeout=15.0,
-            default_headers={
-                "HTTP-Referer": "https://github.com/project-argus",
-                "X-Title":      "Project Argus - Rental Scam Detector",
-            },
-        )
+        client = self._get_openrouter_client(api_key)
 
         max_retries = 2
         last_error = None
@@ -176,6 +240,7 @@ class LLMExplainer:
                     ],
                     temperature=0.3,
                     max_tokens=200,
+                    timeout=self._timeout(deadline),
                 )
                 text = response.choices[0].message.content.strip()
                 logger.info(f"OpenRouter: Success on attempt {attempt}")
@@ -184,32 +249,67 @@ class LLMExplainer:
                 last_error = e
                 logger.warning(f"OpenRouter: Attempt {attempt} failed: {e}")
                 if attempt < max_retries:
+                    if deadline is not None and not deadline.allows(1 + MIN_LLM_BUDGET):
+                        logger.warning(f"OpenRouter: no time left to retry ({deadline})")
+                        break
                     time.sleep(1)  # quick retry
 
         raise last_error
 
-    def _call_bedrock(self, prompt: str) -> str:
-        import boto3
+    def _get_openrouter_client(self, api_key: str):
+        """Build the OpenRouter client once and reuse its connection pool."""
+        if self._openrouter_client is None:
+            try:
+                from openai import OpenAI
+            except ImportError as exc:
+                raise ImportError(
+                    "openai package required for OpenRouter. "
+                    "Install it: pip install openai"
+                ) from exc
+
+            self._openrouter_client = OpenAI(
+                api_key=api_key,
+                base_url=_OPENROUTER_BASE_URL,
+                timeout=_LLM_TIMEOUT,
+                default_headers={
+                    "HTTP-Referer": "https://github.com/project-argus",
+                    "X-Title":      "Project Argus - Rental Scam Detector",
+                },
+            )
+        return self._openrouter_client
 
-        client = boto3.client(
-            "bedrock-runtime",
-            region_name=os.getenv("AWS_REGION", "ap-south-1"),
-        )
+    def _call_bedrock(self, prompt: str, deadline: Optional[Deadline] = None) -> str:
+        """
+        Call Claude 3 Haiku on Bedrock, waiting at most the per-attempt timeout.
+
+        boto3 has no per-call timeout, so the call runs on the Bedrock pool and
+        is abandoned (TimeoutError → fallback) when the deadline's share runs out.
+        """
         body = json.dumps({
             "anthropic_version": "bedrock-2023-05-31",
             "max_tokens": 300,
             "messages": [{"role": "user", "content": f"{_SYSTEM_PROMPT}\n\n{prompt}"}],
         })
-        response = client.invoke_model(
-            modelId="anthropic.claude-3-haiku-20240307-v1:0",
-            body=body,
-            contentType="application/json",
-            accept="application/json",
-        )
-        result = json.loads(response["body"].read())
-        return result["content"][0]["text"].strip()
 
-    def _call_openai(self, prompt: str) -> str:
+        def invoke() -> str:
+            response = _bedrock_client().invoke_model(
+                modelId="anthropic.claude-3-haiku-20240307-v1:0",
+                body=body,
+                contentType="application/json",
+                accept="application/json",
+            )
+            result = json.loads(response["body"].read())
+            return result["content"][0]["text"].strip()
+
+        future = _get_bedrock_pool().submit(invoke)
+        timeout = self._timeout(deadline)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()   # still queued behind abandoned calls: never start it
+            raise TimeoutError(f"Bedrock call exceeded {timeout:.2f}s") from None
+
+    def _call_openai(self, prompt: str, deadline: Optional[Deadline] = None) -> str:
         from openai import OpenAI
 
         client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
@@ -221,6 +321,7 @@ class LLMExplainer:
             ],
             max_tokens=300,
             temperature=0.3,
+            timeout=self._timeout(deadline),
         )
         return response.choices[0].message.content.strip()
 
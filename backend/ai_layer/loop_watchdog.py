@@ -0,0 +1,132 @@
+"""
+ai_layer/loop_watchdog.py
+=========================
+Opt-in event-loop stall detector.
+
+Blocking work inside `async def` code (a synchronous Bedrock or DynamoDB
+call, time.sleep, a large json.dump) freezes every request on the worker.
+The watchdog makes such stalls visible:
+
+  • a heartbeat task on the loop records when it last ran;
+  • a daemon thread checks the heartbeat, and when the loop has not come
+    back for longer than the threshold it captures the loop thread's stack —
+    the code that is blocking it — and logs it once per stall;
+  • when the loop recovers, the stall's duration is exported as
+    argus_event_loop_stall_seconds (its _count is the number of stalls) and
+    kept with its stack in a short list of recent stalls.
+
+Enabled with LOOP_WATCHDOG=1 (see main.py). Overhead is one wake-up per
+check interval on the loop and in the thread.
+
+Usage:
+    watchdog = LoopWatchdog(threshold=0.1)
+    watchdog.start()            # from inside the running loop
+    ...
+    await watchdog.stop()
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Optional
+
+from ai_layer import metrics
+
+logger = logging.getLogger(__name__)
+
+_MAX_STACK_FRAMES = 25
+
+
+class LoopWatchdog:
+    """Detects event-loop stalls longer than `threshold` seconds."""
+
+    def __init__(self, threshold: float = 0.1, interval: Optional[float] = None, keep: int = 20):
+        self.threshold = threshold
+        self.interval  = interval or max(threshold / 4, 0.005)
+        self.recent: deque[dict] = deque(maxlen=keep)
+        self._last_tick   = time.monotonic()
+        self._loop_thread: Optional[int] = None
+        self._heartbeat: Optional[asyncio.Task] = None
+        self._monitor: Optional[threading.Thread] = None
+        self._stopping    = threading.Event()
+        self._lock        = threading.Lock()
+        self._pending: Optional[dict] = None   # stall currently in progress
+        self._stalls      = 0
+        self._max_stall   = 0.0
+
+    def start(self) -> None:
+        """Start watching the running loop (call from a coroutine on it)."""
+        if self._heartbeat is not None:
+            return
+        self._loop_thread = threading.get_ident()
+        self._last_tick   = time.monotonic()
+        self._stopping.clear()
+        self._heartbeat = asyncio.create_task(self._beat(), name="loop-watchdog")
+        self._monitor = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._monitor.start()
+        logger.info(f"Event-loop watchdog enabled (threshold {self.threshold * 1000:.0f}ms)")
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            await asyncio.gather(self._heartbeat, return_exceptions=True)
+            self._heartbeat = None
+        if self._monitor is not None:
+            self._monitor.join(timeout=1)
+            self._monitor = None
+
+    async def _beat(self) -> None:
+        while True:
+            now = time.monotonic()
+            gap = now - self._last_tick
+            self._last_tick = now
+            if gap - self.interval > self.threshold:
+                self._record(gap - self.interval)
+            await asyncio.sleep(self.interval)
+
+    def _watch(self) -> None:
+        """Monitor thread: grab the loop's stack while it is stalled."""
+        while not self._stopping.wait(self.interval):
+            stalled_for = time.monotonic() - self._last_tick - self.interval
+            if stalled_for <= self.threshold:
+                continue
+            with self._lock:
+                if self._pending is not None:
+                    continue   # already captured this stall
+                frame = sys._current_frames().get(self._loop_thread)
+                stack = traceback.format_stack(frame, limit=_MAX_STACK_FRAMES) if frame else []
+                self._pending = {"stack": stack, "detected_at": time.time()}
+            logger.warning(
+                f"Event loop blocked for >{stalled_for * 1000:.0f}ms; loop thread is at:\n"
+                + "".join(stack)
+            )
+
+    def _record(self, duration: float) -> None:
+        """Called on the loop once it runs again after a stall."""
+        metrics.LOOP_STALLS.observe(duration)
+        with self._lock:
+            pending, self._pending = self._pending, None
+            self._stalls += 1
+            self._max_stall = max(self._max_stall, duration)
+            stack = pending["stack"] if pending else []
+            self.recent.append({
+                "duration_ms": round(duration * 1000, 1),
+                "at":          pending["detected_at"] if pending else time.time(),
+                # innermost frames are the blocking call
+                "stack":       [line.strip() for line in stack[-6:]],
+            })
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled":      self._heartbeat is not None,
+                "threshold_ms": round(self.threshold * 1000, 1),
+                "stalls":       self._stalls,
+                "max_stall_ms": round(self._max_stall * 1000, 1),
+                "recent":       list(self.recent),
+            }
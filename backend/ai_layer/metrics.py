@@ -0,0 +1,216 @@
+"""
+ai_layer/metrics.py
+===================
+Minimal in-process Prometheus metrics (counters + histograms).
+
+Deliberately dependency-free and cheap: one lock per metric, a dict lookup
+and a bisect per observation. GET /metrics renders every registered metric
+in the Prometheus text exposition format.
+
+All metrics the backend exports are declared at the bottom of this module so
+the full set is visible in one place.
+
+Usage:
+    from ai_layer import metrics
+
+    metrics.FALLBACKS.inc(engine="text", reason="timeout")
+    with metrics.STAGE_LATENCY.time(stage="model_scoring"):
+        ...
+    with metrics.llm_call("bedrock", engine="llm_text"):
+        bedrock.invoke_model(...)
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+from ai_layer import timings
+
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+_registry: list["_Metric"] = []
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name       = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock      = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS, timing_label=None):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # When set, time() also adds the duration to the per-request
+        # breakdown (ai_layer.timings) under the value of this label
+        self.timing_label = timing_label
+        # key → [per-bucket counts..., +Inf count], sum
+        self._counts: dict[tuple, list[int]] = {}
+        self._sums: dict[tuple, float] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+            counts[idx] += 1
+            self._sums[key] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall-clock duration of the with-block, in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.observe(elapsed, **labels)
+            if self.timing_label:
+                timings.record(labels[self.timing_label], elapsed)
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        with self._lock:
+            items = sorted((k, list(c), self._sums[k]) for k, c in self._counts.items())
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+                )
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+@contextmanager
+def llm_call(provider: str, engine: str):
+    """Record an LLM provider call in LLM_LATENCY, labelled ok/error by outcome."""
+    start   = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        LLM_LATENCY.observe(
+            time.perf_counter() - start, provider=provider, engine=engine, outcome=outcome
+        )
+
+
+def render() -> str:
+    """Render every registered metric in Prometheus text format."""
+    lines: list[str] = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ---------------------------------------------------------------------------
+# Metric definitions
+# ---------------------------------------------------------------------------
+REQUESTS = Counter(
+    "argus_http_requests_total", "HTTP requests by route, method and status.",
+    ("route", "method", "status"),
+)
+REQUEST_LATENCY = Histogram(
+    "argus_http_request_duration_seconds", "HTTP request latency by route.",
+    ("route", "method"),
+)
+ENGINE_LATENCY = Histogram(
+    "argus_engine_duration_seconds", "Detection engine latency (price, text, image, scorer).",
+    ("engine",), timing_label="engine",
+)
+STAGE_LATENCY = Histogram(
+    "argus_pipeline_stage_duration_seconds",
+    "AI pipeline stage latency (url_extraction, feature_engineering, model_scoring, explanation).",
+    ("stage",), timing_label="stage",
+)
+LLM_LATENCY = Histogram(
+    "argus_llm_request_duration_seconds", "LLM provider call latency by provider and outcome.",
+    ("provider", "engine", "outcome"),
+)
+SCHEDULER_WAIT = Histogram(
+    "argus_scheduler_wait_seconds", "Time spent queued for a pipeline slot, by priority class.",
+    ("priority",),
+)
+FALLBACKS = Counter(
+    "argus_fallbacks_total", "Results served from a local fallback, by engine and reason.",
+    ("engine", "reason"),
+)
+ENGINES_SKIPPED = Counter(
+    "argus_engines_skipped_total", "Engines not run because cheaper signals were decisive.",
+    ("engine", "reason"),
+)
+ERRORS = Counter(
+    "argus_errors_total", "Errors caught and handled, by component.",
+    ("component",),
+)
+LOOP_STALLS = Histogram(
+    "argus_event_loop_stall_seconds",
+    "Event-loop stalls above the watchdog threshold (only with LOOP_WATCHDOG=1).",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
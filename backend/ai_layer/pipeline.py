@@ -22,11 +22,19 @@ Usage:
     result = pipeline.analyze_listing(listing_dict)
 """
 
+import asyncio
 import logging
 import pathlib
-from typing import Optional
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncContextManager, AsyncIterator, Callable, Optional, Union
 
-from ai_layer.config import CITIES, LOG_PREFIX
+from ai_layer import admission, metrics
+from ai_layer.config import CITIES, load_env
+from ai_layer.deadline import Deadline
+from ai_layer.engine_graph import Engine, EngineGraph
+from ai_layer.listing_context import ListingContext
 
 logger = logging.getLogger(__name__)
 
@@ -43,11 +51,16 @@ class ArgusAIPipeline:
         self,
         cities: Optional[list[str]] = None,
         llm_provider: str = "bedrock",
+        extra_engines: Optional[list[Engine]] = None,
     ):
+        load_env()
         self.cities       = cities or CITIES
         self.llm_provider = llm_provider
         self._predictor   = None   # lazy-loaded
         self._explainer   = None   # lazy-loaded
+        self._load_lock   = threading.Lock()
+        # URL stages plus any engines layered on top (e.g. the form engines)
+        self.graph        = EngineGraph(self.engines() + list(extra_engines or []))
 
     # ------------------------------------------------------------------
     # Lazy loaders
@@ -55,17 +68,64 @@ class ArgusAIPipeline:
 
     def _get_predictor(self):
         if self._predictor is None:
-            from ai_layer.predictor.inference import ScamPredictor
-            self._predictor = ScamPredictor()
-            self._predictor.load()
+            # Concurrent first requests must not each load the model
+            with self._load_lock:
+                if self._predictor is None:
+                    from ai_layer.predictor.inference import ScamPredictor
+                    predictor = ScamPredictor()
+                    predictor.load()
+                    self._predictor = predictor
         return self._predictor
 
     def _get_explainer(self):
         if self._explainer is None:
-            from ai_layer.llm_explainer.explainer import LLMExplainer
-            self._explainer = LLMExplainer(provider=self.llm_provider)
+            with self._load_lock:
+                if self._explainer is None:
+                    from ai_layer.llm_explainer.explainer import LLMExplainer
+                    self._explainer = LLMExplainer(provider=self.llm_provider)
         return self._explainer
 
+    def warm_up(self) -> dict:
+        """
+        Eagerly load everything the first request would otherwise pay for:
+        the model payload, a throwaway inference (pandas / sklearn code paths,
+        feature engineering), the explainer's LLM client and the URL
+        extraction modules.
+
+        Returns {component: elapsed_ms}; raises if the model cannot load.
+        """
+        timings = {}
+
+        start = time.perf_counter()
+        predictor = self._get_predictor()
+        timings["predictor"] = round((time.perf_counter() - start) * 1000, 1)
+
+        start = time.perf_counter()
+        predictor.predict({
+            "listing_id":    "warmup",
+            "listing_url":   "https://warmup.local/listing",
+            "city":          self.cities[0],
+            "price":         20000,
+            "description":   "Warm-up listing",
+            "image_count":   1,
+            "phone_number":  "0000000000",
+            "timestamp":     None,
+        })
+        timings["inference"] = round((time.perf_counter() - start) * 1000, 1)
+
+        start = time.perf_counter()
+        self._get_explainer().warm_up()
+        timings["explainer"] = round((time.perf_counter() - start) * 1000, 1)
+
+        # URL extraction modules are imported on first use; pay for it here
+        start = time.perf_counter()
+        from ai_layer.input.url_analyzer import ListingURLAnalyzer  # noqa: F401
+        from ai_layer.scraper.sources import housing_com, magicbricks  # noqa: F401
+        timings["extractor"] = round((time.perf_counter() - start) * 1000, 1)
+
+        logger.info(f"ArgusAIPipeline warmed up: {timings}")
+        return timings
+
     # ------------------------------------------------------------------
     # Stage 1 — Scraper
     # ------------------------------------------------------------------
@@ -121,22 +181,61 @@ class ArgusAIPipeline:
     # Stage 4+5 — Single Listing Analysis  (sync)
     # ------------------------------------------------------------------
 
-    def analyze_listing(self, listing: dict) -> dict:
+    def analyze_listing(self, listing: dict, deadline: Optional[Deadline] = None) -> dict:
         """
         Run predictor + explainer on an already-extracted listing dict.
 
+        With a deadline, the explainer only gets the time that is left and
+        falls back to the template explanation when too little remains.
+
         Returns:
             {
                 "listing_id", "risk_score", "risk_level",
-                "explanation", "features_used", "data_source"
+                "explanation", "features_used", "data_source",
+                "degraded_engines"
             }
         """
         predictor = self._get_predictor()
-        explainer = self._get_explainer()
 
-        prediction  = predictor.predict(listing)
-        explanation = explainer.explain(listing, prediction)
+        prediction            = predictor.predict(listing, deadline, ListingContext.from_listing(listing))
+        explanation, degraded = self._explain(listing, prediction, deadline)
 
+        return self._listing_result(listing, prediction, explanation, degraded)
+
+    def _explain(
+        self, listing: dict, prediction: dict, deadline: Optional[Deadline] = None
+    ) -> tuple[str, bool]:
+        """
+        Run the explainer under admission control and the request deadline.
+
+        Returns (explanation, degraded); degraded is True when the LLM
+        explainer was saturated or out of time and the rule-based fallback
+        was used.
+        """
+        from ai_layer.llm_explainer.explainer import MIN_LLM_BUDGET
+
+        explainer = self._get_explainer()
+        with metrics.STAGE_LATENCY.time(stage="explanation"):
+            if explainer.provider == "mock":
+                return explainer.explain(listing, prediction), False
+            if deadline is not None and not deadline.allows(MIN_LLM_BUDGET):
+                logger.warning(f"Deadline: {deadline} — skipping LLM explanation")
+                metrics.FALLBACKS.inc(engine=admission.LLM_EXPLAINER, reason="deadline")
+                return explainer._fallback_explanation(listing, prediction), True
+            with admission.admit(admission.LLM_EXPLAINER) as admitted:
+                if admitted:
+                    return explainer.explain(listing, prediction, deadline), False
+            return explainer._fallback_explanation(listing, prediction), True
+
+    @staticmethod
+    def _listing_result(
+        listing: dict, prediction: dict, explanation: str, explainer_degraded: bool = False
+    ) -> dict:
+        degraded_engines = []
+        if listing.get("extraction_degraded"):
+            degraded_engines.append(admission.EXTRACTION)
+        if explainer_degraded:
+            degraded_engines.append(admission.LLM_EXPLAINER)
         return {
             "listing_id":      prediction["listing_id"],
             "risk_score":      prediction["risk_score"],
@@ -145,16 +244,71 @@ class ArgusAIPipeline:
             "explanation":     explanation,
             "features_used":   prediction.get("features_used", {}),
             "data_source":     listing.get("data_source", "scraped"),
+            "degraded_engines": degraded_engines,
         }
 
+    # ------------------------------------------------------------------
+    # Engine graph nodes
+    # ------------------------------------------------------------------
+
+    def engines(self) -> list[Engine]:
+        """
+        The URL analysis stages as engine-graph nodes (see ai_layer.engine_graph).
+
+        Inputs: "url" (unless "listing" is supplied) and "deadline".
+        Outputs:
+            "listing"     — extracted listing dict
+            "context"     — its ListingContext
+            "model"       — ScamPredictor.predict() output (features + IsolationForest)
+            "explanation" — (explanation, degraded)
+
+        Further engines (services/analysis_graph.py) can depend on these
+        outputs and are passed in as `extra_engines`.
+        """
+        return [
+            Engine("listing", self._extract_engine, deps=("url", "deadline")),
+            Engine(
+                "context", lambda r: ListingContext.from_listing(r["listing"]), deps=("listing",)
+            ),
+            Engine(
+                "model",
+                lambda r: self._get_predictor().predict(r["listing"], r["deadline"], r["context"]),
+                deps=("listing", "context", "deadline"),
+                blocking=True,
+            ),
+            Engine(
+                "explanation",
+                lambda r: self._explain(r["listing"], r["model"], r["deadline"]),
+                deps=("listing", "model", "deadline"),
+                blocking=True,
+                # Whatever the provider does, the request deadline holds
+                timeout=lambda r: r["deadline"].remaining(),
+                fallback=self._fallback_explanation,
+            ),
+        ]
+
+    def _fallback_explanation(self, results: dict) -> tuple[str, bool]:
+        """The "explanation" output when the explainer overran the deadline or failed"""
+        explainer = self._get_explainer()
+        return explainer._fallback_explanation(results["listing"], results["model"]), True
+
+    @staticmethod
+    async def _extract_engine(results: dict) -> dict:
+        from ai_layer.input.url_analyzer import ListingURLAnalyzer
+        return await ListingURLAnalyzer().extract_listing(results["url"], results["deadline"])
+
     # ------------------------------------------------------------------
     # URL-based analysis  (async)
     # ------------------------------------------------------------------
 
-    async def analyze_url(self, url: str) -> dict:
+    async def analyze_url(self, url: str, deadline: Optional[Deadline] = None) -> dict:
         """
         Full pipeline starting from a listing URL.
 
+        Every stage runs against one request deadline (default: ANALYSIS_DEADLINE
+        seconds from now): scraping and the LLM explanation are cut short or
+        replaced by their fallbacks so the whole call stays within it.
+
         Steps:
             1. ListingURLAnalyzer detects platform + extracts listing
                (falls back to synthetic if bot-blocked)
@@ -168,12 +322,43 @@ class ArgusAIPipeline:
                 "data_source", "features_used"
             }
         """
-        from ai_layer.input.url_analyzer import ListingURLAnalyzer
-
-        analyzer = ListingURLAnalyzer()
-        listing  = await analyzer.extract_listing(url)
-        result   = self.analyze_listing(listing)
+        results = await self.graph.run(
+            {"url": url, "deadline": Deadline.ensure(deadline)}, targets=("explanation",)
+        )
+        return self.graph_result(url, results)
+
+    async def iter_analyze_url(
+        self, url: str, deadline: Optional[Deadline] = None
+    ) -> AsyncIterator[tuple[str, dict]]:
+        """
+        Same stages as analyze_url(), yielding each as soon as it completes.
 
+        Yields (stage, payload) pairs in order:
+            ("listing",     extracted listing dict)
+            ("model",       ScamPredictor.predict() output)
+            ("explanation", {"explanation": str})
+            ("result",      the dict analyze_url() returns)
+        """
+        results = {"url": url, "deadline": Deadline.ensure(deadline)}
+        async for stage, payload in self.graph.iter_run(results, targets=("explanation",)):
+            results[stage] = payload
+            if stage == "explanation":
+                explanation, degraded = payload
+                yield stage, {"explanation": explanation, "degraded": degraded}
+            elif stage != "context":
+                yield stage, payload
+        yield "result", self.graph_result(url, results)
+
+    def graph_result(self, url: str, results: dict) -> dict:
+        """Shape the "listing", "model" and "explanation" outputs of a graph run like analyze_url()."""
+        listing = results["listing"]
+        explanation, degraded = results["explanation"]
+        return self._url_result(
+            url, listing, self._listing_result(listing, results["model"], explanation, degraded)
+        )
+
+    def _url_result(self, url: str, listing: dict, result: dict) -> dict:
+        """Shape an analyze_listing() result into the analyze_url() output."""
         out = {
             "url":              url,
             "platform":         listing.get("platform_source", "unknown"),
@@ -185,6 +370,7 @@ class ArgusAIPipeline:
             "explanation":      result["explanation"],
             "data_source":      result["data_source"],
             "features_used":    result["features_used"],
+            "degraded_engines": result.get("degraded_engines", []),
         }
         
         if "override_risk_level" in listing:
@@ -196,6 +382,114 @@ class ArgusAIPipeline:
                 
         return out
 
+    # ------------------------------------------------------------------
+    # Bulk analysis  (async)
+    # ------------------------------------------------------------------
+
+    async def analyze_batch(
+        self,
+        items: list[Union[str, dict]],
+        concurrency: int = 8,
+        slot: Optional[Callable[[], AsyncContextManager]] = None,
+    ) -> list[Union[dict, Exception]]:
+        """
+        Analyze many listings (URL strings and/or extracted listing dicts).
+
+        Each item's extraction and explanation run through the engine graph,
+        with the same deadline handling, timeouts and fallbacks as
+        analyze_url(); between them, model scoring is one vectorized
+        ScamPredictor call for the whole batch. URL extraction and
+        explanations run with at most `concurrency` in flight, each
+        additionally inside `slot()` when given (e.g. a scheduler slot).
+
+        Each of an item's two stages gets a fresh ANALYSIS_DEADLINE when it
+        takes its slot: waiting for the rest of the batch in between is not
+        charged to the item, or large batches would only ever get template
+        explanations.
+
+        Returns a list aligned with `items`: each entry is the analyze_url()
+        result dict (plus "listing_id" for dict items that carry their own),
+        or the Exception that item failed with.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        @asynccontextmanager
+        async def bounded():
+            async with semaphore:
+                if slot is None:
+                    yield
+                else:
+                    async with slot():
+                        yield
+
+        async def extract(item) -> dict:
+            if isinstance(item, dict):
+                return await self.graph.run(
+                    {"listing": item, "deadline": Deadline()}, targets=("context",)
+                )
+            if not isinstance(item, str) or "http" not in item:
+                raise ValueError("Item must be a listing object or an http(s) URL")
+            async with bounded():
+                return await self.graph.run(
+                    {"url": item, "deadline": Deadline()}, targets=("context",)
+                )
+
+        extracted = await asyncio.gather(*(extract(i) for i in items), return_exceptions=True)
+        ok = [i for i, staged in enumerate(extracted) if not isinstance(staged, Exception)]
+
+        # Stage 4 — one vectorized scoring pass; isolate bad rows if it fails
+        predictor = self._get_predictor()
+        try:
+            predictions = await asyncio.to_thread(
+                predictor.predict_batch,
+                [extracted[i]["listing"] for i in ok],
+                [extracted[i]["context"] for i in ok],
+            )
+        except Exception as exc:
+            logger.warning(f"Vectorized scoring failed ({exc}); scoring items individually.")
+            scored_one = await asyncio.gather(
+                *(
+                    self.graph.run({**extracted[i], "deadline": Deadline()}, targets=("model",))
+                    for i in ok
+                ),
+                return_exceptions=True,
+            )
+            predictions = [r if isinstance(r, Exception) else r["model"] for r in scored_one]
+
+        # Stage 5 — explanations, bounded
+        async def explain(i: int, prediction: dict) -> tuple[str, bool]:
+            async with bounded():
+                results = await self.graph.run(
+                    {**extracted[i], "model": prediction, "deadline": Deadline()},
+                    targets=("explanation",),
+                )
+            return results["explanation"]
+
+        scored = [(i, p) for i, p in zip(ok, predictions) if not isinstance(p, Exception)]
+        explanations = await asyncio.gather(
+            *(explain(i, p) for i, p in scored), return_exceptions=True
+        )
+
+        results: list[Union[dict, Exception]] = list(extracted)
+        for i, p in zip(ok, predictions):
+            if isinstance(p, Exception):
+                results[i] = p
+        for (i, prediction), explained in zip(scored, explanations):
+            if isinstance(explained, Exception):
+                results[i] = explained
+                continue
+            explanation, degraded = explained
+            listing = extracted[i]["listing"]
+            url     = items[i] if isinstance(items[i], str) else listing.get("listing_url")
+            results[i] = self._url_result(
+                url, listing, self._listing_result(listing, prediction, explanation, degraded)
+            )
+            # Only an id the caller supplied is kept; the service mints the rest
+            given = items[i].get("listing_id") if isinstance(items[i], dict) else None
+            if given and given != "unknown":
+                results[i]["listing_id"] = given
+        return results
+
     # ------------------------------------------------------------------
     # Backward compat alias
     # ------------------------------------------------------------------
@@ -15,6 +15,9 @@ from typing import Optional
 import joblib
 import pandas as pd
 
+from ai_layer import metrics
+from ai_layer.deadline import Deadline
+from ai_layer.listing_context import ListingContext
 from ai_layer.preprocessing.feature_engineer import FeatureEngineer
 
 logger = logging.getLogger(__name__)
@@ -55,12 +58,21 @@ class ScamPredictor:
             f"(low={self._low_threshold:.4f}, high={self._high_threshold:.4f})"
         )
 
-    def predict(self, listing: dict) -> dict:
+    def predict(
+        self,
+        listing: dict,
+        deadline: Optional[Deadline] = None,
+        context: Optional[ListingContext] = None,
+    ) -> dict:
         """
         Predict anomaly score for a single listing dict.
 
         Args:
-            listing: Raw listing dict (same schema as listings_dataset.json).
+            listing:  Raw listing dict (same schema as listings_dataset.json).
+            deadline: Request deadline. Scoring takes milliseconds and the
+                      risk score is the one output that cannot be degraded, so
+                      it always runs; an already-expired deadline is logged.
+            context:  The request's ListingContext, if one was already built.
 
         Returns:
             {
@@ -70,41 +82,66 @@ class ScamPredictor:
                 "features_used": dict,
             }
         """
-        if self._model is None:
-            self.load()
+        if deadline is not None and deadline.expired():
+            logger.warning(f"Deadline expired before scoring {listing.get('listing_id')}; scoring anyway")
+        return self.predict_batch([listing], [context] if context is not None else None)[0]
 
-        features_df = self._engineer.transform([listing])
+    def predict_batch(
+        self, listings: list[dict], contexts: Optional[list[ListingContext]] = None
+    ) -> list[dict]:
+        """
+        Vectorized predict() over many listings, results in input order.
 
-        if features_df.empty:
-            logger.warning("Feature engineering returned no rows — using zero-vector fallback.")
-            listing_id = listing.get("listing_id", "unknown")
-            zero_feat = {col: 0 for col in self._feature_cols}
-            features_df = pd.DataFrame([zero_feat])
-            features_df["listing_id"] = listing_id
+        Features are engineered in one pass (per-listing, so each result is
+        identical to calling predict() on its own) and the scaler and
+        IsolationForest run once over the whole matrix. `contexts`, when
+        given, must be aligned with `listings`.
+        """
+        if self._model is None:
+            self.load()
+        if not listings:
+            return []
+
+        with metrics.STAGE_LATENCY.time(stage="feature_engineering"):
+            features_df = self._engineer.transform(listings, per_listing=True, contexts=contexts)
+
+        # Rows dropped during cleaning get the zero-vector fallback
+        missing = [i for i in range(len(listings)) if features_df.empty or i not in features_df.index]
+        if missing:
+            logger.warning(
+                f"Feature engineering dropped {len(missing)} listing(s) — using zero-vector fallback."
+            )
+            zero_rows = pd.DataFrame(
+                [{col: 0 for col in self._feature_cols} for _ in missing], index=missing
+            )
+            zero_rows["listing_id"] = [listings[i].get("listing_id", "unknown") for i in missing]
+            features_df = pd.concat([features_df, zero_rows]) if not features_df.empty else zero_rows
+        features_df = features_df.sort_index()
 
         # Keep listing_id for output, drop non-feature cols for model input
-        listing_id = features_df["listing_id"].iloc[0] if "listing_id" in features_df.columns else listing.get("listing_id", "unknown")
         X = features_df[[c for c in self._feature_cols]].fillna(0)
-        X_scaled = self._scaler.transform(X)
-
-        score = float(self._model.decision_function(X_scaled)[0])
-        # Confidence logic: further from zero means more certain decision
-        # isolation forest decision_function scores typically range from -0.5 to 0.5
-        # we scale abs(score) to a 0-1 range
-        confidence = min(abs(score) * 2.5, 1.0)
-        risk_level = self._score_to_risk(score)
-
-        return {
-            "listing_id":      listing_id,
-            "risk_score":      round(score, 6),
-            "confidence_score": round(confidence, 4),
-            "risk_level":      risk_level,
-            "features_used":   X.iloc[0].to_dict(),
-        }
-
-    def predict_batch(self, listings: list[dict]) -> list[dict]:
-        """Run predict() on a list of listings."""
-        return [self.predict(lst) for lst in listings]
+        with metrics.STAGE_LATENCY.time(stage="model_scoring"):
+            X_scaled = self._scaler.transform(X)
+            scores = self._model.decision_function(X_scaled)
+
+        results = []
+        for pos, (idx, row) in enumerate(X.iterrows()):
+            listing_id = features_df.at[idx, "listing_id"]
+            if listing_id is None or (isinstance(listing_id, float) and pd.isna(listing_id)):
+                listing_id = listings[idx].get("listing_id", "unknown")
+            score = float(scores[pos])
+            # Confidence logic: further from zero means more certain decision
+            # isolation forest decision_function scores typically range from -0.5 to 0.5
+            # we scale abs(score) to a 0-1 range
+            confidence = min(abs(score) * 2.5, 1.0)
+            results.append({
+                "listing_id":      listing_id,
+                "risk_score":      round(score, 6),
+                "confidence_score": round(confidence, 4),
+                "risk_level":      self._score_to_risk(score),
+                "features_used":   row.to_dict(),
+            })
+        return results
 
     def _score_to_risk(self, score: float) -> str:
         """Use dataset-calibrated percentile thresholds loaded from the model."""
@@ -11,7 +11,10 @@ import json
 import logging
 from pathlib import Path
 import pandas as pd
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from ai_layer.listing_context import ListingContext
 
 logger = logging.getLogger(__name__)
 
@@ -25,9 +28,23 @@ class FeatureEngineer:
             "urgent", "token", "advance", "immediate", "limited offer"
         ]
 
-    def transform(self, listings: list[dict]) -> pd.DataFrame:
+    def transform(
+        self,
+        listings: list[dict],
+        per_listing: bool = False,
+        contexts: Optional[list["ListingContext"]] = None,
+    ) -> pd.DataFrame:
         """
         Transform raw listings into a feature matrix.
+
+        By default the group features (city median, phone reuse) are computed
+        across the whole batch, as for training. With per_listing=True each
+        row is its own group, giving the same features as transforming every
+        listing on its own — used for vectorized inference. The returned frame
+        keeps the positional index of the input rows that survived cleaning.
+
+        `contexts`, aligned with `listings`, supplies each description's
+        already-normalized text so it is not lower-cased again here.
         """
         if not listings:
             return pd.DataFrame()
@@ -55,7 +72,8 @@ class FeatureEngineer:
         
         # Feature: price_vs_city_median
         # Compute median price for each city
-        city_medians = df.groupby('city')['price'].transform('median')
+        city_key = df.index if per_listing else df['city']
+        city_medians = df.groupby(city_key)['price'].transform('median')
         df['price_vs_city_median'] = df['price'] / city_medians
         
         # Feature: description_length
@@ -67,20 +85,24 @@ class FeatureEngineer:
             text_lower = text.lower()
             return sum(text_lower.count(word) for word in self.urgency_words)
             
-        df['urgency_keyword_count'] = df['description'].apply(count_urgency)
+        if contexts is not None:
+            df['urgency_keyword_count'] = [contexts[i].count(self.urgency_words) for i in df.index]
+        else:
+            df['urgency_keyword_count'] = df['description'].apply(count_urgency)
         
         # Feature: image_count
         df['image_count'] = df['image_count'].fillna(0).astype(int)
         
         # Feature: phone_reuse_count
-        phone_counts = df.groupby('phone_number')['listing_id'].transform('count')
+        phone_key = df.index if per_listing else df['phone_number']
+        phone_counts = df.groupby(phone_key)['listing_id'].transform('count')
         df['phone_reuse_count'] = phone_counts
         
         # Feature: listings_per_day_per_phone
         if 'timestamp' in df.columns:
             df['datetime'] = pd.to_datetime(df['timestamp'], errors='coerce')
             df['date'] = df['datetime'].dt.date
-            daily_phone_counts = df.groupby(['phone_number', 'date'])['listing_id'].transform('count')
+            daily_phone_counts = df.groupby([phone_key, df['date']])['listing_id'].transform('count')
             df['listings_per_day_per_phone'] = daily_phone_counts.fillna(0).astype(int)
         else:
             df['listings_per_day_per_phone'] = 0
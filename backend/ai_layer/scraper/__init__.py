@@ -1,8 +1,19 @@
 """
 ai_layer/scraper/__init__.py
 """
-from ai_layer.scraper.playwright_scraper import PlaywrightScraper
-from ai_layer.scraper.bs4_scraper import BS4Scraper
-from ai_layer.scraper.dataset_manager import DatasetManager
-
 __all__ = ["PlaywrightScraper", "BS4Scraper", "DatasetManager"]
+
+_EXPORTS = {
+    "PlaywrightScraper": "ai_layer.scraper.playwright_scraper",
+    "BS4Scraper":        "ai_layer.scraper.bs4_scraper",
+    "DatasetManager":    "ai_layer.scraper.dataset_manager",
+}
+
+
+def __getattr__(name):
+    # Lazy: importing a single source module (e.g. for URL extraction) must
+    # not drag in requests/BeautifulSoup and every scraper implementation.
+    if name in _EXPORTS:
+        import importlib
+        return getattr(importlib.import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -147,7 +147,8 @@ class PlaywrightScraper(BaseScraper):
 
                         if dataset_manager:
                             added, skipped = dataset_manager.add_listings(city_listings)
-                            dataset_manager.save()
+                            # json.dump of the whole dataset — keep it off the event loop
+                            await asyncio.to_thread(dataset_manager.save)
                             metrics["duplicates_skipped"] += skipped
                             
                             city_ref = city.capitalize()
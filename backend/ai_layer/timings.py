@@ -0,0 +1,67 @@
+"""
+ai_layer/timings.py
+===================
+Per-request stage timing breakdown.
+
+A request opens a collector (the HTTP middleware does this for every
+request); any stage timed while it is open — URL extraction, feature
+engineering, model scoring, the LLM explainer, each detection engine — adds
+its monotonic duration to the collector. The breakdown is then surfaced in
+the Server-Timing response header, the optional `timings` debug field and
+slow-request logs.
+
+The collector lives in a ContextVar, so it follows the request into tasks
+and asyncio.to_thread() workers without being passed around. Outside a
+request (CLI training runs, background jobs) recording is a no-op.
+
+Usage:
+    with timings.collect() as breakdown:
+        with timings.stage("model_scoring"):
+            ...
+    breakdown  # → {"model_scoring": 12.4}   (milliseconds)
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+_current: ContextVar[Optional[dict]] = ContextVar("argus_stage_timings", default=None)
+
+
+@contextmanager
+def collect():
+    """Open a timing collector for the current request and yield its dict."""
+    breakdown: dict[str, float] = {}
+    token = _current.set(breakdown)
+    try:
+        yield breakdown
+    finally:
+        _current.reset(token)
+
+
+def record(name: str, seconds: float) -> None:
+    """Add a stage duration to the active collector (no-op outside a request)."""
+    breakdown = _current.get()
+    if breakdown is not None:
+        breakdown[name] = round(breakdown.get(name, 0.0) + seconds * 1000, 1)
+
+
+@contextmanager
+def stage(name: str):
+    """Time the with-block as stage `name`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+
+
+def current() -> dict:
+    """Snapshot of the active request's breakdown so far ({} outside a request)."""
+    return dict(_current.get() or {})
+
+
+def server_timing_header(breakdown: dict) -> str:
+    """Format a breakdown as a Server-Timing header value."""
+    return ", ".join(f"{name};dur={ms}" for name, ms in breakdown.items())
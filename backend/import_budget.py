@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Import-time / cold-start budget check for the API process.
+
+Imports a module (default: main, i.e. the FastAPI app) in a fresh interpreter
+with `python -X importtime`, prints the slowest modules by cumulative import
+time and exits non-zero when:
+  • the total import time exceeds the budget, or
+  • a heavy dependency that should be deferred to first use / warm-up
+    (boto3, pandas, scikit-learn, Playwright, ...) is imported at start-up.
+
+Usage:
+    python import_budget.py                       # budget from IMPORT_BUDGET_MS (default 1000)
+    python import_budget.py --budget-ms 600 --top 30
+    python import_budget.py --module routers.analyze --allow boto3
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+DEFAULT_FORBIDDEN = (
+    "boto3", "botocore", "pandas", "numpy", "sklearn", "joblib", "playwright", "openai",
+)
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(\S+)")
+
+
+def measure(module: str) -> list[tuple[str, int, int]]:
+    """Return [(module, self_us, cumulative_us)] for one cold import."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    if proc.returncode != 0:
+        print(proc.stderr)
+        raise SystemExit(f"✗ Importing {module} failed")
+    rows = []
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, name = match.groups()
+            rows.append((name, int(self_us), int(cumulative_us)))
+    return rows
+
+
+def _cumulative(rows: list[tuple[str, int, int]], module: str) -> int:
+    return next((c for name, _, c in rows if name == module), 0)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check API import time against a budget")
+    parser.add_argument("--module", default="main", help="Module to import (default: main)")
+    parser.add_argument(
+        "--budget-ms", type=float,
+        default=float(os.getenv("IMPORT_BUDGET_MS", "1000")),
+        help="Max total import time in ms (env IMPORT_BUDGET_MS)",
+    )
+    parser.add_argument("--runs", type=int, default=3, help="Cold imports to take the best of")
+    parser.add_argument("--top", type=int, default=20, help="Slowest modules to list")
+    parser.add_argument(
+        "--allow", action="append", default=[],
+        help="Heavy package allowed at import time (repeatable)",
+    )
+    args = parser.parse_args()
+
+    # Best of N: the first run also pays for cold .pyc / filesystem caches
+    runs = [measure(args.module) for _ in range(max(args.runs, 1))]
+    rows = min(runs, key=lambda r: _cumulative(r, args.module))
+    total_ms = _cumulative(rows, args.module) / 1000
+
+    print(f"Import time for '{args.module}' (best of {len(runs)} runs)")
+    print("-" * 60)
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for name, self_us, cumulative_us in sorted(rows, key=lambda r: -r[2])[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+    print("-" * 60)
+
+    failed = False
+    forbidden = [p for p in DEFAULT_FORBIDDEN if p not in args.allow]
+    heavy = sorted({name.split(".")[0] for name, *_ in rows} & set(forbidden))
+    if heavy:
+        print(f"✗ Heavy dependencies imported at start-up: {', '.join(heavy)}")
+        print("  Defer them to first use or move them into warm-up (services/warmup.py)")
+        failed = True
+
+    if total_ms > args.budget_ms:
+        print(f"✗ Total {total_ms:.1f}ms exceeds budget of {args.budget_ms:.0f}ms")
+        failed = True
+    else:
+        print(f"✓ Total {total_ms:.1f}ms within budget of {args.budget_ms:.0f}ms")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,56 @@
-from fastapi import FastAPI
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager, suppress
+from ai_layer.config import load_env
+
+# Before anything reads its configuration from the environment
+load_env()
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+from ai_layer import admission, metrics, timings
+from ai_layer.input.browser import close_browser
+from ai_layer.loop_watchdog import LoopWatchdog
 from routers import analyze, submissions
+from services.idempotency import idempotency_store
+from services.result_cache import url_result_cache
+from services.submission_cache import submission_read_cache
+from services.scheduler import scheduler
+from services.submission_feed import submission_feed
+from services.submission_writer import get_writer, shutdown_writer
+from services import warmup
+
+logger = logging.getLogger(__name__)
+
+# Opt-in: report event-loop stalls (blocking calls in async code) with the offending stack
+loop_watchdog = (
+    LoopWatchdog(threshold=float(os.getenv('LOOP_STALL_THRESHOLD_MS', '100')) / 1000)
+    if os.getenv('LOOP_WATCHDOG', '0') == '1' else None
+)
 
-app = FastAPI(title="Project Argus API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if loop_watchdog:
+        loop_watchdog.start()
+    get_writer()
+    await analyze.url_jobs.start()
+    # Warm up in the background: liveness (/) answers immediately, /ready waits
+    warmup_task = asyncio.create_task(warmup.run_warmup())
+    yield
+    warmup_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await warmup_task
+    await analyze.url_jobs.stop()
+    await close_browser()
+    if loop_watchdog:
+        await loop_watchdog.stop()
+    # Drain queued submissions before the process exits
+    shutdown_writer()
+
+app = FastAPI(title="Project Argus API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -12,9 +60,58 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+SLOW_REQUEST_MS = float(os.getenv('SLOW_REQUEST_MS', '5000'))
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    with timings.collect() as breakdown:
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            breakdown["total"] = round((time.perf_counter() - start) * 1000, 1)
+            response.headers["Server-Timing"] = timings.server_timing_header(breakdown)
+            return response
+        finally:
+            elapsed = time.perf_counter() - start
+            # Label by route template, not raw path, to keep cardinality bounded
+            route = request.scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            metrics.REQUEST_LATENCY.observe(elapsed, route=path, method=request.method)
+            metrics.REQUESTS.inc(route=path, method=request.method, status=status)
+            if elapsed * 1000 >= SLOW_REQUEST_MS:
+                logger.warning(
+                    f"Slow request: {request.method} {request.url.path} -> {status} "
+                    f"in {elapsed * 1000:.0f}ms; stages (ms): {breakdown}"
+                )
+
 app.include_router(analyze.router)
 app.include_router(submissions.router)
 
 @app.get("/")
 def health_check():
-    return {"status": "ok", "service": "Project Argus"}
+    return {
+        "status": "ok",
+        "service": "Project Argus",
+        "persistence": get_writer().stats(),
+        "submission_feed": submission_feed.stats(),
+        "url_cache": url_result_cache.stats(),
+        "submission_cache": submission_read_cache.stats(),
+        "url_jobs": analyze.url_jobs.stats(),
+        "idempotency": idempotency_store.stats(),
+        "admission": admission.stats(),
+        "scheduler": scheduler.stats(),
+        "event_loop": loop_watchdog.stats() if loop_watchdog else {"enabled": False},
+    }
+
+@app.get("/ready")
+def readiness_check():
+    """Readiness probe: 503 until startup warm-up has finished"""
+    report = warmup.readiness()
+    return JSONResponse(status_code=200 if report["ready"] else 503, content=report)
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    """Prometheus scrape endpoint"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
@@ -25,3 +25,6 @@ class AnalysisResult(BaseModel):
     image_analysis: dict
     recommendations: list[str]
     listing_id: str
+    degraded_engines: list[str] = []
+    skipped_engines: list[str] = []  # not run: cheap signals were already decisive
+    timings: Optional[dict[str, float]] = None  # per-stage ms, only with ?debug=true
@@ -1,27 +1,117 @@
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Body, Query, Header, Request, Response
+from fastapi.responses import JSONResponse
 from models.schemas import AnalysisResult
-from services import price_engine, text_engine, image_engine, risk_scorer
+from ai_layer import admission, timings
+from services import risk_scorer
+from services.idempotency import IdempotencyKeyError, idempotency_store, request_fingerprint
+from services.jobs import JOB_FAILED, JOB_SUCCEEDED, InMemoryJobStore, JobRunner, QueueFullError
+from services.scheduler import BATCH, INTERACTIVE, QuotaExceededError, scheduler
+from services.streaming import stream_events
+from services.submission_store import index_attributes
+from services.submission_writer import get_writer
 import uuid
-import boto3
+from typing import Optional, Union
 from datetime import datetime
 import json
 import os
 
 router = APIRouter(prefix="/analyze", tags=["analyze"])
 
+# Bulk analysis limits
+MAX_BATCH_SIZE = int(os.getenv('MAX_BATCH_SIZE', '500'))
+BATCH_CONCURRENCY = int(os.getenv('BATCH_CONCURRENCY', '8'))
+
+# Form engines whose LLM call is under admission control or may be skipped
+# by the early-exit policy (result key → engine)
+DEGRADABLE_ENGINES = {
+    "text": admission.LLM_TEXT,
+    "image": admission.LLM_VISION,
+}
+
+# Engine outputs streamed as events by POST /analyze/stream
+STREAMED_ENGINES = ("price", "text", "image")
+
+async def _read_first_image(images) -> Optional[tuple[bytes, str]]:
+    """
+    Read the first uploaded image up front (only the first is analyzed).
+
+    Upload files are closed once the endpoint returns, so streaming responses
+    must have the bytes in hand before they start.
+    """
+    if not images or len(images) == 0:
+        return None
+    first_image = images[0]
+    return await first_image.read(), first_image.content_type or "image/jpeg"
+
+def _fuse_results(listing_id: str, results: dict) -> AnalysisResult:
+    """Shape the engine graph's results into the final scored AnalysisResult"""
+    final_result = results["fusion"]
+    return AnalysisResult(
+        risk_score=final_result["final_score"],
+        verdict=final_result["verdict"],
+        price_analysis=results["price"],
+        text_analysis=results["text"],
+        image_analysis=results["image"],
+        recommendations=final_result["recommendations"],
+        listing_id=listing_id,
+        degraded_engines=[
+            engine for key, engine in DEGRADABLE_ENGINES.items()
+            if results[key].get("degraded")
+        ],
+        skipped_engines=[
+            engine for key, engine in DEGRADABLE_ENGINES.items()
+            if results[key].get("skipped")
+        ]
+    )
+
+def _form_input(title, description, price, locality, city, property_type) -> dict:
+    return {
+        "title": title,
+        "description": description,
+        "price": price,
+        "locality": locality,
+        "city": city,
+        "property_type": property_type
+    }
+
+def _form_listing(title, description, price, locality, city, property_type, contact_number) -> dict:
+    """The submitted form as a listing dict, the engine graph's "listing" input"""
+    return {
+        **_form_input(title, description, price, locality, city, property_type),
+        "phone_number": contact_number
+    }
+
+def _client_key(request: Request, api_key: Optional[str]) -> str:
+    """Quota and fairness identity: the X-API-Key if sent, else the client address"""
+    if api_key:
+        return f"key:{api_key}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+def _priority(requested: Optional[str], default: str) -> str:
+    """Clients may lower their priority with X-Priority: batch, never raise it"""
+    return BATCH if (requested or "").lower() == BATCH else default
+
+def _check_quota(client: str, cost: float = 1) -> None:
+    try:
+        scheduler.check_quota(client, cost)
+    except QuotaExceededError as e:
+        raise HTTPException(
+            status_code=429,
+            detail="Rate limit exceeded, please retry later.",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
 def save_to_dynamodb(listing_id: str, input_data: dict, result: dict):
-    """Save analysis result to DynamoDB"""
+    """
+    Queue an analysis result for persistence.
+
+    The item is handed to the write-behind queue and flushed in batches by a
+    background thread to the configured submission store (DynamoDB or
+    SQLite), so this never blocks the request.
+    """
     from decimal import Decimal
     
     try:
-        # Skip if no AWS credentials (demo mode)
-        if not os.getenv('AWS_ACCESS_KEY_ID') and not os.getenv('AWS_REGION'):
-            print("Demo mode: Skipping DynamoDB save")
-            return
-            
-        dynamodb = boto3.resource('dynamodb', region_name=os.getenv('AWS_REGION', 'ap-south-1'))
-        table = dynamodb.Table(os.getenv('DYNAMODB_TABLE', 'argus-submissions'))
-        
         # Convert all values to DynamoDB-compatible types (no raw floats)
         def to_dynamo(val):
             if isinstance(val, float):
@@ -37,20 +127,24 @@ def save_to_dynamodb(listing_id: str, input_data: dict, result: dict):
             'timestamp': datetime.utcnow().isoformat(),
             'city': input_data.get('city', 'unknown'),
             'locality': input_data.get('locality', 'unknown'),
-            'price': to_dynamo(input_data.get('price', 0)),
+            'price': input_data.get('price', 0),
             'property_type': input_data.get('property_type', 'unknown'),
-            'final_score': to_dynamo(result.get('risk_score', 0)),
-            'risk_level': result.get('risk_level', 'unknown'),
+            'final_score': result.get('risk_score', 0),
+            # Form results carry only a score and verdict; bucket them like URL results
+            'risk_level': result.get('risk_level') or risk_scorer.risk_level(result.get('risk_score', 0)),
             'verdict': result.get('verdict', result.get('risk_level', 'unknown')),
             'title': input_data.get('title', ''),
             'description': input_data.get('description', '')[:500],  # truncate long descriptions
         }
         
+        # Time-bucket and city keys for the newest-first indexes
+        item.update(index_attributes(item))
+        
         # Remove any None values (DynamoDB rejects them)
         item = {k: v for k, v in item.items() if v is not None}
         
-        table.put_item(Item=item)
-        print(f"DynamoDB save OK: listing_id={listing_id}")
+        # Published to live dashboards (GET /submissions/feed) once persisted
+        get_writer().enqueue(to_dynamo(item))
     except Exception as e:
         print(f"DynamoDB save failed: {e}")
         # Don't fail the request if DynamoDB save fails
@@ -64,137 +158,364 @@ async def analyze_listing(
     city: str = Form(...),
     property_type: str = Form(...),
     contact_number: str = Form(None),
-    images: list[UploadFile] = File(None)
+    images: list[UploadFile] = File(None),
+    debug: bool = Query(False),
+    idempotency_key: Optional[str] = Header(None),
+    response: Response = None
 ):
     """
     Analyze a rental listing for scam indicators
     
     Accepts multipart form data with listing details and optional images.
     Returns comprehensive risk analysis with score, verdict, and recommendations.
+    With ?debug=true the per-stage timing breakdown is included as `timings`.
+    
+    Send an Idempotency-Key header to make retries safe: a repeated key
+    returns the original response (same listing_id) without re-running the
+    engines, and waits for the original if it is still in flight.
     """
+    from services.argus_service import analyze_listing_form
+
     try:
-        # Generate unique listing ID
-        listing_id = str(uuid.uuid4())
+        image = await _read_first_image(images)
         
-        # Run price analysis
-        try:
-            price_result = price_engine.analyze_price(
-                price=price,
-                city=city,
-                locality=locality,
-                property_type=property_type
-            )
-        except Exception as e:
-            print(f"Price analysis error: {str(e)}")
-            price_result = {
-                "score": 50,
-                "verdict": "Unable to verify",
-                "market_median": None,
-                "percentage_below_market": None,
-                "reasoning": "Price analysis unavailable"
-            }
-        
-        # Run text analysis
-        try:
-            text_result = text_engine.analyze_text(
-                title=title,
-                description=description,
-                contact_number=contact_number
+        async def run_analysis() -> dict:
+            # Generate unique listing ID
+            listing_id = str(uuid.uuid4())
+            
+            # Run price, text and image engines concurrently off the event loop.
+            # Each engine gets its own deadline; a miss falls back to the
+            # "unavailable" result so latency tracks the slowest engine, not the sum.
+            results = await analyze_listing_form(
+                _form_listing(title, description, price, locality, city, property_type, contact_number),
+                image
             )
-        except Exception as e:
-            print(f"Text analysis error: {str(e)}")
-            text_result = {
-                "score": 50,
-                "verdict": "Unable to analyze",
-                "flags": [],
-                "reasoning": "Text analysis unavailable"
-            }
-        
-        # Run image analysis
-        try:
-            if images and len(images) > 0:
-                image_result = await image_engine.analyze_images(images)
-            else:
-                image_result = {
-                    "score": 20,
-                    "verdict": "No image provided",
-                    "flags": [],
-                    "reasoning": "No images were provided for analysis"
-                }
-        except Exception as e:
-            print(f"Image analysis error: {str(e)}")
-            image_result = {
-                "score": 50,
-                "verdict": "Unable to analyze",
-                "flags": [],
-                "reasoning": "Image analysis unavailable"
-            }
+            
+            analysis_result = _fuse_results(listing_id, results).dict()
+            
+            # Queue for persistence (write-behind, non-blocking)
+            input_data = _form_input(title, description, price, locality, city, property_type)
+            save_to_dynamodb(listing_id, input_data, analysis_result)
+            return analysis_result
         
-        # Calculate final risk score
-        final_result = risk_scorer.calculate_final_score(
-            price_result=price_result,
-            text_result=text_result,
-            image_result=image_result
+        fingerprint = request_fingerprint(
+            title, description, price, locality, city, property_type, contact_number,
+            image[0] if image else None,
         )
-        
-        # Prepare response
-        analysis_result = AnalysisResult(
-            risk_score=final_result["final_score"],
-            verdict=final_result["verdict"],
-            price_analysis=price_result,
-            text_analysis=text_result,
-            image_analysis=image_result,
-            recommendations=final_result["recommendations"],
-            listing_id=listing_id
+        analysis_result, replayed = await idempotency_store.run(
+            "analyze", idempotency_key, fingerprint, run_analysis
         )
+        if replayed and response is not None:
+            response.headers["Idempotent-Replayed"] = "true"
         
-        # Save to DynamoDB (non-blocking)
-        input_data = {
-            "title": title,
-            "description": description,
-            "price": price,
-            "locality": locality,
-            "city": city,
-            "property_type": property_type
-        }
-        save_to_dynamodb(listing_id, input_data, analysis_result.dict())
-        
+        if debug:
+            analysis_result["timings"] = timings.current()
         return analysis_result
         
+    except IdempotencyKeyError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         print(f"Analysis endpoint error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
 
 @router.post("/url")
-async def analyze_listing_url(url: str = Form(...)):
+async def analyze_listing_url(
+    request: Request,
+    url: str = Form(...),
+    debug: bool = Query(False),
+    idempotency_key: Optional[str] = Header(None),
+    x_api_key: Optional[str] = Header(None),
+    x_priority: Optional[str] = Header(None),
+    response: Response = None
+):
     """
     Analyze a rental listing from URL with intelligent scraping and fallback
+    
+    With ?debug=true the per-stage timing breakdown is included as `timings`.
+    Honors the Idempotency-Key header like POST /analyze.
+    Runs in the interactive priority class unless X-Priority: batch is sent;
+    answers 429 with Retry-After when the client's quota is exhausted. Only
+    valid requests that actually run are charged; idempotent replays are free.
     """
+    client = _client_key(request, x_api_key)
     try:
         if not url or "http" not in url:
             return {"error": "Unable to analyze the provided listing URL."}
 
         from services.argus_service import analyze_listing_url as run_argus_analysis
         
-        # Run the full production pipeline
-        result = await run_argus_analysis(url)
+        async def run_analysis() -> dict:
+            # Charged only once the request is valid, and never for an idempotent replay
+            _check_quota(client)
+            
+            # Run the full production pipeline
+            result = await run_argus_analysis(
+                url, priority=_priority(x_priority, INTERACTIVE), client=client
+            )
+            
+            # Queue for persistence (write-behind, non-blocking)
+            save_to_dynamodb(
+                listing_id=result.get("listing_id", str(uuid.uuid4())),
+                input_data={"url": url, "city": result.get("city", ""), "title": url.split("/")[-1]},
+                result=result,
+            )
+            return result
         
-        # Save to DynamoDB
-        save_to_dynamodb(
-            listing_id=result.get("listing_id", str(uuid.uuid4())),
-            input_data={"url": url, "city": result.get("city", ""), "title": url.split("/")[-1]},
-            result=result,
+        result, replayed = await idempotency_store.run(
+            "url", idempotency_key, request_fingerprint(url), run_analysis
         )
+        if replayed and response is not None:
+            response.headers["Idempotent-Replayed"] = "true"
         
         # Return the normalized service result directly
+        if debug:
+            # Results may be shared via the URL cache — don't mutate them
+            result = {**result, "timings": timings.current()}
         return result
         
+    except HTTPException:
+        raise
+    except IdempotencyKeyError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         print(f"URL analysis error: {str(e)}")
         return {"error": "Unable to analyze the provided listing URL."}
 
+@router.post("/stream")
+async def analyze_listing_stream(
+    title: str = Form(...),
+    description: str = Form(...),
+    price: int = Form(...),
+    locality: str = Form(...),
+    city: str = Form(...),
+    property_type: str = Form(...),
+    contact_number: str = Form(None),
+    images: list[UploadFile] = File(None),
+    stream_format: str = Query("sse", alias="format")
+):
+    """
+    Streaming variant of POST /analyze
+    
+    Emits a "price", "text" and "image" event as each engine finishes, then a
+    final "result" event with the fused risk score. Served as Server-Sent
+    Events by default, or NDJSON with ?format=ndjson.
+    """
+    from services.argus_service import stream_listing_form
+
+    listing_id = str(uuid.uuid4())
+    image = await _read_first_image(images)
+
+    async def events():
+        # Engines still in flight are cancelled if the client goes away mid-stream
+        results = {}
+        async for name, output in stream_listing_form(
+            _form_listing(title, description, price, locality, city, property_type, contact_number),
+            image
+        ):
+            results[name] = output
+            if name in STREAMED_ENGINES:
+                yield name, output
+
+        analysis_result = _fuse_results(listing_id, results)
+        input_data = _form_input(title, description, price, locality, city, property_type)
+        save_to_dynamodb(listing_id, input_data, analysis_result.dict())
+        yield "result", analysis_result.dict()
+
+    return stream_events(events(), stream_format)
+
+@router.post("/url/stream")
+async def analyze_listing_url_stream(
+    request: Request,
+    url: str = Form(...),
+    stream_format: str = Query("sse", alias="format"),
+    x_api_key: Optional[str] = Header(None),
+    x_priority: Optional[str] = Header(None)
+):
+    """
+    Streaming variant of POST /analyze/url
+    
+    Emits "listing" (extracted data), "model" (anomaly score) and
+    "explanation" events as the pipeline stages finish, then a final
+    "result" event with the same payload POST /analyze/url returns.
+    """
+    if not url or "http" not in url:
+        raise HTTPException(status_code=400, detail="Unable to analyze the provided listing URL.")
+
+    client = _client_key(request, x_api_key)
+    _check_quota(client)
+
+    from services.argus_service import stream_listing_url
+
+    async def events():
+        stages = stream_listing_url(url, priority=_priority(x_priority, INTERACTIVE), client=client)
+        async for stage, payload in stages:
+            if stage == "result":
+                save_to_dynamodb(
+                    listing_id=payload.get("listing_id", str(uuid.uuid4())),
+                    input_data={"url": url, "city": payload.get("city", ""), "title": url.split("/")[-1]},
+                    result=payload,
+                )
+            yield stage, payload
+
+    return stream_events(events(), stream_format)
+
+async def _run_url_job(url: str, priority: str = INTERACTIVE, client: str = "anonymous") -> dict:
+    """Job handler: full URL analysis plus persistence, as POST /analyze/url does"""
+    from services.argus_service import analyze_listing_url as run_argus_analysis
+
+    result = await run_argus_analysis(url, priority=priority, client=client)
+    save_to_dynamodb(
+        listing_id=result.get("listing_id", str(uuid.uuid4())),
+        input_data={"url": url, "city": result.get("city", ""), "title": url.split("/")[-1]},
+        result=result,
+    )
+    return result
+
+# Bounded worker pool for URL analysis jobs (started/stopped in main.py lifespan)
+url_jobs = JobRunner(
+    handler=_run_url_job,
+    store=InMemoryJobStore(ttl=float(os.getenv('JOB_RESULT_TTL', '3600'))),
+    workers=int(os.getenv('JOB_WORKERS', '4')),
+    max_queue=int(os.getenv('JOB_QUEUE_SIZE', '100')),
+    retry_after=int(os.getenv('JOB_RETRY_AFTER', '5')),
+)
+
+def _job_view(job: dict) -> dict:
+    return {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "submitted_at": job["submitted_at"],
+        "started_at": job["started_at"],
+        "finished_at": job["finished_at"],
+        "result_url": f"{router.prefix}/url/jobs/{job['job_id']}/result",
+    }
+
+@router.post("/url/jobs", status_code=202)
+async def submit_url_job(
+    request: Request,
+    url: str = Form(...),
+    x_api_key: Optional[str] = Header(None),
+    x_priority: Optional[str] = Header(None)
+):
+    """
+    Submit a URL for background analysis
+    
+    Returns a job id immediately; poll GET /analyze/url/jobs/{job_id} for
+    status and GET /analyze/url/jobs/{job_id}/result for the result. Answers
+    429 with Retry-After when the job queue is full.
+    """
+    if not url or "http" not in url:
+        raise HTTPException(status_code=400, detail="Unable to analyze the provided listing URL.")
+    client = _client_key(request, x_api_key)
+    _check_quota(client)
+    try:
+        job_id = url_jobs.submit({
+            "url": url,
+            "priority": _priority(x_priority, INTERACTIVE),
+            "client": client,
+        })
+    except QueueFullError as e:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many queued analyses, please retry later.",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    return _job_view(url_jobs.get(job_id))
+
+@router.get("/url/jobs/{job_id}")
+async def get_url_job(job_id: str):
+    """Get the status of a URL analysis job"""
+    job = url_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _job_view(job)
+
+@router.get("/url/jobs/{job_id}/result")
+async def get_url_job_result(job_id: str):
+    """
+    Get the result of a URL analysis job
+    
+    Returns 202 with Retry-After while the job is still queued or running.
+    """
+    job = url_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] == JOB_SUCCEEDED:
+        return job["result"]
+    if job["status"] == JOB_FAILED:
+        return {"error": "Unable to analyze the provided listing URL."}
+    return JSONResponse(
+        status_code=202,
+        content=_job_view(job),
+        headers={"Retry-After": str(url_jobs.retry_after)},
+    )
+
 @router.post("/listing")
-async def analyze_listing_api(url: str = Form(...)):
+async def analyze_listing_api(
+    request: Request,
+    url: str = Form(...),
+    x_api_key: Optional[str] = Header(None),
+    x_priority: Optional[str] = Header(None)
+):
     """API endpoint for listing analysis by URL."""
-    return await analyze_listing_url(url)
+    return await analyze_listing_url(
+        request, url, debug=False, idempotency_key=None,
+        x_api_key=x_api_key, x_priority=x_priority,
+    )
+
+@router.post("/batch")
+async def analyze_batch(
+    request: Request,
+    items: list[Union[str, dict]] = Body(...),
+    x_api_key: Optional[str] = Header(None)
+):
+    """
+    Analyze many listings in one request (e.g. a whole search-result page)
+    
+    Accepts a JSON array whose items are listing URLs or extracted listing
+    objects. Results come back in input order; an item that fails is
+    reported with its error instead of failing the whole batch.
+    
+    Always runs in the batch priority class and is charged one quota token
+    per item (up to the bucket size).
+    """
+    if len(items) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(items)} items (max {MAX_BATCH_SIZE})"
+        )
+
+    client = _client_key(request, x_api_key)
+    _check_quota(client, cost=len(items))
+
+    from services.argus_service import analyze_batch as run_argus_batch
+
+    try:
+        results = await run_argus_batch(
+            items, concurrency=BATCH_CONCURRENCY, priority=BATCH, client=client
+        )
+    except Exception as e:
+        print(f"Batch analysis error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Batch analysis failed: {str(e)}")
+
+    # Queue successful results for persistence (write-behind, non-blocking)
+    for entry in results:
+        if not entry["ok"]:
+            continue
+        item = items[entry["index"]]
+        result = entry["result"]
+        listing = item if isinstance(item, dict) else {"url": item, "title": item.split("/")[-1]}
+        save_to_dynamodb(
+            listing_id=result.get("listing_id") or str(uuid.uuid4()),
+            input_data={**listing, "city": listing.get("city", "")},
+            result=result,
+        )
+
+    succeeded = sum(1 for entry in results if entry["ok"])
+    return {
+        "results": results,
+        "total": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded
+    }
@@ -1,11 +1,20 @@
-from fastapi import APIRouter, HTTPException
-import boto3
-from boto3.dynamodb.conditions import Key
+from fastapi import APIRouter, HTTPException, Header, Query, Response
+from fastapi.responses import StreamingResponse
+from services.streaming import stream_events
+from services.submission_cache import submission_read_cache
+from services.submission_feed import submission_feed
+from services.submission_store import InvalidCursorError, get_repository
 from decimal import Decimal
+from typing import Optional
 import os
 
 router = APIRouter(prefix="/submissions", tags=["submissions"])
 
+MAX_PAGE_SIZE = int(os.getenv('SUBMISSIONS_MAX_PAGE_SIZE', '100'))
+
+# Clients and CDNs may store responses but must revalidate (cheap 304) before reuse
+CACHE_CONTROL = os.getenv('SUBMISSIONS_CACHE_CONTROL', 'no-cache')
+
 def decimal_to_int(obj):
     """Convert DynamoDB Decimal types to int/float for JSON serialization"""
     if isinstance(obj, list):
@@ -17,8 +26,96 @@ def decimal_to_int(obj):
     else:
         return obj
 
+def cached_json(key: tuple, render, if_none_match: Optional[str]) -> Response:
+    """Serve render() through the read cache with a strong ETag; 304 if the client has it."""
+    cached = submission_read_cache.get_or_render(key, render)
+    headers = {"ETag": cached.etag, "Cache-Control": CACHE_CONTROL}
+    if cached.matches(if_none_match):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+@router.get("/feed")
+async def submissions_feed(
+    since: Optional[int] = Query(None),
+    stream_format: str = Query("sse", alias="format"),
+    last_event_id: Optional[str] = Header(None)
+):
+    """
+    Live feed of new submissions (replaces polling GET /submissions/)
+    
+    Streams a "submission" event for every analysis as it is saved, as
+    Server-Sent Events (default) or NDJSON with ?format=ndjson. Reconnecting
+    clients resume after the Last-Event-ID header (or ?since=<id>) from a
+    short replay buffer; ?since=0 replays the whole buffer. A "heartbeat"
+    event is sent while idle.
+    """
+    if since is None and last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+
+    async def events():
+        async for event_id, item in submission_feed.subscribe(since):
+            if event_id is None:
+                yield "heartbeat", {}
+            else:
+                yield "submission", item, event_id
+
+    return stream_events(events(), stream_format)
+
+@router.get("/stats")
+def submission_stats(if_none_match: Optional[str] = Header(None)):
+    """
+    Aggregate statistics for the dashboard
+    
+    Counts of High Risk, Suspicious and Likely Genuine results and a
+    final-score histogram, overall and per city and locality. Served from
+    counters updated on every persisted analysis, so the cost does not grow
+    with the number of submissions.
+    """
+    try:
+        return cached_json(("stats",), get_repository().stats, if_none_match)
+    except Exception as e:
+        print(f"Error fetching submission stats: {str(e)}")
+        raise HTTPException(status_code=503, detail="Submission statistics unavailable")
+
+@router.get("/export")
+def export_submissions(export_format: str = Query("ndjson", alias="format")):
+    """
+    Bulk export of every submission (for offline modeling)
+    
+    Streams the whole store as NDJSON (default) or, with ?format=parquet,
+    a Parquet file (requires pyarrow). Items are read and encoded batch by
+    batch — parallel segmented scans on DynamoDB — so memory use stays flat
+    however large the store is. Also available as a CLI:
+    `python -m services.submission_export`.
+    """
+    from services.submission_export import EXPORT_FORMATS, ExportUnavailableError, export_chunks
+    
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported export format: {export_format}")
+    try:
+        chunks = export_chunks(get_repository(), export_format)
+    except ExportUnavailableError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    
+    def body():
+        try:
+            yield from chunks
+        except Exception as e:
+            # Headers are already sent: the truncated body is the only signal left
+            print(f"Error exporting submissions: {str(e)}")
+            raise
+    
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_FORMATS[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="submissions.{export_format}"',
+            "Cache-Control": "no-store",
+        },
+    )
+
 @router.get("/{listing_id}")
-def get_submission(listing_id: str):
+def get_submission(listing_id: str, if_none_match: Optional[str] = Header(None)):
     """
     Get a specific submission by listing ID
     
@@ -26,19 +123,19 @@ def get_submission(listing_id: str):
         listing_id: Unique identifier for the listing
     
     Returns:
-        Submission details including analysis results
+        Submission details including analysis results. Carries an ETag;
+        send it back in If-None-Match to get a 304 while it is unchanged.
     """
-    try:
-        dynamodb = boto3.resource('dynamodb', region_name=os.getenv('AWS_REGION', 'ap-south-1'))
-        table = dynamodb.Table(os.getenv('DYNAMODB_TABLE', 'argus-submissions'))
+    def render():
+        item = get_repository().get(listing_id)
         
-        response = table.get_item(Key={'listing_id': listing_id})
-        
-        if 'Item' not in response:
+        if item is None:
             raise HTTPException(status_code=404, detail="Submission not found")
         
-        item = decimal_to_int(response['Item'])
-        return item
+        return decimal_to_int(item)
+    
+    try:
+        return cached_json(("item", listing_id), render, if_none_match)
         
     except HTTPException:
         raise
@@ -47,38 +144,50 @@ def get_submission(listing_id: str):
         raise HTTPException(status_code=500, detail=f"Failed to fetch submission: {str(e)}")
 
 @router.get("/")
-def list_submissions(limit: int = 10):
+def list_submissions(
+    limit: int = Query(10, ge=1),
+    cursor: Optional[str] = None,
+    city: Optional[str] = None,
+    risk_level: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None)
+):
     """
-    List recent submissions (for demo dashboard)
+    List recent submissions, newest first (for demo dashboard)
     
     Args:
-        limit: Maximum number of submissions to return (default 10)
+        limit: Maximum number of submissions to return (default 10); values
+               above SUBMISSIONS_MAX_PAGE_SIZE are clamped to it
+        cursor: `next_cursor` from the previous page
+        city: Only submissions from this city (case-insensitive)
+        risk_level: Only "High Risk", "Suspicious" or "Likely Genuine" results
     
     Returns:
-        List of recent submissions with basic details
+        Page of submissions with basic details, and `next_cursor` (null on
+        the last page). Served from the store's indexes, never a scan.
     """
-    try:
-        dynamodb = boto3.resource('dynamodb', region_name=os.getenv('AWS_REGION', 'ap-south-1'))
-        table = dynamodb.Table(os.getenv('DYNAMODB_TABLE', 'argus-submissions'))
-        
-        # Scan table and get last N items (sorted by timestamp)
-        response = table.scan(Limit=limit)
-        
-        items = response.get('Items', [])
-        
-        # Convert Decimal types and sort by timestamp (newest first)
-        items = decimal_to_int(items)
-        items.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
+    limit = min(limit, MAX_PAGE_SIZE)
+
+    def render():
+        items, next_cursor = get_repository().list(
+            limit=limit, cursor=cursor, city=city, risk_level=risk_level
+        )
         
         return {
-            "submissions": items[:limit],
-            "total": len(items)
+            "submissions": decimal_to_int(items),
+            "total": len(items),
+            "next_cursor": next_cursor
         }
+    
+    try:
+        return cached_json(("list", limit, cursor, city, risk_level), render, if_none_match)
         
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         print(f"Error listing submissions: {str(e)}")
-        # Return empty list if DynamoDB is not available
+        # Return empty list if the submission store is not available
         return {
             "submissions": [],
-            "total": 0
+            "total": 0,
+            "next_cursor": None
         }
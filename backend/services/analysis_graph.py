@@ -0,0 +1,174 @@
+"""
+backend/services/analysis_graph.py
+==================================
+The single engine graph behind POST /analyze and POST /analyze/url.
+
+The form path (price, text and image engines fused by risk_scorer) and the
+URL path (extraction → IsolationForest → LLM explanation) used to be two
+separate pipelines. Both are now nodes of one EngineGraph
+(ai_layer/engine_graph.py): the pipeline's own URL stages plus the form
+engines defined here, joined in services/argus_service.py:
+
+    url ─► listing ─► context ─┬─► model ─► explanation
+                               ├─► price ─► screen ─┬─► text  ─┐
+                               └────────────────────┤          ├─► fusion
+    image_upload ───────────────────────────────────┴─► image ─┘
+    (price also feeds fusion directly)
+
+The form endpoint supplies "listing" (built from the form fields) and
+"image_upload" and asks for "fusion"; the URL endpoints supply "url" and
+"deadline" and ask for "explanation". Each engine runs as soon as its inputs
+are ready, so an optimization to any node applies to every endpoint.
+
+Early exit: "screen" combines the price result (milliseconds, no network)
+with a local keyword-scan estimate of the text score
+(text_engine.local_text_analysis). When those cheap signals already put the
+final score at least EARLY_EXIT_MARGIN points past the High Scam Risk or
+Likely Genuine threshold, the Bedrock text and vision calls are skipped: the
+text result is the estimate, an uploaded image gets the neutral
+IMAGE_SKIPPED_RESULT, and both are marked "skipped". The fused score is
+computed from exactly the values the screen estimated, so the verdict is the
+band it decided. In demo mode the engines cost nothing and always run.
+Disable with EARLY_EXIT=0.
+"""
+
+import os
+from typing import Optional
+
+from ai_layer import metrics
+from ai_layer.engine_graph import Engine
+from services import image_engine, price_engine, risk_scorer, text_engine
+from services.submission_store import is_demo_mode
+
+# Per-engine deadlines (seconds). Bedrock round trips dominate text and image.
+ENGINE_TIMEOUTS = {
+    "price": float(os.getenv('PRICE_ENGINE_TIMEOUT', '2')),
+    "text": float(os.getenv('TEXT_ENGINE_TIMEOUT', '20')),
+    "image": float(os.getenv('IMAGE_ENGINE_TIMEOUT', '25')),
+}
+
+# Skip the LLM engines when cheap signals are decisive (see risk_scorer.early_exit_band)
+EARLY_EXIT = os.getenv('EARLY_EXIT', '1') == '1'
+EARLY_EXIT_MARGIN = float(os.getenv('EARLY_EXIT_MARGIN', '5'))
+
+PRICE_FALLBACK = {
+    "score": 50,
+    "verdict": "Unable to verify",
+    "market_median": None,
+    "percentage_below_market": None,
+    "reasoning": "Price analysis unavailable"
+}
+
+TEXT_FALLBACK = {
+    "score": 50,
+    "verdict": "Unable to analyze",
+    "flags": [],
+    "reasoning": "Text analysis unavailable"
+}
+
+IMAGE_FALLBACK = {
+    "score": 50,
+    "verdict": "Unable to analyze",
+    "flags": [],
+    "reasoning": "Image analysis unavailable"
+}
+
+NO_IMAGE_RESULT = {
+    "score": 20,
+    "verdict": "No image provided",
+    "flags": [],
+    "reasoning": "No images were provided for analysis"
+}
+
+
+IMAGE_SKIPPED_RESULT = {
+    "score": 50,
+    "verdict": "Not analyzed",
+    "flags": [],
+    "reasoning": "Image analysis skipped: the price and text signals were already decisive",
+    "skipped": True
+}
+
+
+def _price(results: dict) -> dict:
+    context = results["context"]
+    return price_engine.analyze_price(
+        price=context.price,
+        city=context.city,
+        locality=context.locality,
+        property_type=context.property_type,
+        context=context
+    )
+
+
+def _screen(results: dict) -> Optional[dict]:
+    """
+    Early-exit decision from the cheap signals.
+
+    Returns None when the LLM engines should run, else
+    {"band": "high" | "low", "text": keyword-scan text result}.
+    """
+    if not EARLY_EXIT or is_demo_mode():
+        return None
+    text_estimate  = text_engine.local_text_analysis(results["context"])
+    image_estimate = NO_IMAGE_RESULT if results["image_upload"] is None else IMAGE_SKIPPED_RESULT
+    band = risk_scorer.early_exit_band(
+        results["price"], text_estimate, image_estimate, EARLY_EXIT_MARGIN
+    )
+    if band is None:
+        return None
+    return {"band": band, "text": text_estimate}
+
+
+def _text(results: dict) -> dict:
+    context = results["context"]
+    screen = results["screen"]
+    if screen is not None:
+        metrics.ENGINES_SKIPPED.inc(engine="text", reason=f"early_exit_{screen['band']}")
+        return {**screen["text"], "skipped": True}
+    return text_engine.analyze_text(
+        title=context.title,
+        description=context.description,
+        contact_number=context.contact_number,
+        context=context
+    )
+
+
+def _image(results: dict) -> dict:
+    upload = results["image_upload"]
+    if upload is None:
+        return dict(NO_IMAGE_RESULT)
+    screen = results["screen"]
+    if screen is not None:
+        metrics.ENGINES_SKIPPED.inc(engine="image", reason=f"early_exit_{screen['band']}")
+        return dict(IMAGE_SKIPPED_RESULT)
+    return image_engine.analyze_image(*upload)
+
+
+def _fusion(results: dict) -> dict:
+    return risk_scorer.calculate_final_score(
+        price_result=results["price"],
+        text_result=results["text"],
+        image_result=results["image"]
+    )
+
+
+def form_engines() -> list[Engine]:
+    """Price, text and image engines plus their fusion (the POST /analyze engines)."""
+    return [
+        Engine(
+            "price", _price, deps=("context",), blocking=True,
+            timeout=ENGINE_TIMEOUTS["price"], fallback=PRICE_FALLBACK, latency_label="price",
+        ),
+        # Cheap: a benchmark lookup plus a keyword scan, so gating the LLM engines on it costs little
+        Engine("screen", _screen, deps=("price", "context", "image_upload")),
+        Engine(
+            "text", _text, deps=("context", "screen"), blocking=True,
+            timeout=ENGINE_TIMEOUTS["text"], fallback=TEXT_FALLBACK, latency_label="text",
+        ),
+        Engine(
+            "image", _image, deps=("image_upload", "screen"), blocking=True,
+            timeout=ENGINE_TIMEOUTS["image"], fallback=IMAGE_FALLBACK, latency_label="image",
+        ),
+        Engine("fusion", _fusion, deps=("price", "text", "image"), latency_label="scorer"),
+    ]
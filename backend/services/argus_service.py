@@ -6,72 +6,190 @@ Wraps the ai_layer pipeline for consumption by FastAPI routers.
 """
 
 import logging
+import uuid
+from typing import Any, AsyncIterator, Optional
+from ai_layer.deadline import Deadline
 from ai_layer.pipeline import ArgusAIPipeline
+from services.analysis_graph import form_engines
+from services.result_cache import canonicalize_url, url_result_cache
+from services.scheduler import BATCH, INTERACTIVE, scheduler
 
 logger = logging.getLogger(__name__)
 
-# Singleton pipeline instance for efficiency (lazy loads models)
-_pipeline = ArgusAIPipeline()
+# Singleton pipeline instance for efficiency (lazy loads models). Its engine
+# graph also carries the form engines, so both entry points share one graph.
+_pipeline = ArgusAIPipeline(extra_engines=form_engines())
 
-async def analyze_listing_url(url: str) -> dict:
+def warm_up() -> dict:
+    """Preload the singleton pipeline's model and LLM client (see ArgusAIPipeline.warm_up)."""
+    return _pipeline.warm_up()
+
+async def analyze_listing_url(
+    url: str, priority: str = INTERACTIVE, client: str = "anonymous"
+) -> dict:
     """
     Analyzes a listing URL through the full Argus AI pipeline.
     
+    Results are cached per canonical URL (TTL + LRU) and concurrent requests
+    for the same listing share a single pipeline run. A pipeline run waits
+    for a scheduler slot in the given priority class; the request deadline
+    (ANALYSIS_DEADLINE) starts before that wait.
+    
     Returns structured result including confidence scores and signal breakdown.
     """
+    async def run() -> dict:
+        deadline = Deadline()
+        async with scheduler.slot(priority, client):
+            return await _run_analysis(url, deadline)
+
+    result = await url_result_cache.get_or_compute(canonicalize_url(url), run)
+    # A shared entry may have been computed for an equivalent URL variant
+    result["url"] = url
+    return result
+
+async def _run_analysis(url: str, deadline: Optional[Deadline] = None) -> dict:
+    """Run the pipeline for a URL and normalize the result for the frontend."""
     logger.info(f"ArgusService: Analyzing URL -> {url}")
     
     # --- DEMO OVERRIDE LAYER REMOVED ---
 
     try:
         # Run the full pipeline (Scrape/Synthetic -> Preprocess -> Predict -> Explain)
-        result = await _pipeline.analyze_url(url)
+        result = await _pipeline.analyze_url(url, deadline)
         
-        # Format response for frontend consumption
-        # Compute confidence label
-        score_percentage = result.get("confidence_score", 0.5) * 100
-        if score_percentage >= 70:
-            confidence_label = "High Confidence"
-        elif score_percentage >= 40:
-            confidence_label = "Moderate Confidence"
-        else:
-            confidence_label = "Low Confidence"
-
-        # Default recommendations if missing
-        recommendations = result.get("recommendations") or [
-            "Verify the property and owner ID in person.",
-            "Never pay a 'visiting fee' or 'token amount' before seeing the property.",
-            "Compare the price with other listings in the same locality.",
-            "Request a live video call if you cannot visit immediately."
-        ]
-
-        # Normalize risk_score to a 0-100 integer for the frontend.
-        # Formula: normalized = int((1 - (raw_score + 0.5)) * 100), clamped 0-100
-        raw_score = result.get("risk_score", 0)
-        risk_level = result.get("risk_level", "Suspicious")
-        
-        normalized = int((1 - (raw_score + 0.5)) * 100)
-        ui_score = max(0, min(100, normalized))
-        
-        # Allow explicit overrides from demo/test fallbacks
-        final_risk_level = result.get("override_risk_level") or risk_level
-        final_risk_score = result.get("override_risk_score") or ui_score
-
-        return {
-            "listing_id":       result.get("listing_id", "unknown"),
-            "url":              result.get("url"),
-            "risk_level":       final_risk_level,
-            "risk_score":       final_risk_score,
-            "confidence_score": result.get("confidence_score", 0.5),
-            "explanation":      result.get("explanation", ""),
-            "recommendations":  recommendations,
-            "signals": {
-                "Price vs Market":    result.get("features_used", {}).get("price_vs_city_median"),
-                "Urgency Language":   result.get("features_used", {}).get("urgency_keyword_count"),
-                "Phone Reuse":        result.get("features_used", {}).get("phone_reuse_count"),
-                "Image Count":        result.get("features_used", {}).get("image_count", 0),
-            }
-        }
+        return format_result(result)
     except Exception as e:
         logger.error(f"ArgusService Error: {str(e)}")
         raise e
+
+async def stream_listing_url(
+    url: str, priority: str = INTERACTIVE, client: str = "anonymous"
+) -> AsyncIterator[tuple[str, dict]]:
+    """
+    Streaming counterpart of analyze_listing_url().
+    
+    Yields each pipeline stage as it completes; the final "result" event
+    carries the normalized response and is stored in the URL result cache.
+    A cache hit yields just the "result" event.
+    """
+    key = canonicalize_url(url)
+    cached = url_result_cache.lookup(key)
+    if cached is not None:
+        cached["url"] = url
+        yield "result", cached
+        return
+
+    logger.info(f"ArgusService: Streaming analysis for URL -> {url}")
+    deadline = Deadline()
+    async with scheduler.slot(priority, client):
+        async for stage, payload in _pipeline.iter_analyze_url(url, deadline):
+            if stage == "result":
+                payload = format_result(payload)
+                url_result_cache.put(key, payload)
+            yield stage, payload
+
+
+async def analyze_listing_form(listing: dict, image: Optional[tuple[bytes, str]]) -> dict:
+    """
+    Run the form engines (price, text, image → fusion) on a submitted listing.
+
+    Returns the graph results: "price", "text", "image" and "fusion"
+    (risk_scorer.calculate_final_score() output), among others.
+    """
+    return await _pipeline.graph.run(
+        {"listing": listing, "image_upload": image}, targets=("fusion",)
+    )
+
+def stream_listing_form(
+    listing: dict, image: Optional[tuple[bytes, str]]
+) -> AsyncIterator[tuple[str, Any]]:
+    """Streaming counterpart of analyze_listing_form(): (engine, output) as each finishes."""
+    return _pipeline.graph.iter_run(
+        {"listing": listing, "image_upload": image}, targets=("fusion",)
+    )
+
+
+def _submission_id(listing_id: Optional[str]) -> str:
+    if not listing_id or listing_id == "unknown":
+        return str(uuid.uuid4())
+    return listing_id
+
+
+def format_result(result: dict) -> dict:
+    """Normalize a raw pipeline result into the frontend response shape."""
+    # Format response for frontend consumption
+    # Compute confidence label
+    score_percentage = result.get("confidence_score", 0.5) * 100
+    if score_percentage >= 70:
+        confidence_label = "High Confidence"
+    elif score_percentage >= 40:
+        confidence_label = "Moderate Confidence"
+    else:
+        confidence_label = "Low Confidence"
+
+    # Default recommendations if missing
+    recommendations = result.get("recommendations") or [
+        "Verify the property and owner ID in person.",
+        "Never pay a 'visiting fee' or 'token amount' before seeing the property.",
+        "Compare the price with other listings in the same locality.",
+        "Request a live video call if you cannot visit immediately."
+    ]
+
+    # Normalize risk_score to a 0-100 integer for the frontend.
+    # Formula: normalized = int((1 - (raw_score + 0.5)) * 100), clamped 0-100
+    raw_score = result.get("risk_score", 0)
+    risk_level = result.get("risk_level", "Suspicious")
+    
+    normalized = int((1 - (raw_score + 0.5)) * 100)
+    ui_score = max(0, min(100, normalized))
+    
+    # Allow explicit overrides from demo/test fallbacks
+    final_risk_level = result.get("override_risk_level") or risk_level
+    final_risk_score = result.get("override_risk_score") or ui_score
+
+    return {
+        # Results without an id of their own (URLs, listings sent without one)
+        # get a fresh submission id; the predictor's "unknown" is not an id
+        "listing_id":       _submission_id(result.get("listing_id")),
+        "url":              result.get("url"),
+        "risk_level":       final_risk_level,
+        "risk_score":       final_risk_score,
+        "confidence_score": result.get("confidence_score", 0.5),
+        "explanation":      result.get("explanation", ""),
+        "recommendations":  recommendations,
+        "signals": {
+            "Price vs Market":    result.get("features_used", {}).get("price_vs_city_median"),
+            "Urgency Language":   result.get("features_used", {}).get("urgency_keyword_count"),
+            "Phone Reuse":        result.get("features_used", {}).get("phone_reuse_count"),
+            "Image Count":        result.get("features_used", {}).get("image_count", 0),
+        },
+        "degraded_engines": result.get("degraded_engines", []),
+    }
+
+
+async def analyze_batch(
+    items: list, concurrency: int = 8, priority: str = BATCH, client: str = "anonymous"
+) -> list[dict]:
+    """
+    Analyzes a batch of listing dicts and/or URLs in one pipeline pass.
+    
+    Each item's extraction and explanation takes a scheduler slot in the
+    given priority class (batch by default), so bulk work yields to
+    interactive requests.
+    
+    Returns one entry per item, in order: {"index", "ok", "result"} on
+    success or {"index", "ok", "error"} when that item failed.
+    """
+    logger.info(f"ArgusService: Analyzing batch of {len(items)} items")
+    raw = await _pipeline.analyze_batch(
+        items, concurrency=concurrency, slot=lambda: scheduler.slot(priority, client)
+    )
+
+    out = []
+    for index, result in enumerate(raw):
+        if isinstance(result, Exception):
+            logger.warning(f"ArgusService: batch item {index} failed: {result}")
+            out.append({"index": index, "ok": False, "error": str(result) or type(result).__name__})
+        else:
+            out.append({"index": index, "ok": True, "result": format_result(result)})
+    return out
@@ -0,0 +1,317 @@
+"""
+backend/services/dynamo_submissions.py
+======================================
+Newest-first submission listing on DynamoDB without table scans.
+
+Every submission carries two index attributes (added by save_to_dynamodb):
+
+    day       "YYYY-MM-DD" bucket of its timestamp
+    city_key  lower-cased city
+
+and the table has two global secondary indexes (created by setup_aws.py):
+
+    DAY_INDEX   partition day,      sort timestamp  — latest N overall
+    CITY_INDEX  partition city_key, sort timestamp  — latest N in a city
+
+"Latest N" is a descending query on today's bucket, continuing into older
+days (up to SUBMISSIONS_LOOKBACK_DAYS) until N items are found. A city filter
+queries the city index instead; a risk_level filter is applied server-side
+to whichever index is queried. Pages are resumed with an opaque cursor that
+wraps DynamoDB's LastEvaluatedKey (plus the current day bucket).
+
+Submissions written before the index attributes existed are not in the
+indexes; run `python setup_aws.py --backfill` once to add them.
+
+DynamoDBSubmissionRepository is the DynamoDB backend of
+services/submission_store.py. Its aggregate counters (submission_stats.py)
+live in a separate STATS_TABLE, one item per scope, bumped with atomic ADD
+updates after each batch is written, less the items it overwrote. Full
+exports use parallel_scan(): EXPORT_SEGMENTS scan segments read
+concurrently, one thread each.
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Iterator, Optional
+
+from ai_layer.aws_clients import get_resource, get_table
+from ai_layer.listing_context import normalize_key
+from services.submission_store import (
+    Batch,
+    InvalidCursorError,
+    SubmissionRepository,
+    decode_cursor,
+    encode_cursor,
+    index_attributes,  # noqa: F401  (used by setup_aws.py)
+)
+from services.submission_stats import batch_deltas, build_stats, replaced_items
+
+logger = logging.getLogger(__name__)
+
+DAY_INDEX  = os.getenv('SUBMISSIONS_DAY_INDEX', 'by-day')
+CITY_INDEX = os.getenv('SUBMISSIONS_CITY_INDEX', 'by-city')
+LOOKBACK_DAYS = int(os.getenv('SUBMISSIONS_LOOKBACK_DAYS', '30'))
+STATS_TABLE = os.getenv('DYNAMODB_STATS_TABLE', 'argus-submission-stats')
+EXPORT_SEGMENTS = int(os.getenv('SUBMISSIONS_EXPORT_SEGMENTS', '4'))
+
+# Keys per BatchGetItem request (the DynamoDB maximum)
+BATCH_GET_SIZE = 100
+
+_SEGMENT_DONE = object()
+
+
+def latest_submissions(
+    table,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    city: Optional[str] = None,
+    risk_level: Optional[str] = None,
+    today: Optional[date] = None,
+) -> tuple[list[dict], Optional[str]]:
+    """
+    Return (items newest first, next cursor or None).
+
+    Raises InvalidCursorError for a malformed cursor.
+    """
+    from boto3.dynamodb.conditions import Attr, Key
+
+    state = decode_cursor(cursor) if cursor else {}
+    filter_expr = Attr('risk_level').eq(risk_level) if risk_level else None
+
+    def query(index: str, key_condition, start_key: Optional[dict], count: int) -> dict:
+        # Limit caps the items *evaluated*, so a page never overshoots the
+        # request and LastEvaluatedKey is exactly where the next page starts
+        kwargs = {
+            'IndexName': index,
+            'KeyConditionExpression': key_condition,
+            'ScanIndexForward': False,
+            'Limit': count,
+        }
+        if filter_expr is not None:
+            kwargs['FilterExpression'] = filter_expr
+        if start_key:
+            kwargs['ExclusiveStartKey'] = start_key
+        return table.query(**kwargs)
+
+    items: list[dict] = []
+
+    if city:
+        start_key = state.get('k')
+        while len(items) < limit:
+            page = query(CITY_INDEX, Key('city_key').eq(normalize_key(city)), start_key, limit - len(items))
+            items.extend(page.get('Items', []))
+            start_key = page.get('LastEvaluatedKey')
+            if not start_key:
+                return items, None
+        return items, encode_cursor({'k': start_key})
+
+    today = today or datetime.utcnow().date()
+    oldest = today - timedelta(days=LOOKBACK_DAYS)
+    try:
+        day = date.fromisoformat(state['d']) if 'd' in state else today
+    except (TypeError, ValueError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
+    start_key = state.get('k')
+
+    while day >= oldest:
+        page = query(DAY_INDEX, Key('day').eq(day.isoformat()), start_key, limit - len(items))
+        items.extend(page.get('Items', []))
+        start_key = page.get('LastEvaluatedKey')
+        if not start_key:
+            day -= timedelta(days=1)   # bucket exhausted, continue with the previous day
+        if len(items) >= limit:
+            if day < oldest:
+                return items, None
+            return items, encode_cursor({'d': day.isoformat(), 'k': start_key})
+    return items, None
+
+
+def parallel_scan(
+    table_name: Optional[str] = None,
+    segments: Optional[int] = None,
+    page_size: int = 1000,
+) -> Iterator[Batch]:
+    """
+    Yield scan pages of the whole table, `segments` segments scanned concurrently.
+
+    Each segment runs in its own thread with its own Table (get_table is
+    per thread) and hands pages over through a queue of 2 × segments pages,
+    so memory stays bounded however large the table is: a slow consumer
+    just pauses the scanners. Pages arrive in no particular order. A failed
+    segment raises in the consumer; closing the generator early stops every
+    scanner.
+    """
+    segments = max(1, segments or EXPORT_SEGMENTS)
+    pages: queue.Queue = queue.Queue(maxsize=2 * segments)
+    stop = threading.Event()
+
+    def hand_over(value) -> bool:
+        while not stop.is_set():
+            try:
+                pages.put(value, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def scan_segment(segment: int) -> None:
+        try:
+            table = get_table(table_name)
+            kwargs = {'Segment': segment, 'TotalSegments': segments, 'Limit': page_size}
+            while not stop.is_set():
+                response = table.scan(**kwargs)
+                if response.get('Items') and not hand_over(response['Items']):
+                    return
+                if 'LastEvaluatedKey' not in response:
+                    break
+                kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        except Exception as e:
+            hand_over(e)
+            return
+        hand_over(_SEGMENT_DONE)
+
+    threads = [
+        threading.Thread(target=scan_segment, args=(i,), name=f"dynamodb-scan-{i}", daemon=True)
+        for i in range(segments)
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        remaining = segments
+        while remaining:
+            page = pages.get()
+            if page is _SEGMENT_DONE:
+                remaining -= 1
+            elif isinstance(page, Exception):
+                raise page
+            else:
+                yield page
+    finally:
+        stop.set()
+
+
+class DynamoDBSubmissionRepository(SubmissionRepository):
+    """Submissions in the DYNAMODB_TABLE table (see setup_aws.py)."""
+
+    name = "dynamodb"
+
+    def __init__(self, export_segments: Optional[int] = None):
+        self.export_segments = export_segments
+
+    def put_batch(self, items: list[dict]) -> None:
+        # The items about to be overwritten are read first (one BatchGetItem
+        # per 100 ids) so the counters can take their contribution away;
+        # the write itself stays one batch_writer pass (chunks of 25,
+        # unprocessed items resent).
+        stored = self._stored_items({item['listing_id'] for item in items})
+        table = get_table()
+        try:
+            with table.batch_writer(overwrite_by_pkeys=['listing_id']) as batch:
+                for item in items:
+                    batch.put_item(Item=item)
+        except Exception:
+            self._add_landed_stats(items, stored)
+            raise
+        self._add_stats(items, replaced_items(items, stored))
+
+    @staticmethod
+    def _stored_items(listing_ids: set[str]) -> dict[str, dict]:
+        """Current items for listing_ids (consistent reads): listing_id → item."""
+        table = get_table()
+        dynamodb = get_resource('dynamodb')
+        ids = list(listing_ids)
+        stored = {}
+        for start in range(0, len(ids), BATCH_GET_SIZE):
+            request = {
+                table.name: {
+                    'Keys': [{'listing_id': listing_id} for listing_id in ids[start:start + BATCH_GET_SIZE]],
+                    'ConsistentRead': True,
+                }
+            }
+            for attempt in range(8):
+                response = dynamodb.batch_get_item(RequestItems=request)
+                for item in response.get('Responses', {}).get(table.name, []):
+                    stored[item['listing_id']] = item
+                request = response.get('UnprocessedKeys')
+                if not request:
+                    break
+                time.sleep(0.05 * 2 ** attempt)   # throttled: back off before asking again
+            else:
+                raise RuntimeError("BatchGetItem kept returning unprocessed keys")
+        return stored
+
+    def _add_landed_stats(self, items: list[dict], stored: dict[str, dict]) -> None:
+        """
+        After a failed write, count the items that were stored anyway.
+
+        A retry of the batch reads them back as already stored and nets them
+        to zero, so they would otherwise never be counted.
+        """
+        latest = {item['listing_id']: item for item in items}
+        try:
+            current = self._stored_items(set(latest))
+        except Exception as e:
+            logger.warning(f"Submission stats: could not check a failed batch's writes: {e}")
+            return
+        landed = [item for listing_id, item in latest.items() if current.get(listing_id) == item]
+        if landed:
+            self._add_stats(
+                landed, [stored[item['listing_id']] for item in landed if item['listing_id'] in stored]
+            )
+
+    @staticmethod
+    def _add_stats(items: list[dict], replaced: list[dict] = ()) -> None:
+        # Not retried with the batch: re-adding would double count, so a
+        # failed counter update is logged and skipped instead
+        per_scope: dict[str, dict[str, int]] = defaultdict(dict)
+        for (scope, metric), delta in batch_deltas(items, replaced).items():
+            per_scope[scope][metric] = delta
+        table = get_table(STATS_TABLE)
+        for scope, deltas in per_scope.items():
+            names  = {f"#m{i}": metric for i, metric in enumerate(deltas)}
+            values = {f":v{i}": delta for i, delta in enumerate(deltas.values())}
+            try:
+                table.update_item(
+                    Key={'scope': scope},
+                    UpdateExpression="ADD " + ", ".join(f"#m{i} :v{i}" for i in range(len(deltas))),
+                    ExpressionAttributeNames=names,
+                    ExpressionAttributeValues=values,
+                )
+            except Exception as e:
+                logger.warning(f"Submission stats update for {scope} failed: {e}")
+
+    def get(self, listing_id: str) -> Optional[dict]:
+        return get_table().get_item(Key={'listing_id': listing_id}).get('Item')
+
+    def list(
+        self,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        city: Optional[str] = None,
+        risk_level: Optional[str] = None,
+    ) -> tuple[list[dict], Optional[str]]:
+        return latest_submissions(
+            get_table(), limit=limit, cursor=cursor, city=city, risk_level=risk_level
+        )
+
+    def stats(self) -> dict:
+        # One item per city / locality: the scan's size is independent of the submission count
+        table = get_table(STATS_TABLE)
+        rows = []
+        kwargs = {}
+        while True:
+            response = table.scan(**kwargs)
+            for item in response.get('Items', []):
+                scope = item.pop('scope')
+                rows.extend((scope, metric, int(value)) for metric, value in item.items())
+            if 'LastEvaluatedKey' not in response:
+                return build_stats(rows)
+            kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    def export_batches(self, batch_size: int = 1000) -> Iterator[Batch]:
+        return parallel_scan(segments=self.export_segments, page_size=batch_size)
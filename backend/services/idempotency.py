@@ -0,0 +1,92 @@
+"""
+backend/services/idempotency.py
+===============================
+Idempotency-Key support for analysis submissions.
+
+Mobile clients retry POST /analyze on flaky networks. A retry that carries
+the same Idempotency-Key header within the retention window gets the stored
+response back instead of re-running every engine (and paying for the LLM
+calls again) and writing a duplicate submission. A retry that arrives while
+the original is still in flight waits for it and shares its response.
+
+Responses are kept in an AnalysisResultCache (TTL + LRU + single-flight), so
+failures are never stored: a failed request can be retried with the same key.
+Reusing a key for a *different* request is rejected.
+"""
+
+import hashlib
+import json
+import os
+from typing import Awaitable, Callable, Optional
+
+from services.result_cache import AnalysisResultCache
+
+MAX_KEY_LENGTH = 255
+
+
+class IdempotencyKeyError(Exception):
+    """Raised when an Idempotency-Key is malformed or reused for a different request."""
+
+
+def request_fingerprint(*parts) -> str:
+    """Stable hash of the request inputs (bytes are hashed by content)."""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, (bytes, bytearray)):
+            digest.update(hashlib.sha256(part).digest())
+        else:
+            digest.update(json.dumps(part, sort_keys=True, default=str).encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class IdempotencyStore:
+    """
+    Usage:
+        response, replayed = await idempotency_store.run(
+            "analyze", key, request_fingerprint(...), compute
+        )
+    """
+
+    def __init__(self, ttl: float = 86400.0, max_keys: int = 10000):
+        self._cache = AnalysisResultCache(ttl=ttl, max_entries=max_keys)
+
+    async def run(
+        self,
+        scope: str,
+        key: Optional[str],
+        fingerprint: str,
+        compute: Callable[[], Awaitable[dict]],
+    ) -> tuple[dict, bool]:
+        """
+        Return (response, replayed). Without a key compute() simply runs.
+
+        Raises IdempotencyKeyError if the key is too long or was already used
+        with a different fingerprint.
+        """
+        if not key:
+            return await compute(), False
+        if len(key) > MAX_KEY_LENGTH:
+            raise IdempotencyKeyError(f"Idempotency-Key longer than {MAX_KEY_LENGTH} characters")
+
+        ran = False
+
+        async def run_once() -> dict:
+            nonlocal ran
+            ran = True
+            return {"fingerprint": fingerprint, "response": await compute()}
+
+        entry = await self._cache.get_or_compute(f"{scope}:{key}", run_once)
+        if entry["fingerprint"] != fingerprint:
+            raise IdempotencyKeyError("Idempotency-Key was already used for a different request")
+        return entry["response"], not ran
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+# Process-wide store for POST /analyze and /analyze/url
+idempotency_store = IdempotencyStore(
+    ttl=float(os.getenv('IDEMPOTENCY_TTL', '86400')),
+    max_keys=int(os.getenv('IDEMPOTENCY_MAX_KEYS', '10000')),
+)
@@ -1,9 +1,11 @@
-import boto3
 import json
 import base64
 from typing import Optional
 import os
 
+from ai_layer import admission, metrics
+from ai_layer.aws_clients import get_client
+
 def analyze_image(image_bytes: bytes, image_type: str) -> dict:
     """
     Analyze rental property image for scam indicators using Amazon Bedrock
@@ -28,11 +30,8 @@ def analyze_image(image_bytes: bytes, image_type: str) -> dict:
         return _mock_image_analysis()
     
     try:
-        # Initialize Bedrock client
-        bedrock = boto3.client(
-            service_name='bedrock-runtime',
-            region_name=os.getenv('AWS_REGION', 'ap-south-1')
-        )
+        # Shared, pooled Bedrock client
+        bedrock = get_client('bedrock-runtime')
         
         # Encode image to base64
         image_base64 = base64.b64encode(image_bytes).decode('utf-8')
@@ -83,11 +82,17 @@ Return ONLY a valid JSON object:
             ]
         }
         
-        # Call Bedrock
-        response = bedrock.invoke_model(
-            modelId=os.getenv('BEDROCK_MODEL_ID', 'anthropic.claude-3-5-sonnet-20241022-v2:0'),
-            body=json.dumps(request_body)
-        )
+        # Call Bedrock, unless the engine is saturated past its queue budget
+        with admission.admit(admission.LLM_VISION) as admitted:
+            if not admitted:
+                result = _mock_image_analysis()
+                result["degraded"] = True
+                return result
+            with metrics.llm_call('bedrock', engine=admission.LLM_VISION):
+                response = bedrock.invoke_model(
+                    modelId=os.getenv('BEDROCK_MODEL_ID', 'anthropic.claude-3-5-sonnet-20241022-v2:0'),
+                    body=json.dumps(request_body)
+                )
         
         # Parse response
         response_body = json.loads(response['body'].read())
@@ -112,6 +117,7 @@ Return ONLY a valid JSON object:
     except Exception as e:
         # Handle errors gracefully
         print(f"Error in image analysis: {str(e)}")
+        metrics.FALLBACKS.inc(engine=admission.LLM_VISION, reason='error')
         return {
             "score": 50,
             "verdict": "Unable to analyze",
@@ -119,32 +125,6 @@ Return ONLY a valid JSON object:
             "reasoning": "Could not complete image analysis due to technical error"
         }
 
-async def analyze_images(images: list) -> dict:
-    """
-    Analyze multiple images and aggregate results
-    
-    Args:
-        images: List of image file objects
-    
-    Returns:
-        dict with aggregated analysis results
-    """
-    if not images or len(images) == 0:
-        return {
-            "score": 20,
-            "verdict": "No images provided",
-            "flags": [],
-            "reasoning": "No images were provided for analysis"
-        }
-    
-    # Analyze first image (can be extended to analyze multiple)
-    first_image = images[0]
-    image_bytes = await first_image.read()
-    image_type = first_image.content_type or "image/jpeg"
-    
-    return analyze_image(image_bytes, image_type)
-
-
 def _mock_image_analysis() -> dict:
     """Mock image analysis for demo mode without AWS credentials"""
     return {
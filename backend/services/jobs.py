@@ -0,0 +1,188 @@
+"""
+backend/services/jobs.py
+========================
+Asynchronous job API backing for URL analysis.
+
+Instead of holding an HTTP connection open for the whole scrape → predict →
+explain sequence, clients submit a job, get its id back immediately and poll
+for status/result. Jobs run on a bounded pool of asyncio workers fed by a
+bounded queue; when the queue is full submission fails fast so the router can
+answer 429 with Retry-After.
+
+Job state lives behind the JobStore interface (in-memory by default) so a
+shared store such as Redis or DynamoDB can be dropped in for multi-worker
+deployments.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED    = "queued"
+JOB_RUNNING   = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED    = "failed"
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue is at capacity."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Job queue full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+# ---------------------------------------------------------------------------
+# Job stores
+# ---------------------------------------------------------------------------
+
+class JobStore:
+    """Interface for job state persistence."""
+
+    def create(self, job: dict) -> None:
+        raise NotImplementedError
+
+    def get(self, job_id: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    def update(self, job_id: str, **fields) -> None:
+        raise NotImplementedError
+
+
+class InMemoryJobStore(JobStore):
+    """Process-local job store with TTL-based expiry of finished jobs."""
+
+    def __init__(self, ttl: float = 3600.0):
+        self.ttl   = ttl
+        self._jobs: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def create(self, job: dict) -> None:
+        with self._lock:
+            self._expire()
+            self._jobs[job["job_id"]] = dict(job)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def update(self, job_id: str, **fields) -> None:
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
+
+    def _expire(self) -> None:
+        cutoff = time.time() - self.ttl
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.get("finished_at") and job["finished_at"] < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+# ---------------------------------------------------------------------------
+# Worker pool
+# ---------------------------------------------------------------------------
+
+class JobRunner:
+    """
+    Bounded asyncio worker pool with a bounded submission queue.
+
+    Usage:
+        runner = JobRunner(handler=analyze_listing_url, workers=4, max_queue=100)
+        await runner.start()
+        job_id = runner.submit({"url": url})   # raises QueueFullError when full
+        runner.get(job_id)
+        await runner.stop()
+    """
+
+    def __init__(
+        self,
+        handler: Callable[..., Awaitable[dict]],
+        store: Optional[JobStore] = None,
+        workers: int = 4,
+        max_queue: int = 100,
+        retry_after: int = 5,
+    ):
+        self.handler     = handler
+        self.store       = store or InMemoryJobStore()
+        self.workers     = workers
+        self.max_queue   = max_queue
+        self.retry_after = retry_after
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"job-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, params: dict) -> str:
+        """Queue a job and return its id without waiting for it to run."""
+        if self._queue is None:
+            raise RuntimeError("JobRunner not started")
+        job_id = str(uuid.uuid4())
+        job = {
+            "job_id":      job_id,
+            "status":      JOB_QUEUED,
+            "params":      params,
+            "submitted_at": time.time(),
+            "started_at":  None,
+            "finished_at": None,
+            "result":      None,
+            "error":       None,
+        }
+        if self._queue.full():
+            raise QueueFullError(self.retry_after)
+        self.store.create(job)
+        self._queue.put_nowait(job_id)
+        return job_id
+
+    def get(self, job_id: str) -> Optional[dict]:
+        return self.store.get(job_id)
+
+    def stats(self) -> dict:
+        return {
+            "workers":     self.workers,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue":   self.max_queue,
+        }
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                job = self.store.get(job_id)
+                if job is None:
+                    continue
+                self.store.update(job_id, status=JOB_RUNNING, started_at=time.time())
+                try:
+                    result = await self.handler(**job["params"])
+                except Exception as e:
+                    logger.error(f"Job {job_id} failed: {e}")
+                    self.store.update(
+                        job_id, status=JOB_FAILED, error=str(e), finished_at=time.time()
+                    )
+                else:
+                    self.store.update(
+                        job_id, status=JOB_SUCCEEDED, result=result, finished_at=time.time()
+                    )
+            finally:
+                self._queue.task_done()
@@ -1,9 +1,14 @@
 import json
 import os
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 
+from ai_layer.listing_context import ListingContext
+
+@lru_cache(maxsize=1)
 def load_benchmarks():
-    """Load price benchmark data from JSON file"""
+    """Load price benchmark data from JSON file (read once per process, treat as read-only)"""
     data_path = Path(__file__).parent.parent / "data" / "price_benchmarks.json"
     with open(data_path, 'r') as f:
         return json.load(f)
@@ -12,7 +17,13 @@ def normalize_string(s: str) -> str:
     """Normalize string for case-insensitive fuzzy matching"""
     return s.lower().strip()
 
-def analyze_price(price: int, city: str, locality: str, property_type: str) -> dict:
+def analyze_price(
+    price: int,
+    city: str,
+    locality: str,
+    property_type: str,
+    context: Optional[ListingContext] = None
+) -> dict:
     """
     Analyze rental price against market benchmarks
     
@@ -21,6 +32,7 @@ def analyze_price(price: int, city: str, locality: str, property_type: str) -> d
         city: City name
         locality: Locality/area name
         property_type: Property type (1BHK, 2BHK, 3BHK, PG)
+        context: The request's ListingContext (normalized lookup keys), if one was already built
     
     Returns:
         dict with score, verdict, market_median, percentage_below_market, reasoning
@@ -37,9 +49,11 @@ def analyze_price(price: int, city: str, locality: str, property_type: str) -> d
         }
     
     # Normalize inputs
-    city_norm = normalize_string(city)
-    locality_norm = normalize_string(locality)
-    property_type_norm = normalize_string(property_type)
+    if context is None:
+        context = ListingContext(city=city, locality=locality, property_type=property_type)
+    city_norm = context.city_key
+    locality_norm = context.locality_key
+    property_type_norm = context.property_type_key
     
     # Find matching city
     if city_norm not in benchmarks:
@@ -0,0 +1,163 @@
+"""
+backend/services/result_cache.py
+================================
+TTL + LRU cache for URL analysis results with single-flight deduplication.
+
+Viral listings get pasted by many users within minutes. Results are keyed by
+a canonicalized URL so trivially different links (tracking params, fragment,
+host case, trailing slash) share one entry, and concurrent requests for the
+same key are coalesced onto a single in-flight pipeline run.
+"""
+
+import asyncio
+import copy
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that never change which listing a URL points to
+_TRACKING_PARAMS = {"fbclid", "gclid", "igshid", "ref", "referrer", "source", "si"}
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalize a listing URL into a cache key.
+
+    Lower-cases scheme and host, drops "www.", default ports, fragments,
+    utm_* / click-tracking params and trailing slashes, and sorts the
+    remaining query params.
+    """
+    parts = urlsplit(url.strip())
+    scheme = (parts.scheme or "https").lower()
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path.rstrip("/") or "/"
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+class AnalysisResultCache:
+    """
+    Async TTL cache with LRU eviction and single-flight request coalescing.
+
+    Usage:
+        cache = AnalysisResultCache(ttl=600, max_entries=1024)
+        result = await cache.get_or_compute(key, lambda: run_pipeline(url))
+    """
+
+    def __init__(self, ttl: float = 600.0, max_entries: int = 1024):
+        self.ttl         = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._hits       = 0
+        self._misses     = 0
+        self._coalesced  = 0
+        self._evictions  = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return a copy of a fresh cached result, or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def lookup(self, key: str) -> Optional[dict]:
+        """get() that also counts towards the hit/miss statistics."""
+        if not self.enabled:
+            return None
+        value = self.get(key)
+        if value is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+        return value
+
+    def put(self, key: str, value: dict) -> None:
+        if not self.enabled:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, copy.deepcopy(value))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    async def get_or_compute(
+        self, key: str, compute: Callable[[], Awaitable[dict]]
+    ) -> dict:
+        """
+        Return the cached result for key, or run compute() once and share it
+        with every concurrent caller asking for the same key.
+
+        Failures are propagated to all waiters and never cached.
+        """
+        if not self.enabled:
+            return await compute()
+
+        cached = self.get(key)
+        if cached is not None:
+            self._hits += 1
+            return cached
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self._coalesced += 1
+            # shield: a disconnecting waiter must not cancel the shared run
+            return copy.deepcopy(await asyncio.shield(inflight))
+
+        self._misses += 1
+        task = asyncio.ensure_future(compute())
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: self._finish(key, t))
+        return copy.deepcopy(await asyncio.shield(task))
+
+    def _finish(self, key: str, task: asyncio.Future) -> None:
+        self._inflight.pop(key, None)
+        if task.cancelled():
+            return
+        if task.exception() is None:
+            self.put(key, task.result())
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self._hits + self._misses + self._coalesced
+        return {
+            "entries":   len(self._entries),
+            "inflight":  len(self._inflight),
+            "hits":      self._hits,
+            "misses":    self._misses,
+            "coalesced": self._coalesced,
+            "evictions": self._evictions,
+            "hit_ratio": round((self._hits + self._coalesced) / lookups, 4) if lookups else 0.0,
+        }
+
+
+# Process-wide cache for /analyze/url results
+url_result_cache = AnalysisResultCache(
+    ttl=float(os.getenv('URL_CACHE_TTL', '600')),
+    max_entries=int(os.getenv('URL_CACHE_MAX_ENTRIES', '1024')),
+)
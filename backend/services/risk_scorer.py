@@ -1,3 +1,56 @@
+from typing import Optional
+
+# Final score bands: <= GENUINE_MAX is Likely Genuine, > SUSPICIOUS_MAX is High Scam Risk
+GENUINE_MAX = 30
+SUSPICIOUS_MAX = 65
+
+# Engine weights in the final score
+WEIGHTS = {"price": 0.4, "text": 0.4, "image": 0.2}
+
+def weighted_score(price_score: float, text_score: float, image_score: float) -> int:
+    """Weighted average of the engine scores, rounded"""
+    return round(
+        price_score * WEIGHTS["price"] + text_score * WEIGHTS["text"] + image_score * WEIGHTS["image"]
+    )
+
+def early_exit_band(
+    price_result: dict, text_estimate: dict, image_estimate: dict, margin: float
+) -> Optional[str]:
+    """
+    Decide the verdict from cheap signals alone, if they are decisive
+    
+    Args:
+        price_result: Result from price_engine.analyze_price()
+        text_estimate: Local estimate of the text engine's result
+        image_estimate: Result the image engine gives (no image) or is assumed to give if skipped
+        margin: How far past a band threshold the estimate must land
+    
+    Returns:
+        "high" or "low" when the estimated final score is at least `margin`
+        points beyond the High Scam Risk / Likely Genuine threshold, else
+        None. "low" also needs a verified price (a market median was found):
+        an unverifiable price is no evidence of a genuine listing.
+    """
+    estimate = weighted_score(
+        price_result.get("score", 50), text_estimate.get("score", 50), image_estimate.get("score", 50)
+    )
+    if estimate > SUSPICIOUS_MAX + margin:
+        return "high"
+    if estimate <= GENUINE_MAX - margin and price_result.get("market_median") is not None:
+        return "low"
+    return None
+
+def risk_level(risk_score: int) -> str:
+    """
+    Plain risk level for a 0-100 risk score, in the same terms as the URL
+    pipeline ("High Risk", "Suspicious", "Likely Genuine")
+    """
+    if risk_score > SUSPICIOUS_MAX:
+        return "High Risk"
+    if risk_score > GENUINE_MAX:
+        return "Suspicious"
+    return "Likely Genuine"
+
 def calculate_final_score(price_result: dict, text_result: dict, image_result: dict) -> dict:
     """
     Calculate final risk score using weighted average of all analysis engines
@@ -16,13 +69,12 @@ def calculate_final_score(price_result: dict, text_result: dict, image_result: d
     image_score = image_result.get("score", 50)
     
     # Weighted scoring: Price 40%, Text 40%, Image 20%
-    final_score = (price_score * 0.4) + (text_score * 0.4) + (image_score * 0.2)
-    final_score = round(final_score)
+    final_score = weighted_score(price_score, text_score, image_score)
     
     # Determine verdict based on final score
-    if final_score <= 30:
+    if final_score <= GENUINE_MAX:
         verdict = "✅ Likely Genuine"
-    elif final_score <= 65:
+    elif final_score <= SUSPICIOUS_MAX:
         verdict = "⚠️ Suspicious"
     else:
         verdict = "🚨 High Scam Risk"
@@ -46,14 +98,14 @@ def generate_recommendations(risk_score: int) -> list[str]:
     Returns:
         List of recommendation strings
     """
-    if risk_score > 65:
+    if risk_score > SUSPICIOUS_MAX:
         return [
             "Do not pay any advance",
             "Verify property exists in person before any payment",
             "Video call the landlord and ask them to show the property live",
             "Report this listing if confirmed scam"
         ]
-    elif risk_score > 30:
+    elif risk_score > GENUINE_MAX:
         return [
             "Visit property before paying token amount",
             "Verify broker identity with a government ID",
@@ -0,0 +1,219 @@
+"""
+backend/services/scheduler.py
+=============================
+Priority scheduling and per-client fairness in front of the AI pipeline.
+
+Interactive users share the pipeline (LLM explainer, Playwright extraction)
+with internal batch re-screening. Every pipeline run takes one of
+`capacity` slots from the scheduler:
+
+  • Priority classes — "interactive" and "batch" — are served by weighted
+    fair queuing (start-time fair queuing over per-class virtual time). With
+    the default weights 8:1, while both classes are backlogged interactive
+    work gets 8 of every 9 freed slots, and batch still never starves.
+  • Within a class, waiters are served round-robin per client, so one API
+    key cannot monopolize its class.
+  • Each client (API key, else client address) has a token-bucket quota
+    checked on admission; an empty bucket is a 429 with Retry-After.
+
+Cache hits never reach the scheduler — only real pipeline runs take a slot.
+
+Usage:
+    scheduler.check_quota(client)                  # raises QuotaExceededError
+    async with scheduler.slot(INTERACTIVE, client):
+        await pipeline.analyze_url(url)
+"""
+
+import asyncio
+import logging
+import math
+import os
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+
+from ai_layer import metrics, timings
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+BATCH       = "batch"
+
+_MAX_TRACKED_CLIENTS = 10000
+
+
+class QuotaExceededError(Exception):
+    """Raised when a client has exhausted its token bucket."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Rate limit exceeded, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, up to `burst`."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate    = rate
+        self.burst   = burst
+        self._tokens = burst
+        self._last   = time.monotonic()
+
+    def try_acquire(self, cost: float = 1.0) -> float:
+        """Take `cost` tokens; return 0 on success, else seconds until available."""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+        if self._tokens >= cost:
+            self._tokens -= cost
+            return 0.0
+        if self.rate <= 0:
+            return math.inf
+        return (cost - self._tokens) / self.rate
+
+
+class FairScheduler:
+    """
+    Weighted fair queuing over priority classes with per-client round-robin.
+
+    Must be used from a single event loop.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 8,
+        weights: dict[str, float] = None,
+        rate: float = 2.0,
+        burst: float = 20.0,
+    ):
+        self.capacity = capacity
+        self.weights  = weights or {INTERACTIVE: 8.0, BATCH: 1.0}
+        self.rate     = rate
+        self.burst    = burst
+        self._in_use  = 0
+        # class → client → FIFO of waiter futures
+        self._queues: dict[str, OrderedDict[str, deque]] = {c: OrderedDict() for c in self.weights}
+        self._vtime   = {c: 0.0 for c in self.weights}
+        self._vnow    = 0.0
+        self._buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+        self._served  = {c: 0 for c in self.weights}
+        self._rejected = 0
+
+    # ------------------------------------------------------------------
+    # Quotas
+    # ------------------------------------------------------------------
+
+    def check_quota(self, client: str, cost: float = 1.0) -> None:
+        """Charge `cost` tokens to the client's bucket or raise QuotaExceededError."""
+        if self.rate <= 0:
+            return
+        bucket = self._buckets.get(client)
+        if bucket is None:
+            bucket = self._buckets[client] = TokenBucket(self.rate, self.burst)
+            while len(self._buckets) > _MAX_TRACKED_CLIENTS:
+                self._buckets.popitem(last=False)
+        self._buckets.move_to_end(client)
+        wait = bucket.try_acquire(min(cost, self.burst))
+        if wait:
+            self._rejected += 1
+            raise QuotaExceededError(retry_after=max(1, math.ceil(min(wait, 3600))))
+
+    # ------------------------------------------------------------------
+    # Slots
+    # ------------------------------------------------------------------
+
+    @asynccontextmanager
+    async def slot(self, priority: str, client: str):
+        """Hold one pipeline slot for the duration of the with-block."""
+        if priority not in self.weights:
+            raise ValueError(f"Unknown priority class: {priority}")
+        start = time.perf_counter()
+        if self._in_use < self.capacity and not self._waiting():
+            self._grant(priority)
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            self._queues[priority].setdefault(client, deque()).append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # Granted just as we were cancelled — hand the slot on
+                    self._release()
+                else:
+                    self._discard(priority, client, waiter)
+                raise
+        waited = time.perf_counter() - start
+        metrics.SCHEDULER_WAIT.observe(waited, priority=priority)
+        timings.record("scheduler_wait", waited)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _waiting(self) -> int:
+        return sum(len(q) for clients in self._queues.values() for q in clients.values())
+
+    def _grant(self, priority: str) -> None:
+        # Start-time fair queuing: a class that was idle restarts at "now"
+        start = max(self._vtime[priority], self._vnow)
+        self._vnow = start
+        self._vtime[priority] = start + 1.0 / self.weights[priority]
+        self._served[priority] += 1
+        self._in_use += 1
+
+    def _release(self) -> None:
+        self._in_use -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while self._in_use < self.capacity:
+            backlogged = [c for c, clients in self._queues.items() if clients]
+            if not backlogged:
+                return
+            priority = min(backlogged, key=lambda c: max(self._vtime[c], self._vnow))
+            clients = self._queues[priority]
+            client, waiters = next(iter(clients.items()))
+            waiter = waiters.popleft()
+            # Round-robin: this client goes to the back of its class
+            del clients[client]
+            if waiters:
+                clients[client] = waiters
+            if waiter.done():
+                continue
+            self._grant(priority)
+            waiter.set_result(None)
+
+    def _discard(self, priority: str, client: str, waiter: asyncio.Future) -> None:
+        waiters = self._queues[priority].get(client)
+        if waiters is None:
+            return
+        try:
+            waiters.remove(waiter)
+        except ValueError:
+            pass
+        if not waiters:
+            del self._queues[priority][client]
+
+    def stats(self) -> dict:
+        return {
+            "capacity": self.capacity,
+            "in_use":   self._in_use,
+            "waiting":  {
+                c: sum(len(q) for q in clients.values()) for c, clients in self._queues.items()
+            },
+            "served":   dict(self._served),
+            "weights":  dict(self.weights),
+            "quota_rejections": self._rejected,
+        }
+
+
+# Process-wide scheduler for pipeline runs
+scheduler = FairScheduler(
+    capacity=int(os.getenv('SCHEDULER_CONCURRENCY', '8')),
+    weights={
+        INTERACTIVE: float(os.getenv('SCHEDULER_INTERACTIVE_WEIGHT', '8')),
+        BATCH: float(os.getenv('SCHEDULER_BATCH_WEIGHT', '1')),
+    },
+    rate=float(os.getenv('CLIENT_QUOTA_RATE', '2')),
+    burst=float(os.getenv('CLIENT_QUOTA_BURST', '20')),
+)
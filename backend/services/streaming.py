@@ -0,0 +1,61 @@
+"""
+backend/services/streaming.py
+=============================
+Progressive result streaming over Server-Sent Events or NDJSON.
+
+Engines finish at very different speeds (price and model scores in
+milliseconds, Bedrock/LLM calls in seconds). Streaming endpoints emit each
+engine's result as an event the moment it is ready, then a final event with
+the fused result, so the frontend can render partial results immediately.
+"""
+
+import json
+import logging
+from typing import AsyncIterator, Optional
+
+from fastapi.responses import StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+STREAM_FORMATS = {
+    "sse":    "text/event-stream",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def encode_event(event: str, data: dict, fmt: str = "sse", event_id: Optional[int] = None) -> str:
+    """Serialize one event as an SSE frame or an NDJSON line."""
+    if fmt == "ndjson":
+        line = {"event": event, "data": data}
+        if event_id is not None:
+            line["id"] = event_id
+        return json.dumps(line, default=str) + "\n"
+    frame = f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+    return f"id: {event_id}\n{frame}" if event_id is not None else frame
+
+
+def stream_events(events: AsyncIterator[tuple], fmt: str = "sse") -> StreamingResponse:
+    """
+    Wrap an async iterator of (event, data) pairs in a StreamingResponse.
+    Items may also be (event, data, event_id) to set the SSE id field.
+
+    An exception raised by the iterator is reported as a final "error" event
+    rather than cutting the stream off mid-response.
+    """
+    if fmt not in STREAM_FORMATS:
+        fmt = "sse"
+
+    async def body():
+        try:
+            async for event in events:
+                yield encode_event(*event[:2], fmt, *event[2:])
+        except Exception as e:
+            logger.error(f"Streaming analysis failed: {e}")
+            yield encode_event("error", {"detail": "Analysis failed"}, fmt)
+
+    return StreamingResponse(
+        body(),
+        media_type=STREAM_FORMATS[fmt],
+        # Stop proxies (nginx, App Runner) from buffering partial results
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,160 @@
+"""
+backend/services/submission_cache.py
+====================================
+Read-through LRU cache of rendered GET /submissions responses, with ETags.
+
+Shared result links get requested over and over once a listing goes viral.
+Each response (one submission, a list page, the stats) is cached as the
+JSON bytes actually sent plus a strong ETag over those bytes, so a hit skips
+the store round trip, the Decimal conversion and the JSON encoding, and a
+client or CDN revalidating with If-None-Match gets a bodyless 304.
+
+Invalidation: the submission writer calls invalidate() after every persisted
+batch. It drops the entries of the submissions written and every list and
+stats entry (any write can change those). Entries also expire after
+SUBMISSION_CACHE_TTL seconds, which bounds staleness for writes made by
+other processes sharing the same store.
+
+Usage:
+    response = submission_read_cache.get_or_render(("item", listing_id), render)
+    submission_read_cache.invalidate(items)
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional
+
+
+class CachedResponse:
+    """A rendered JSON response body and its strong ETag."""
+
+    __slots__ = ("body", "etag")
+
+    def __init__(self, body: bytes, etag: str):
+        self.body = body
+        self.etag = etag
+
+    @classmethod
+    def render(cls, content) -> "CachedResponse":
+        # Canonical encoding: equal content always gets the same bytes and ETag
+        body = json.dumps(
+            content, ensure_ascii=False, separators=(",", ":"), sort_keys=True
+        ).encode("utf-8")
+        return cls(body, f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """True when an If-None-Match header already names this representation."""
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        # If-None-Match uses weak comparison: a W/ prefix does not matter
+        candidates = (tag.strip() for tag in if_none_match.split(","))
+        return any(
+            (tag[2:] if tag.startswith("W/") else tag) == self.etag for tag in candidates
+        )
+
+
+class SubmissionReadCache:
+    """
+    Thread-safe TTL + LRU cache of CachedResponse keyed by tuples.
+
+    Keys are ("item", listing_id) for single submissions; any other first
+    element ("list", "stats") marks an aggregate response that every write
+    invalidates.
+    """
+
+    def __init__(self, ttl: float = 30.0, max_entries: int = 1024):
+        self.ttl         = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, tuple[float, CachedResponse]] = OrderedDict()
+        self._lock       = threading.Lock()
+        # Bumped by every invalidate(): a render that started before a write
+        # finished must not be stored after it
+        self._generation = 0
+        self._hits       = 0
+        self._misses     = 0
+        self._evictions  = 0
+        self._invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def get(self, key: tuple) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, response = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return response
+
+    def get_or_render(self, key: tuple, render: Callable[[], object]) -> CachedResponse:
+        """
+        Return the cached response for key, or call render() (→ JSON-able
+        content) and cache its rendering.
+
+        Exceptions from render() propagate and are never cached.
+        """
+        if not self.enabled:
+            return CachedResponse.render(render())
+
+        cached = self.get(key)
+        if cached is not None:
+            with self._lock:
+                self._hits += 1
+            return cached
+
+        with self._lock:
+            self._misses += 1
+            generation = self._generation
+        response = CachedResponse.render(render())
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = (time.monotonic() + self.ttl, response)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._evictions += 1
+        return response
+
+    def invalidate(self, items: Iterable[dict]) -> None:
+        """Drop everything a write of `items` may have changed."""
+        written = {item.get("listing_id") for item in items}
+        with self._lock:
+            self._generation += 1
+            self._invalidations += 1
+            for key in [k for k in self._entries if k[0] != "item" or k[1] in written]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries":       len(self._entries),
+                "hits":          self._hits,
+                "misses":        self._misses,
+                "evictions":     self._evictions,
+                "invalidations": self._invalidations,
+                "hit_ratio":     round(self._hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+# Process-wide cache for GET /submissions responses
+submission_read_cache = SubmissionReadCache(
+    ttl=float(os.getenv('SUBMISSION_CACHE_TTL', '30')),
+    max_entries=int(os.getenv('SUBMISSION_CACHE_MAX_ENTRIES', '1024')),
+)
@@ -0,0 +1,256 @@
+"""
+backend/services/submission_export.py
+=====================================
+Streaming bulk export of every stored submission, as NDJSON or Parquet.
+
+Analysts pull the full submission history for offline modeling. Exports
+read the store batch by batch (SubmissionRepository.export_batches: a
+cursor over SQLite, parallel segmented scans on DynamoDB) and encode each
+batch as it arrives, so memory stays flat however many submissions exist.
+
+    ndjson   one JSON object per line, every stored attribute
+    parquet  one row group per batch with the EXPORT_COLUMNS schema
+             (pyarrow, imported on first use)
+
+Served by GET /submissions/export, and from the command line:
+
+    # From the backend/ directory:
+    python -m services.submission_export > submissions.ndjson
+    python -m services.submission_export --format parquet --output submissions.parquet
+    python -m services.submission_export --store dynamodb --segments 8 --output subs.ndjson
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from typing import Iterable, Iterator, Optional
+
+from ai_layer.config import load_env
+from services.submission_store import SubmissionRepository, create_repository, json_default
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = {
+    "ndjson":  "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+EXPORT_BATCH_SIZE = int(os.getenv('SUBMISSIONS_EXPORT_BATCH_SIZE', '1000'))
+
+# Parquet columns: the attributes save_to_dynamodb writes. Anything else is
+# only in the NDJSON export.
+EXPORT_COLUMNS = {
+    "listing_id":    "string",
+    "timestamp":     "string",
+    "day":           "string",
+    "city":          "string",
+    "city_key":      "string",
+    "locality":      "string",
+    "property_type": "string",
+    "price":         "float64",
+    "final_score":   "float64",
+    "risk_level":    "string",
+    "verdict":       "string",
+    "title":         "string",
+    "description":   "string",
+}
+
+
+class ExportUnavailableError(RuntimeError):
+    """Raised when the requested export format needs a package that is not installed."""
+
+
+def ndjson_chunks(batches: Iterable[list[dict]]) -> Iterator[bytes]:
+    """One bytes chunk of NDJSON lines per batch."""
+    for batch in batches:
+        yield "".join(
+            json.dumps(item, default=json_default, ensure_ascii=False) + "\n" for item in batch
+        ).encode("utf-8")
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise ExportUnavailableError(
+            "Parquet export needs pyarrow (pip install pyarrow)"
+        ) from e
+    return pyarrow
+
+
+class _ChunkSink:
+    """Write-only file object the Parquet writer flushes into; drained after every row group."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def readable(self) -> bool:
+        return False
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+def _column(values: list, kind: str) -> list:
+    if kind == "float64":
+        out = []
+        for value in values:
+            try:
+                out.append(None if value is None else float(value))
+            except (TypeError, ValueError):
+                out.append(None)
+        return out
+    return [None if value is None else str(value) for value in values]
+
+
+def parquet_chunks(batches: Iterable[list[dict]]) -> Iterator[bytes]:
+    """Parquet file bytes, yielded as each batch's row group is written."""
+    pa = _pyarrow()
+    schema = pa.schema([(name, getattr(pa, kind)()) for name, kind in EXPORT_COLUMNS.items()])
+    sink = _ChunkSink()
+    writer = pa.parquet.ParquetWriter(sink, schema, compression="snappy")
+    try:
+        for batch in batches:
+            columns = {
+                name: _column([item.get(name) for item in batch], kind)
+                for name, kind in EXPORT_COLUMNS.items()
+            }
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def export_chunks(
+    repository: SubmissionRepository,
+    fmt: str = "ndjson",
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[bytes]:
+    """
+    Encoded export of every submission in `repository`.
+
+    Raises ValueError for an unknown format and ExportUnavailableError (before
+    anything is read) when Parquet support is not installed.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if fmt == "parquet":
+        _pyarrow()
+        return parquet_chunks(repository.export_batches(batch_size))
+    return ndjson_chunks(repository.export_batches(batch_size))
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def _parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="argus-export",
+        description="Stream every stored submission as NDJSON or Parquet",
+    )
+    parser.add_argument(
+        "--format",
+        choices=sorted(EXPORT_FORMATS),
+        default="ndjson",
+        help="Output format (default: ndjson).",
+    )
+    parser.add_argument(
+        "--output",
+        default=None,
+        metavar="PATH",
+        help="Output file (default: stdout; required for parquet).",
+    )
+    parser.add_argument(
+        "--store",
+        choices=["auto", "dynamodb", "sqlite"],
+        default=None,
+        help="Submission store to read (default: SUBMISSION_STORE).",
+    )
+    parser.add_argument(
+        "--segments",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Parallel scan segments on DynamoDB (default: SUBMISSIONS_EXPORT_SEGMENTS).",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Items read and encoded per batch (default: SUBMISSIONS_EXPORT_BATCH_SIZE).",
+    )
+    args = parser.parse_args(argv)
+    if args.format == "parquet" and args.output is None:
+        parser.error("--output is required for parquet")
+    return args
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = _parse_args(argv)
+    logging.basicConfig(format="%(levelname)-8s  %(name)s — %(message)s", level=logging.INFO)
+    # Before anything reads the store settings: SUBMISSION_STORE=auto picks
+    # DynamoDB only when the AWS settings in .env are loaded
+    load_env()
+    batch_size = args.batch_size or int(
+        os.getenv('SUBMISSIONS_EXPORT_BATCH_SIZE', str(EXPORT_BATCH_SIZE))
+    )
+
+    repository = create_repository(args.store)
+    if args.segments is not None and repository.name == "dynamodb":
+        repository.export_segments = args.segments
+
+    try:
+        chunks = export_chunks(repository, args.format, batch_size)
+    except ExportUnavailableError as e:
+        logger.error(str(e))
+        return 1
+
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    written = 0
+    try:
+        for chunk in chunks:
+            out.write(chunk)
+            written += len(chunk)
+    finally:
+        if args.output:
+            out.close()
+        else:
+            out.flush()
+    logger.info(f"Exported {written} bytes from the {repository.name} store")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
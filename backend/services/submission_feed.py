@@ -0,0 +1,152 @@
+"""
+backend/services/submission_feed.py
+===================================
+Push-based live feed of new submissions.
+
+Dashboards used to poll GET /submissions/, and every poll ran a DynamoDB
+scan. Instead, each analysis is published here by the submission writer
+once it has been persisted, and GET /submissions/feed streams it to every connected
+dashboard over SSE (or NDJSON).
+
+Events get increasing ids and the last FEED_REPLAY_SIZE are kept in a
+replay buffer. A client that reconnects with Last-Event-ID (which browsers'
+EventSource sends automatically) first receives what it missed; ?since=0
+replays the whole buffer. Ids start from the process start time in
+milliseconds, so they keep increasing across restarts and deploys; a
+Last-Event-ID this process has not issued yet (clock skew) replays the
+whole buffer instead of hiding every new event. A subscriber that falls too far behind is
+disconnected rather than buffered without bound; it reconnects and catches
+up from the replay buffer.
+
+The feed is per process. Behind several workers, each dashboard sees the
+submissions made through the worker it is connected to.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import AsyncIterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _Subscriber:
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_pending: int):
+        self.loop    = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self.lagging = False
+
+    def offer(self, event: tuple[int, dict]) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.lagging = True
+
+
+class SubmissionFeed:
+    """
+    In-process pub/sub with a bounded replay buffer.
+
+    Usage:
+        submission_feed.publish(item)                       # any thread
+        async for event_id, item in submission_feed.subscribe(last_event_id):
+            ...
+    """
+
+    def __init__(
+        self,
+        replay_size: int = 100,
+        max_pending: int = 256,
+        heartbeat: float = 15.0,
+        first_id: Optional[int] = None,
+    ):
+        self.max_pending = max_pending
+        self.heartbeat   = heartbeat
+        self._replay: deque[tuple[int, dict]] = deque(maxlen=replay_size)
+        self._subscribers: set[_Subscriber] = set()
+        self._lock       = threading.Lock()
+        # Per-process epoch: a client reconnecting after a restart holds a smaller id
+        self._next_id    = first_id if first_id is not None else int(time.time() * 1000)
+        self._published  = 0
+        self._disconnected = 0
+
+    def publish(self, item: dict) -> int:
+        """Append an item to the feed and fan it out; returns its event id."""
+        with self._lock:
+            event = (self._next_id, item)
+            self._next_id += 1
+            self._published += 1
+            self._replay.append(event)
+            subscribers = list(self._subscribers)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        for sub in subscribers:
+            if running is sub.loop:
+                sub.offer(event)
+                continue
+            try:
+                sub.loop.call_soon_threadsafe(sub.offer, event)
+            except RuntimeError:
+                pass   # subscriber's loop already closed (shutdown)
+        return event[0]
+
+    async def subscribe(
+        self, last_event_id: Optional[int] = None
+    ) -> AsyncIterator[tuple[Optional[int], Optional[dict]]]:
+        """
+        Yield (event_id, item) for events after last_event_id, then live ones.
+
+        Yields (None, None) as a heartbeat when nothing was published for
+        `heartbeat` seconds, so idle connections are not reaped by proxies.
+        """
+        sub = _Subscriber(asyncio.get_running_loop(), self.max_pending)
+        with self._lock:
+            if last_event_id is not None and last_event_id >= self._next_id:
+                last_event_id = 0   # not issued by this process: resend everything buffered
+            backlog = [e for e in self._replay if last_event_id is not None and e[0] > last_event_id]
+            self._subscribers.add(sub)
+        try:
+            last = last_event_id or 0
+            for event in backlog:
+                last = event[0]
+                yield event
+            while True:
+                if sub.lagging:
+                    with self._lock:
+                        self._disconnected += 1
+                    logger.warning("Submission feed: slow subscriber disconnected")
+                    return
+                try:
+                    event = await asyncio.wait_for(sub.queue.get(), timeout=self.heartbeat)
+                except asyncio.TimeoutError:
+                    yield None, None
+                    continue
+                if event[0] <= last:
+                    continue   # already sent from the replay backlog
+                last = event[0]
+                yield event
+        finally:
+            with self._lock:
+                self._subscribers.discard(sub)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "subscribers":  len(self._subscribers),
+                "published":    self._published,
+                "replay_size":  len(self._replay),
+                "last_event_id": self._next_id - 1,
+                "disconnected_slow": self._disconnected,
+            }
+
+
+submission_feed = SubmissionFeed(
+    replay_size=int(os.getenv('FEED_REPLAY_SIZE', '100')),
+    max_pending=int(os.getenv('FEED_MAX_PENDING', '256')),
+    heartbeat=float(os.getenv('FEED_HEARTBEAT', '15')),
+)
@@ -0,0 +1,122 @@
+"""
+backend/services/submission_stats.py
+====================================
+Incrementally maintained aggregates over persisted submissions.
+
+Every batch the submission repository persists also applies its
+contribution to a small set of counters, kept per scope:
+
+    all                              every submission
+    city:<city_key>                  one city
+    locality:<city_key>:<locality>   one locality within a city
+
+Each scope holds "total", one "risk:<risk_level>" counter per risk level
+and one "score:<bucket>" counter per final-score decile. GET
+/submissions/stats reads only these counters, so it costs the same however
+many submissions exist. Counts are per stored submission: overwriting a
+listing_id subtracts the replaced item's contribution in the same write, so
+the counters always agree with a recount of the stored rows.
+
+This module is storage-agnostic: backends store (scope, metric) → count
+rows and call batch_deltas() on write and build_stats() on read.
+"""
+
+from collections import Counter
+from typing import Iterable
+
+from ai_layer.listing_context import normalize_key
+
+RISK_LEVELS = ("High Risk", "Suspicious", "Likely Genuine")
+
+# Final-score histogram: ten buckets, the last one closed (90-100)
+SCORE_BUCKETS = tuple(f"{lo}-{lo + 9}" if lo < 90 else "90-100" for lo in range(0, 100, 10))
+
+
+def _score_bucket(score) -> str:
+    try:
+        value = float(score)
+    except (TypeError, ValueError):
+        value = 0.0
+    return SCORE_BUCKETS[min(max(int(value // 10), 0), len(SCORE_BUCKETS) - 1)]
+
+
+def scopes_for(item: dict) -> tuple[str, ...]:
+    city = item.get("city_key") or normalize_key(item.get("city")) or "unknown"
+    locality = normalize_key(item.get("locality")) or "unknown"
+    return ("all", f"city:{city}", f"locality:{city}:{locality}")
+
+
+def batch_deltas(
+    items: Iterable[dict], replaced: Iterable[dict] = ()
+) -> dict[tuple[str, str], int]:
+    """
+    Counter changes for a write: (scope, metric) → delta.
+
+    Each written item adds one; each item in `replaced` (the stored items the
+    write overwrote, one per overwrite) takes one away. Zero deltas are dropped.
+    """
+    deltas: Counter = Counter()
+    for sign, batch in ((1, items), (-1, replaced)):
+        for item in batch:
+            metrics = (
+                "total",
+                f"risk:{item.get('risk_level') or 'unknown'}",
+                f"score:{_score_bucket(item.get('final_score'))}",
+            )
+            for scope in scopes_for(item):
+                for metric in metrics:
+                    deltas[(scope, metric)] += sign
+    return {key: delta for key, delta in deltas.items() if delta}
+
+
+def replaced_items(items: Iterable[dict], stored: dict[str, dict]) -> list[dict]:
+    """
+    The item each write of `items` overwrites, in write order: the stored
+    item with its listing_id (from `stored`, read before the write) or an
+    earlier write of the same batch.
+    """
+    current = dict(stored)
+    replaced = []
+    for item in items:
+        previous = current.get(item["listing_id"])
+        if previous is not None:
+            replaced.append(previous)
+        current[item["listing_id"]] = item
+    return replaced
+
+
+def _summary(counters: dict[str, int]) -> dict:
+    by_risk = {level: 0 for level in RISK_LEVELS}
+    histogram = {bucket: 0 for bucket in SCORE_BUCKETS}
+    for metric, value in counters.items():
+        kind, _, name = metric.partition(":")
+        if kind == "risk":
+            by_risk[name] = by_risk.get(name, 0) + int(value)
+        elif kind == "score" and name in histogram:
+            histogram[name] += int(value)
+    return {
+        "total": int(counters.get("total", 0)),
+        "by_risk_level": by_risk,
+        "score_histogram": histogram,
+    }
+
+
+def build_stats(rows: Iterable[tuple[str, str, int]]) -> dict:
+    """Shape stored (scope, metric, count) rows into the /submissions/stats response."""
+    scopes: dict[str, dict[str, int]] = {}
+    for scope, metric, value in rows:
+        scopes.setdefault(scope, {})[metric] = value
+
+    stats = _summary(scopes.get("all", {}))
+    cities: dict[str, dict] = {}
+    for scope, counters in scopes.items():
+        if scope.startswith("city:"):
+            city = scope[len("city:"):]
+            cities.setdefault(city, {"localities": {}}).update(_summary(counters))
+    for scope, counters in scopes.items():
+        if scope.startswith("locality:"):
+            city, _, locality = scope[len("locality:"):].partition(":")
+            entry = cities.setdefault(city, {"localities": {}})
+            entry["localities"][locality] = _summary(counters)
+    stats["cities"] = cities
+    return stats
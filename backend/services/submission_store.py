@@ -0,0 +1,354 @@
+"""
+backend/services/submission_store.py
+====================================
+Pluggable submission repository.
+
+Persistence (the write-behind queue behind save_to_dynamodb) and the
+GET /submissions endpoints go through one SubmissionRepository, chosen by
+SUBMISSION_STORE:
+
+    dynamodb  DynamoDB table + newest-first GSIs (services/dynamo_submissions.py)
+    sqlite    embedded SQLite file (SQLITE_SUBMISSIONS_PATH) for local and
+              self-hosted deployments — WAL mode, so the writer thread and
+              request threads never block each other
+    auto      (default) dynamodb when AWS is configured, else sqlite
+
+All backends return items newest first with the same opaque cursor
+semantics, so callers never know which one is in use.
+
+Usage:
+    repo = get_repository()
+    repo.put_batch(items)
+    repo.get(listing_id)                         # dict or None
+    items, next_cursor = repo.list(limit=10, cursor=None, city=None, risk_level=None)
+    repo.stats()                                 # aggregates, see submission_stats.py
+    for batch in repo.export_batches():          # every submission, see submission_export.py
+        ...
+"""
+
+import base64
+import binascii
+import json
+import logging
+import os
+import sqlite3
+import threading
+from decimal import Decimal
+from pathlib import Path
+from typing import Iterator, Optional
+
+from ai_layer.listing_context import normalize_key
+from services.submission_stats import batch_deltas, build_stats, replaced_items
+
+logger = logging.getLogger(__name__)
+
+_SQLITE_PATH = Path(__file__).parent.parent / "data" / "submissions.db"
+
+# A batch of submission items (a name of its own: `list` is shadowed inside the repository classes)
+Batch = list[dict]
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(state: dict) -> str:
+    raw = json.dumps(state, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, binascii.Error, UnicodeError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
+    if not isinstance(state, dict):
+        raise InvalidCursorError("Invalid cursor")
+    return state
+
+
+def index_attributes(item: dict) -> dict:
+    """Listing index keys stored on every submission: day bucket and normalized city."""
+    return {
+        'day': str(item.get('timestamp', ''))[:10],
+        'city_key': normalize_key(item.get('city')) or 'unknown',
+    }
+
+
+def is_demo_mode() -> bool:
+    """Same rule the engines use: no AWS credentials or region configured"""
+    return not os.getenv('AWS_ACCESS_KEY_ID') and not os.getenv('AWS_REGION')
+
+
+class SubmissionRepository:
+    """Interface every submission backend implements."""
+
+    name = "base"
+
+    def put_batch(self, items: list[dict]) -> None:
+        """Insert or overwrite (by listing_id) a batch of submission items."""
+        raise NotImplementedError
+
+    def get(self, listing_id: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    def list(
+        self,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        city: Optional[str] = None,
+        risk_level: Optional[str] = None,
+    ) -> tuple[list[dict], Optional[str]]:
+        """Newest-first page of submissions and the cursor for the next one (None at the end)."""
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        """Aggregate counts and score histograms, read from incrementally kept counters."""
+        raise NotImplementedError
+
+    def export_batches(self, batch_size: int = 1000) -> Iterator[Batch]:
+        """
+        Every stored submission, in batches of at most about batch_size items,
+        so a full export holds only a batch or two in memory at a time.
+        """
+        raise NotImplementedError
+
+
+# ---------------------------------------------------------------------------
+# SQLite
+# ---------------------------------------------------------------------------
+
+def plain_values(obj):
+    """Copy of a store item with Decimal values turned back into int / float."""
+    if isinstance(obj, dict):
+        return {k: plain_values(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [plain_values(v) for v in obj]
+    if isinstance(obj, Decimal):
+        return int(obj) if obj % 1 == 0 else float(obj)
+    return obj
+
+
+def json_default(obj):
+    """json.dumps default= for store items: Decimal → int / float."""
+    if isinstance(obj, Decimal):
+        return int(obj) if obj % 1 == 0 else float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class SQLiteSubmissionRepository(SubmissionRepository):
+    """
+    Submissions in one SQLite file.
+
+    Each item is stored as JSON next to the columns it is queried by
+    (timestamp, city_key, risk_level), each indexed together with timestamp
+    so every listing is an index range walk. Connections are per thread;
+    WAL lets readers proceed while the writer thread commits. The aggregate
+    counters (submission_stats) are updated in the same transaction as the
+    batch they count.
+    """
+
+    name = "sqlite"
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS submissions (
+            listing_id TEXT PRIMARY KEY,
+            timestamp  TEXT NOT NULL,
+            city_key   TEXT,
+            risk_level TEXT,
+            item       TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_submissions_timestamp
+            ON submissions (timestamp, listing_id);
+        CREATE INDEX IF NOT EXISTS idx_submissions_city
+            ON submissions (city_key, timestamp, listing_id);
+        CREATE INDEX IF NOT EXISTS idx_submissions_risk_level
+            ON submissions (risk_level, timestamp, listing_id);
+        CREATE TABLE IF NOT EXISTS submission_stats (
+            scope  TEXT NOT NULL,
+            metric TEXT NOT NULL,
+            value  INTEGER NOT NULL,
+            PRIMARY KEY (scope, metric)
+        );
+    """
+
+    def __init__(self, path: Path = _SQLITE_PATH):
+        self.path   = Path(path)
+        self._local = threading.local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connection()
+        with conn:
+            conn.executescript(self._SCHEMA)
+        self._rebuild_stats_if_missing()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def put_batch(self, items: list[dict]) -> None:
+        rows = [
+            (
+                item["listing_id"],
+                str(item.get("timestamp", "")),
+                item.get("city_key") or normalize_key(item.get("city")) or "unknown",
+                item.get("risk_level"),
+                json.dumps(item, default=json_default),
+            )
+            for item in items
+        ]
+        conn = self._connection()
+        # One transaction per batch, aggregates included. IMMEDIATE takes the
+        # write lock before the replaced rows are read, so no other writer can
+        # change them in between.
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            replaced = self._replaced_items(conn, items)
+            conn.executemany(
+                "INSERT OR REPLACE INTO submissions "
+                "(listing_id, timestamp, city_key, risk_level, item) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._add_stats(conn, items, replaced)
+
+    @staticmethod
+    def _replaced_items(conn: sqlite3.Connection, items: list[dict]) -> list[dict]:
+        """The item each write in the batch overwrites: a stored row or an earlier write of the batch."""
+        ids = list({item["listing_id"] for item in items})
+        stored = {}
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            stored.update(
+                (listing_id, json.loads(item))
+                for listing_id, item in conn.execute(
+                    "SELECT listing_id, item FROM submissions "
+                    f"WHERE listing_id IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                )
+            )
+        return replaced_items(items, stored)
+
+    @staticmethod
+    def _add_stats(
+        conn: sqlite3.Connection, items: list[dict], replaced: list[dict] = ()
+    ) -> None:
+        conn.executemany(
+            "INSERT INTO submission_stats (scope, metric, value) VALUES (?, ?, ?) "
+            "ON CONFLICT (scope, metric) DO UPDATE SET value = value + excluded.value",
+            [
+                (scope, metric, delta)
+                for (scope, metric), delta in batch_deltas(items, replaced).items()
+            ],
+        )
+
+    def _rebuild_stats_if_missing(self) -> None:
+        """One-off: databases created before the counters existed get them computed once."""
+        conn = self._connection()
+        if conn.execute("SELECT 1 FROM submission_stats LIMIT 1").fetchone():
+            return
+        cursor = conn.execute("SELECT item FROM submissions")
+        with conn:
+            while True:
+                chunk = cursor.fetchmany(1000)
+                if not chunk:
+                    break
+                self._add_stats(conn, [json.loads(row[0]) for row in chunk])
+
+    def get(self, listing_id: str) -> Optional[dict]:
+        row = self._connection().execute(
+            "SELECT item FROM submissions WHERE listing_id = ?", (listing_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def list(
+        self,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        city: Optional[str] = None,
+        risk_level: Optional[str] = None,
+    ) -> tuple[list[dict], Optional[str]]:
+        where, params = [], []
+        if city:
+            where.append("city_key = ?")
+            params.append(normalize_key(city))
+        if risk_level:
+            where.append("risk_level = ?")
+            params.append(risk_level)
+        if cursor:
+            state = decode_cursor(cursor)
+            if not isinstance(state.get("t"), str) or not isinstance(state.get("id"), str):
+                raise InvalidCursorError("Invalid cursor")
+            # Keyset pagination: strictly older than the last item returned
+            where.append("(timestamp, listing_id) < (?, ?)")
+            params.extend([state["t"], state["id"]])
+
+        sql = "SELECT listing_id, timestamp, item FROM submissions"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY timestamp DESC, listing_id DESC LIMIT ?"
+        rows = self._connection().execute(sql, (*params, limit + 1)).fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor({"t": rows[-1][1], "id": rows[-1][0]})
+        return [json.loads(row[2]) for row in rows], next_cursor
+
+    def stats(self) -> dict:
+        return build_stats(
+            self._connection().execute("SELECT scope, metric, value FROM submission_stats")
+        )
+
+    def export_batches(self, batch_size: int = 1000) -> Iterator[Batch]:
+        # A connection of its own: a streaming response resumes the generator
+        # on whichever worker thread is free. The single read transaction
+        # gives a consistent snapshot while the writer keeps committing (WAL).
+        conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+        try:
+            cursor = conn.execute("SELECT item FROM submissions ORDER BY timestamp, listing_id")
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield [json.loads(row[0]) for row in rows]
+        finally:
+            conn.close()
+
+
+# ---------------------------------------------------------------------------
+# Process-wide repository
+# ---------------------------------------------------------------------------
+
+_repository: Optional[SubmissionRepository] = None
+_repository_lock = threading.Lock()
+
+
+def create_repository(kind: Optional[str] = None) -> SubmissionRepository:
+    """Build the backend named by `kind` (default: SUBMISSION_STORE)."""
+    kind = (kind or os.getenv('SUBMISSION_STORE', 'auto')).lower()
+    if kind == 'auto':
+        kind = 'sqlite' if is_demo_mode() else 'dynamodb'
+    if kind == 'dynamodb':
+        from services.dynamo_submissions import DynamoDBSubmissionRepository
+        return DynamoDBSubmissionRepository()
+    if kind == 'sqlite':
+        return SQLiteSubmissionRepository(
+            Path(os.getenv('SQLITE_SUBMISSIONS_PATH', str(_SQLITE_PATH)))
+        )
+    raise ValueError(f"Unknown SUBMISSION_STORE: {kind}")
+
+
+def get_repository() -> SubmissionRepository:
+    """Return the process-wide repository, creating it on first use."""
+    global _repository
+    if _repository is None:
+        with _repository_lock:
+            if _repository is None:
+                _repository = create_repository()
+                logger.info(f"Submission store: {_repository.name}")
+    return _repository
@@ -0,0 +1,219 @@
+"""
+backend/services/submission_writer.py
+=====================================
+Write-behind batching queue for submission persistence.
+
+Request handlers call `enqueue()` which never blocks: the item is put on an
+in-memory queue and a background thread flushes it in batches to the
+configured submission repository (services/submission_store.py).
+Each persisted batch invalidates the GET /submissions response cache
+(services/submission_cache.py) and is then published to the live feed
+(services/submission_feed.py), so subscribers only ever see submissions
+that GET /submissions/{id} can return.
+Failed batches are retried with exponential backoff, and `stop()` drains
+whatever is still queued on shutdown.
+"""
+
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from typing import Callable, Optional
+
+from services.submission_cache import submission_read_cache
+from services.submission_feed import submission_feed
+from services.submission_store import get_repository, plain_values
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindQueue:
+    """
+    Non-blocking, batching persistence queue drained by a daemon thread.
+
+    Usage:
+        writer = WriteBehindQueue(sink=get_repository().put_batch)
+        writer.start()
+        writer.enqueue(item)    # returns immediately
+        writer.stop()           # flushes everything still queued
+    """
+
+    def __init__(
+        self,
+        sink: Callable[[list[dict]], None],
+        max_batch: int = 25,
+        flush_interval: float = 0.5,
+        max_queue: int = 10000,
+        max_retries: int = 5,
+        backoff_base: float = 0.2,
+    ):
+        self.sink           = sink
+        self.max_batch      = max_batch
+        self.flush_interval = flush_interval
+        self.max_retries    = max_retries
+        self.backoff_base   = backoff_base
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._stop          = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stats_lock    = threading.Lock()
+        self._enqueued      = 0
+        self._written       = 0
+        self._dropped       = 0
+        self._failed        = 0
+        self._flushes       = 0
+        self._flush_ms_total = 0.0
+        self._last_flush_ms = 0.0
+        self._max_flush_ms  = 0.0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="submission-writer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Signal the worker to drain the queue and wait for it to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                logger.warning(
+                    f"SubmissionWriter: shutdown timed out with {self._queue.qsize()} items queued"
+                )
+            self._thread = None
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def enqueue(self, item: dict) -> bool:
+        """Queue an item for persistence. Never blocks; drops the item if the queue is full."""
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            with self._stats_lock:
+                self._dropped += 1
+            logger.warning("SubmissionWriter: queue full, dropping item")
+            return False
+        with self._stats_lock:
+            self._enqueued += 1
+        return True
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            flushes = self._flushes
+            return {
+                "queue_depth":   self._queue.qsize(),
+                "enqueued":      self._enqueued,
+                "written":       self._written,
+                "dropped":       self._dropped,
+                "failed":        self._failed,
+                "flushes":       flushes,
+                "last_flush_ms": round(self._last_flush_ms, 2),
+                "avg_flush_ms":  round(self._flush_ms_total / flushes, 2) if flushes else 0.0,
+                "max_flush_ms":  round(self._max_flush_ms, 2),
+            }
+
+    # ------------------------------------------------------------------
+    # Worker side
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch:
+                self._flush(batch)
+            elif self._stop.is_set():
+                return
+
+    def _next_batch(self) -> list[dict]:
+        """Block up to flush_interval for the first item, then take what is ready."""
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _flush(self, batch: list[dict]) -> None:
+        for attempt in range(1, self.max_retries + 1):
+            start = time.perf_counter()
+            try:
+                self.sink(batch)
+            except Exception as e:
+                logger.warning(
+                    f"SubmissionWriter: flush of {len(batch)} items failed "
+                    f"(attempt {attempt}/{self.max_retries}): {e}"
+                )
+                if attempt < self.max_retries:
+                    delay = self.backoff_base * (2 ** (attempt - 1))
+                    time.sleep(delay + random.uniform(0, delay))
+                continue
+
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._stats_lock:
+                self._written        += len(batch)
+                self._flushes        += 1
+                self._flush_ms_total += elapsed_ms
+                self._last_flush_ms   = elapsed_ms
+                self._max_flush_ms    = max(self._max_flush_ms, elapsed_ms)
+            return
+
+        with self._stats_lock:
+            self._failed += len(batch)
+        logger.error(f"SubmissionWriter: giving up on {len(batch)} items after {self.max_retries} attempts")
+
+
+# ---------------------------------------------------------------------------
+# Process-wide writer
+# ---------------------------------------------------------------------------
+
+_writer: Optional[WriteBehindQueue] = None
+_writer_lock = threading.Lock()
+
+
+def _persist(items: list[dict]) -> None:
+    get_repository().put_batch(items)
+    # Only after the write: a read racing it must not re-cache the old data
+    submission_read_cache.invalidate(items)
+    for item in items:
+        submission_feed.publish(plain_values(item))
+
+
+def get_writer() -> WriteBehindQueue:
+    """Return the process-wide writer, starting it on first use."""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                writer = WriteBehindQueue(
+                    sink=_persist,
+                    max_batch=int(os.getenv('SUBMISSION_BATCH_SIZE', '25')),
+                    flush_interval=float(os.getenv('SUBMISSION_FLUSH_INTERVAL', '0.5')),
+                    max_queue=int(os.getenv('SUBMISSION_QUEUE_SIZE', '10000')),
+                )
+                writer.start()
+                _writer = writer
+    return _writer
+
+
+def shutdown_writer(timeout: float = 10.0) -> None:
+    """Drain and stop the process-wide writer (called on app shutdown)."""
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is not None:
+        writer.stop(timeout)
@@ -1,38 +1,20 @@
-import boto3
+import hashlib
 import json
 import os
+import threading
 from typing import Optional
 
-def analyze_text(title: str, description: str, contact_number: Optional[str] = None) -> dict:
-    """
-    Analyze rental listing text for scam indicators using Amazon Bedrock
-    
-    Args:
-        title: Listing title
-        description: Listing description
-        contact_number: Optional contact number
-    
-    Returns:
-        dict with score, verdict, flags, reasoning
-    """
-    try:
-        # Check for demo/mock mode (no AWS credentials)
-        if not os.getenv('AWS_ACCESS_KEY_ID') and not os.getenv('AWS_REGION'):
-            return _mock_text_analysis(title, description, contact_number)
-        
-        # Initialize Bedrock client
-        bedrock = boto3.client(
-            service_name='bedrock-runtime',
-            region_name=os.getenv('AWS_REGION', 'ap-south-1')
-        )
-        
-        # Prepare the listing text
-        listing_text = f"Title: {title}\n\nDescription: {description}"
-        if contact_number:
-            listing_text += f"\n\nContact: {contact_number}"
-        
-        # System prompt for fraud detection with cross-signal reasoning
-        system_prompt = """You are an expert fraud detection system for Indian rental listings. You will receive BOTH the listing description AND a price analysis observation together.
+from ai_layer import admission, metrics
+from ai_layer.aws_clients import get_client
+from ai_layer.listing_context import ListingContext
+from services.result_cache import AnalysisResultCache
+
+URGENCY_WORDS = ['urgent', 'hurry', 'today only', 'jaldi', 'limited time']
+PAYMENT_WORDS = ['token', 'advance', 'pay now', 'whatsapp only']
+VAGUE_WORDS = ['nice', 'good', 'best']
+
+# System prompt for fraud detection with cross-signal reasoning
+SYSTEM_PROMPT = """You are an expert fraud detection system for Indian rental listings. You will receive BOTH the listing description AND a price analysis observation together.
 
 Use CROSS-SIGNAL REASONING: if the price is already flagged as suspiciously low AND the description contains urgency tactics, that combination is a much stronger scam indicator than either signal alone. Your reasoning must explicitly connect these signals.
 
@@ -53,26 +35,78 @@ Return ONLY a valid JSON object:
   'flags': [<max 4 specific red flags found with exact evidence>],
   'reasoning': <2 sentences explicitly connecting price signals and text signals together>
 }"""
+
+# Changes whenever the prompt does, so cached verdicts from an older prompt are never served
+PROMPT_VERSION = hashlib.sha256(SYSTEM_PROMPT.encode("utf-8")).hexdigest()[:12]
+
+# Bedrock results keyed by model, prompt version and ListingContext.content_hash:
+# reposted and viral listings carry the same text and are only sent to the LLM once
+_result_cache = AnalysisResultCache(
+    ttl=float(os.getenv('TEXT_CACHE_TTL', '3600')),
+    max_entries=int(os.getenv('TEXT_CACHE_MAX_ENTRIES', '2048')),
+)
+_result_cache_lock = threading.Lock()   # engines run in worker threads
+
+def analyze_text(
+    title: str,
+    description: str,
+    contact_number: Optional[str] = None,
+    context: Optional[ListingContext] = None
+) -> dict:
+    """
+    Analyze rental listing text for scam indicators using Amazon Bedrock
+    
+    Args:
+        title: Listing title
+        description: Listing description
+        contact_number: Optional contact number
+        context: The request's ListingContext, if one was already built
+    
+    Returns:
+        dict with score, verdict, flags, reasoning
+    """
+    if context is None:
+        context = ListingContext(title, description, contact_number=contact_number)
+    try:
+        # Check for demo/mock mode (no AWS credentials)
+        if not os.getenv('AWS_ACCESS_KEY_ID') and not os.getenv('AWS_REGION'):
+            return _mock_text_analysis(title, description, contact_number, context)
+        
+        model_id = os.getenv('BEDROCK_MODEL_ID', 'anthropic.claude-3-5-sonnet-20241022-v2:0')
+        cache_key = f"{model_id}:{PROMPT_VERSION}:{context.content_hash}"
+        with _result_cache_lock:
+            cached = _result_cache.lookup(cache_key)
+        if cached is not None:
+            return cached
+        
+        # Shared, pooled Bedrock client
+        bedrock = get_client('bedrock-runtime')
         
         # Prepare the request body
         request_body = {
             "anthropic_version": "bedrock-2023-05-31",
             "max_tokens": 1000,
             "temperature": 0.1,
-            "system": system_prompt,
+            "system": SYSTEM_PROMPT,
             "messages": [
                 {
                     "role": "user",
-                    "content": listing_text
+                    "content": context.prompt_text
                 }
             ]
         }
         
-        # Call Bedrock
-        response = bedrock.invoke_model(
-            modelId=os.getenv('BEDROCK_MODEL_ID', 'anthropic.claude-3-5-sonnet-20241022-v2:0'),
-            body=json.dumps(request_body)
-        )
+        # Call Bedrock, unless the engine is saturated past its queue budget
+        with admission.admit(admission.LLM_TEXT) as admitted:
+            if not admitted:
+                result = _mock_text_analysis(title, description, contact_number, context)
+                result["degraded"] = True
+                return result
+            with metrics.llm_call('bedrock', engine=admission.LLM_TEXT):
+                response = bedrock.invoke_model(
+                    modelId=model_id,
+                    body=json.dumps(request_body)
+                )
         
         # Parse response
         response_body = json.loads(response['body'].read())
@@ -88,16 +122,20 @@ Return ONLY a valid JSON object:
         # Parse the JSON response
         result = json.loads(response_text)
         
-        return {
+        analysis = {
             "score": result.get("score", 50),
             "verdict": result.get("verdict", "Unable to analyze"),
             "flags": result.get("flags", []),
             "reasoning": result.get("reasoning", "Analysis completed")
         }
+        with _result_cache_lock:
+            _result_cache.put(cache_key, analysis)
+        return analysis
         
     except Exception as e:
         # Handle errors gracefully
         print(f"Error in text analysis: {str(e)}")
+        metrics.FALLBACKS.inc(engine=admission.LLM_TEXT, reason='error')
         return {
             "score": 50,
             "verdict": "Unable to analyze",
@@ -106,32 +144,91 @@ Return ONLY a valid JSON object:
         }
 
 
-def _mock_text_analysis(title: str, description: str, contact_number: Optional[str] = None) -> dict:
+# Early-exit estimate of the Bedrock text score (0-100, LLM scale): a listing
+# with no red flags starts low, each red-flag category found adds its weight
+ESTIMATE_BASE = 15
+ESTIMATE_WEIGHTS = {
+    "urgency": 35,
+    "payment": 35,
+    "whatsapp": 15,
+    "vague": 10,
+    "short": 20,
+}
+# Descriptions shorter than this (in words) count as lacking specifics
+SHORT_DESCRIPTION_WORDS = 12
+
+
+def local_text_analysis(context: ListingContext) -> dict:
+    """
+    Keyword-scan estimate of what the Bedrock text engine would return
+    
+    Cheap enough to run on every request; used by the early-exit screen,
+    and as the text result when the LLM call is skipped. Unlike the demo
+    mode scan it can go low: a specific description with no pressure
+    tactics estimates Likely Genuine.
+    """
+    found = {
+        "urgency": context.contains_any(URGENCY_WORDS, include_title=True),
+        "payment": context.contains_any(PAYMENT_WORDS),
+        "whatsapp": 'whatsapp' in context.text,
+        "vague": sum(1 for word in VAGUE_WORDS if word in context.text) > 3,
+        "short": len(context.text.split()) < SHORT_DESCRIPTION_WORDS,
+    }
+    labels = {
+        "urgency": "Urgency tactics detected",
+        "payment": "Advance payment pressure detected",
+        "whatsapp": "WhatsApp-only contact (suspicious)",
+        "vague": "Vague description with minimal details",
+        "short": "Very short description with few specifics",
+    }
+    score = min(100, ESTIMATE_BASE + sum(ESTIMATE_WEIGHTS[k] for k, hit in found.items() if hit))
+    flags = [labels[k] for k, hit in found.items() if hit]
+    
+    if score >= 70:
+        verdict = "High Scam Risk"
+    elif score >= 40:
+        verdict = "Suspicious"
+    else:
+        verdict = "Likely Genuine"
+    
+    return {
+        "score": score,
+        "verdict": verdict,
+        "flags": flags,
+        "reasoning": f"Keyword screening found {len(flags)} red flags in the listing text."
+    }
+
+
+def _mock_text_analysis(
+    title: str,
+    description: str,
+    contact_number: Optional[str] = None,
+    context: Optional[ListingContext] = None
+) -> dict:
     """Mock text analysis for demo mode without AWS credentials"""
+    if context is None:
+        context = ListingContext(title, description, contact_number=contact_number)
     score = 50
     flags = []
     
     # Check for urgency keywords
-    urgency_words = ['urgent', 'hurry', 'today only', 'jaldi', 'limited time']
-    if any(word in title.lower() or word in description.lower() for word in urgency_words):
+    if context.contains_any(URGENCY_WORDS, include_title=True):
         score += 20
         flags.append("Urgency tactics detected")
     
     # Check for payment pressure
-    payment_words = ['token', 'advance', 'pay now', 'whatsapp only']
-    if any(word in description.lower() for word in payment_words):
+    if context.contains_any(PAYMENT_WORDS):
         score += 15
         flags.append("Advance payment pressure detected")
     
     # Check for vague language
-    vague_words = ['nice', 'good', 'best']
-    vague_count = sum(1 for word in vague_words if word in description.lower())
+    vague_count = sum(1 for word in VAGUE_WORDS if word in context.text)
     if vague_count > 3:
         score += 10
         flags.append("Vague description with minimal details")
     
     # Check for WhatsApp only contact
-    if contact_number and 'whatsapp' in description.lower():
+    if contact_number and 'whatsapp' in context.text:
         score += 10
         flags.append("WhatsApp-only contact (suspicious)")
     
@@ -0,0 +1,93 @@
+"""
+backend/services/warmup.py
+==========================
+Startup warm-up and readiness state.
+
+The lifespan hook in main.py starts `run_warmup()` in the background as soon
+as the process boots. It preloads the price benchmarks, the AWS clients, the
+scam model (plus a throwaway inference) and the explainer's LLM client, and
+optionally launches the shared Chromium instance. GET /ready reports 503
+until it finishes, so rollouts never route traffic to a cold worker.
+
+A component that fails to warm up is logged and listed in the readiness
+report; it does not block readiness, it is simply loaded lazily later.
+"""
+
+import asyncio
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+_state = {
+    "ready":       False,
+    "started_at":  None,
+    "finished_at": None,
+    "components":  {},
+    "errors":      {},
+}
+
+
+def readiness() -> dict:
+    return {
+        "ready":       _state["ready"],
+        "started_at":  _state["started_at"],
+        "finished_at": _state["finished_at"],
+        "components":  dict(_state["components"]),
+        "errors":      dict(_state["errors"]),
+    }
+
+
+def is_ready() -> bool:
+    return _state["ready"]
+
+
+def _warm_benchmarks() -> None:
+    from services import price_engine
+    price_engine.load_benchmarks()
+
+
+def _warm_aws_clients() -> None:
+    from ai_layer.aws_clients import get_client
+    from services.submission_store import is_demo_mode
+
+    if is_demo_mode():
+        return
+    get_client('bedrock-runtime')
+    get_client('dynamodb')
+
+
+def _warm_pipeline() -> None:
+    from services.argus_service import warm_up
+    warm_up()
+
+
+async def _warm_browser() -> None:
+    from ai_layer.input.browser import get_browser
+    await get_browser()
+
+
+async def _step(name: str, coro) -> None:
+    start = time.perf_counter()
+    try:
+        await coro
+    except Exception as e:
+        logger.error(f"Warm-up: {name} failed: {e}")
+        _state["errors"][name] = str(e)
+        return
+    _state["components"][name] = round((time.perf_counter() - start) * 1000, 1)
+
+
+async def run_warmup() -> None:
+    """Warm every component, then flip the readiness flag."""
+    _state["started_at"] = time.time()
+    if os.getenv('WARMUP_ENABLED', '1') != '0':
+        await _step("benchmarks", asyncio.to_thread(_warm_benchmarks))
+        await _step("aws_clients", asyncio.to_thread(_warm_aws_clients))
+        await _step("pipeline", asyncio.to_thread(_warm_pipeline))
+        if os.getenv('WARMUP_BROWSER', '0') == '1':
+            await _step("browser", _warm_browser())
+    _state["finished_at"] = time.time()
+    _state["ready"] = True
+    logger.info(f"Warm-up complete: {_state['components']} errors={_state['errors']}")
@@ -2,17 +2,123 @@
 """
 AWS Setup Script for Project Argus
 Creates DynamoDB table for storing analysis submissions
+
+Usage:
+    python setup_aws.py              # create the table and its indexes
+    python setup_aws.py --backfill   # also add index keys to existing items
 """
 
 import boto3
 from botocore.exceptions import ClientError
 import os
-from dotenv import load_dotenv
+import sys
+import time
+from ai_layer.config import load_env
+
+# Load environment variables (before the services below read their settings)
+load_env()
+
+from services.dynamo_submissions import CITY_INDEX, DAY_INDEX, STATS_TABLE, index_attributes
+
+# Newest-first listing indexes (see services/dynamo_submissions.py)
+ATTRIBUTE_DEFINITIONS = [
+    {'AttributeName': 'listing_id', 'AttributeType': 'S'},
+    {'AttributeName': 'day', 'AttributeType': 'S'},
+    {'AttributeName': 'city_key', 'AttributeType': 'S'},
+    {'AttributeName': 'timestamp', 'AttributeType': 'S'},
+]
+
+GLOBAL_SECONDARY_INDEXES = [
+    {
+        'IndexName': DAY_INDEX,
+        'KeySchema': [
+            {'AttributeName': 'day', 'KeyType': 'HASH'},
+            {'AttributeName': 'timestamp', 'KeyType': 'RANGE'},
+        ],
+        'Projection': {'ProjectionType': 'ALL'},
+    },
+    {
+        'IndexName': CITY_INDEX,
+        'KeySchema': [
+            {'AttributeName': 'city_key', 'KeyType': 'HASH'},
+            {'AttributeName': 'timestamp', 'KeyType': 'RANGE'},
+        ],
+        'Projection': {'ProjectionType': 'ALL'},
+    },
+]
+
+def create_stats_table(dynamodb):
+    """Create the aggregate counters table behind GET /submissions/stats"""
+    try:
+        print(f"\n📊 Creating DynamoDB table: {STATS_TABLE}")
+        dynamodb.create_table(
+            TableName=STATS_TABLE,
+            KeySchema=[{'AttributeName': 'scope', 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': 'scope', 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST',
+            Tags=[{'Key': 'Project', 'Value': 'Argus'}],
+        )
+        dynamodb.get_waiter('table_exists').wait(TableName=STATS_TABLE)
+        print(f"✓ Table '{STATS_TABLE}' is now ACTIVE")
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ResourceInUseException':
+            raise
+        print(f"✓ Table '{STATS_TABLE}' already exists!")
+
+def ensure_indexes(dynamodb, table_name):
+    """Add any missing listing index to an existing table (one per update, as DynamoDB requires)"""
+    description = dynamodb.describe_table(TableName=table_name)['Table']
+    existing = {gsi['IndexName'] for gsi in description.get('GlobalSecondaryIndexes', [])}
+    
+    for index in GLOBAL_SECONDARY_INDEXES:
+        if index['IndexName'] in existing:
+            print(f"✓ Index '{index['IndexName']}' already exists")
+            continue
+        print(f"⏳ Adding index '{index['IndexName']}' (backfills in the background)...")
+        dynamodb.update_table(
+            TableName=table_name,
+            AttributeDefinitions=ATTRIBUTE_DEFINITIONS,
+            GlobalSecondaryIndexUpdates=[{'Create': index}],
+        )
+        dynamodb.get_waiter('table_exists').wait(TableName=table_name)
+        # The table stays UPDATING until the new index is built
+        while True:
+            table = dynamodb.describe_table(TableName=table_name)['Table']
+            statuses = [gsi['IndexStatus'] for gsi in table.get('GlobalSecondaryIndexes', [])]
+            if all(status == 'ACTIVE' for status in statuses):
+                break
+            time.sleep(10)
+        print(f"✓ Index '{index['IndexName']}' is ACTIVE")
 
-# Load environment variables
-load_dotenv()
+def backfill_index_keys(table_name):
+    """Add day / city_key to submissions written before the indexes existed"""
+    table = boto3.resource(
+        'dynamodb', region_name=os.getenv('AWS_REGION', 'ap-south-1')
+    ).Table(table_name)
+    
+    print(f"\n🔁 Backfilling index keys in '{table_name}'...")
+    updated = 0
+    scan_kwargs = {'ProjectionExpression': 'listing_id, #ts, city, #day, city_key',
+                   'ExpressionAttributeNames': {'#ts': 'timestamp', '#day': 'day'}}
+    while True:
+        response = table.scan(**scan_kwargs)
+        for item in response.get('Items', []):
+            if 'day' in item and 'city_key' in item:
+                continue
+            keys = index_attributes(item)
+            table.update_item(
+                Key={'listing_id': item['listing_id']},
+                UpdateExpression='SET #day = :day, city_key = :city_key',
+                ExpressionAttributeNames={'#day': 'day'},
+                ExpressionAttributeValues={':day': keys['day'], ':city_key': keys['city_key']},
+            )
+            updated += 1
+        if 'LastEvaluatedKey' not in response:
+            break
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    print(f"✓ Backfilled {updated} item(s)")
 
-def create_dynamodb_table():
+def create_dynamodb_table(backfill=False):
     """Create DynamoDB table for argus-submissions"""
     
     print("🚀 Setting up AWS resources for Project Argus...")
@@ -46,12 +152,8 @@ def create_dynamodb_table():
                     'KeyType': 'HASH'  # Partition key
                 }
             ],
-            AttributeDefinitions=[
-                {
-                    'AttributeName': 'listing_id',
-                    'AttributeType': 'S'  # String
-                }
-            ],
+            AttributeDefinitions=ATTRIBUTE_DEFINITIONS,
+            GlobalSecondaryIndexes=GLOBAL_SECONDARY_INDEXES,
             BillingMode='PAY_PER_REQUEST',  # On-demand pricing (free tier friendly)
             Tags=[
                 {
@@ -67,6 +169,7 @@ def create_dynamodb_table():
         
         print(f"✓ Table '{table_name}' created successfully!")
         print(f"  - Partition Key: listing_id (String)")
+        print(f"  - Indexes: {DAY_INDEX} (day, timestamp), {CITY_INDEX} (city_key, timestamp)")
         print(f"  - Billing Mode: PAY_PER_REQUEST")
         print(f"  - Status: {response['TableDescription']['TableStatus']}")
         
@@ -80,6 +183,11 @@ def create_dynamodb_table():
     except ClientError as e:
         if e.response['Error']['Code'] == 'ResourceInUseException':
             print(f"✓ Table '{table_name}' already exists!")
+            try:
+                ensure_indexes(dynamodb, table_name)
+            except ClientError as e:
+                print(f"✗ Error adding indexes: {str(e)}")
+                return False
         else:
             print(f"✗ Error creating table: {str(e)}")
             return False
@@ -87,6 +195,19 @@ def create_dynamodb_table():
         print(f"✗ Unexpected error: {str(e)}")
         return False
     
+    try:
+        create_stats_table(dynamodb)
+    except Exception as e:
+        print(f"✗ Error creating stats table: {str(e)}")
+        return False
+    
+    if backfill:
+        try:
+            backfill_index_keys(table_name)
+        except Exception as e:
+            print(f"✗ Backfill failed: {str(e)}")
+            return False
+    
     print("\n" + "=" * 50)
     print("✅ AWS setup completed successfully!")
     print("=" * 50)
@@ -102,5 +223,5 @@ def create_dynamodb_table():
     return True
 
 if __name__ == "__main__":
-    success = create_dynamodb_table()
+    success = create_dynamodb_table(backfill='--backfill' in sys.argv)
     exit(0 if success else 1)
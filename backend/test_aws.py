@@ -8,8 +8,8 @@ import os
 import sys
 import json
 
-from dotenv import load_dotenv
-load_dotenv()
+from ai_layer.config import load_env
+load_env()
 
 # Write output to file to avoid Windows encoding issues
 output_lines = []
@@ -0,0 +1,14 @@
+"""
+Shared test setup: run the app in demo mode against a throwaway SQLite store.
+"""
+
+import os
+import tempfile
+
+os.environ.setdefault("WARMUP_ENABLED", "0")
+os.environ.setdefault("SUBMISSION_STORE", "sqlite")
+os.environ.setdefault(
+    "SQLITE_SUBMISSIONS_PATH", os.path.join(tempfile.mkdtemp(prefix="argus-tests-"), "submissions.db")
+)
+for _var in ("AWS_ACCESS_KEY_ID", "AWS_REGION"):
+    os.environ.pop(_var, None)
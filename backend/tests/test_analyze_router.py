@@ -0,0 +1,105 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from services import argus_service, submission_writer
+from services.scheduler import scheduler
+from services.submission_store import SQLiteSubmissionRepository
+
+
+@pytest.fixture
+def client():
+    with TestClient(main.app) as client:
+        yield client
+
+
+@pytest.fixture
+def url_runs(monkeypatch):
+    """Replace the URL pipeline with a stub that records its calls."""
+    calls = []
+
+    async def fake_analyze_listing_url(url, priority=None, client=None):
+        calls.append(url)
+        return {"listing_id": f"run-{len(calls)}", "risk_score": 10, "risk_level": "Likely Genuine"}
+
+    monkeypatch.setattr(argus_service, "analyze_listing_url", fake_analyze_listing_url)
+    return calls
+
+
+def test_url_quota_charges_only_valid_first_runs(client, url_runs, monkeypatch):
+    # One token, no meaningful refill during the test
+    monkeypatch.setattr(scheduler, "rate", 0.0001)
+    monkeypatch.setattr(scheduler, "burst", 1.0)
+    headers = {"X-API-Key": "quota-test"}
+
+    # An invalid URL is rejected without using the token
+    r = client.post("/analyze/url", data={"url": "not a url"}, headers=headers)
+    assert r.json() == {"error": "Unable to analyze the provided listing URL."}
+
+    first = client.post(
+        "/analyze/url", data={"url": "https://example.com/a"},
+        headers={**headers, "Idempotency-Key": "k1"},
+    )
+    assert first.status_code == 200
+
+    # Idempotent replays are free
+    for _ in range(3):
+        replay = client.post(
+            "/analyze/url", data={"url": "https://example.com/a"},
+            headers={**headers, "Idempotency-Key": "k1"},
+        )
+        assert replay.status_code == 200
+        assert replay.headers["Idempotent-Replayed"] == "true"
+        assert replay.json()["listing_id"] == first.json()["listing_id"]
+    assert len(url_runs) == 1
+
+    # A new run is charged, and the bucket is empty
+    r = client.post(
+        "/analyze/url", data={"url": "https://example.com/b"},
+        headers={**headers, "Idempotency-Key": "k2"},
+    )
+    assert r.status_code == 429
+    assert int(r.headers["Retry-After"]) >= 1
+    assert len(url_runs) == 1
+
+
+def test_url_idempotency_key_reused_for_another_url_is_422(client, url_runs):
+    headers = {"X-API-Key": "idempotency-test", "Idempotency-Key": "reused"}
+    first = client.post("/analyze/url", data={"url": "https://example.com/a"}, headers=headers)
+    assert first.status_code == 200
+
+    r = client.post("/analyze/url", data={"url": "https://example.com/other"}, headers=headers)
+    assert r.status_code == 422
+    assert "different request" in r.json()["detail"]
+    assert len(url_runs) == 1
+
+
+def test_batch_listings_without_ids_are_saved_separately(tmp_path, monkeypatch):
+    repository = SQLiteSubmissionRepository(tmp_path / "batch.db")
+    monkeypatch.setattr(submission_writer, "get_repository", lambda: repository)
+    def listing(n, **fields):
+        return {
+            "listing_url": f"https://example.com/listing/{n}",
+            "title": f"2BHK flat {n}",
+            "city": "Pune",
+            "price": 20000 + n,
+            "description": "Spacious flat near the metro station",
+            "image_count": 3,
+            "phone_number": f"98765{n:05d}",
+            "timestamp": None,
+            **fields,
+        }
+
+    listings = [listing(1), listing(2), listing(3, listing_id="mine-1")]
+
+    # Leaving the client runs the lifespan shutdown, which drains the writer
+    with TestClient(main.app) as client:
+        r = client.post("/analyze/batch", json=listings, headers={"X-API-Key": "batch-ids"})
+    assert r.status_code == 200
+    ids = [entry["result"]["listing_id"] for entry in r.json()["results"]]
+
+    assert len(set(ids)) == 3
+    assert "unknown" not in ids
+    assert ids[2] == "mine-1"
+    assert all(repository.get(listing_id) is not None for listing_id in ids)
+    assert repository.stats()["total"] == 3
@@ -0,0 +1,87 @@
+import asyncio
+import time
+
+import pytest
+
+from ai_layer import admission
+from ai_layer import pipeline as pipeline_module
+from ai_layer.deadline import Deadline
+from ai_layer.pipeline import ArgusAIPipeline
+
+
+def _listing(n, **fields):
+    return {
+        "listing_id": None,
+        "listing_url": f"https://example.com/listing/{n}",
+        "title": f"2BHK flat {n}",
+        "city": "Pune",
+        "price": 20000 + n,
+        "description": "Spacious flat near the metro station",
+        "image_count": 3,
+        "phone_number": f"98765{n:05d}",
+        "timestamp": None,
+        **fields,
+    }
+
+
+class _ShortDeadline(Deadline):
+    def __init__(self, seconds: float = 0.3):
+        super().__init__(seconds)
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    monkeypatch.setattr(pipeline_module, "Deadline", _ShortDeadline)
+    return ArgusAIPipeline()
+
+
+def test_batch_explanations_are_held_to_the_item_deadline(pipeline, monkeypatch):
+    deadlines = []
+
+    def slow_explain(listing, prediction, deadline=None):
+        deadlines.append(deadline)
+        time.sleep(1.0)   # an LLM call that overruns
+        return "LLM explanation", False
+
+    monkeypatch.setattr(pipeline, "_explain", slow_explain)
+    pipeline._get_predictor().load()
+
+    async def timed():
+        start = time.monotonic()
+        results = await pipeline.analyze_batch([_listing(1), _listing(2)])
+        return results, time.monotonic() - start
+
+    results, elapsed = asyncio.run(timed())
+
+    assert elapsed < 0.9
+    assert all(isinstance(d, _ShortDeadline) for d in deadlines)
+    for result in results:
+        assert result["explanation"] != "LLM explanation"
+        assert admission.LLM_EXPLAINER in result["degraded_engines"]
+
+
+def test_batch_results_stay_aligned_with_failures(pipeline, monkeypatch):
+    monkeypatch.setattr(pipeline, "_explain", lambda listing, prediction, deadline=None: ("ok", False))
+
+    results = asyncio.run(pipeline.analyze_batch([_listing(1), "not a url", _listing(2, listing_id="mine")]))
+
+    assert results[0]["explanation"] == "ok"
+    assert isinstance(results[1], ValueError)
+    assert results[2]["listing_id"] == "mine"
+    assert "listing_id" not in results[0]
+
+
+def test_vectorized_scoring_failure_scores_items_through_the_graph(pipeline, monkeypatch):
+    monkeypatch.setattr(pipeline, "_explain", lambda listing, prediction, deadline=None: ("ok", False))
+    predictor = pipeline._get_predictor()
+
+    vectorized = predictor.predict_batch
+
+    def broken(listings, contexts=None):
+        if len(listings) > 1:
+            raise RuntimeError("vectorized path down")
+        return vectorized(listings, contexts)
+
+    monkeypatch.setattr(predictor, "predict_batch", broken)
+    results = asyncio.run(pipeline.analyze_batch([_listing(1), _listing(2)]))
+    assert [r["explanation"] for r in results] == ["ok", "ok"]
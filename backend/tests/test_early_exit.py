@@ -0,0 +1,93 @@
+import asyncio
+import io
+import json
+
+import pytest
+
+from ai_layer.listing_context import ListingContext
+from services import analysis_graph, image_engine, risk_scorer, text_engine
+from services.argus_service import analyze_listing_form
+
+SPECIFIC = (
+    "Well maintained 2BHK on the third floor with lift, covered parking, two balconies, "
+    "modular kitchen and 24 hour water supply. Five minutes from the metro station."
+)
+PRESSURE = "Urgent! Pay token advance today to block this flat, many people interested."
+
+
+class _FakeBedrock:
+    def __init__(self):
+        self.calls = 0
+
+    def invoke_model(self, **kwargs):
+        self.calls += 1
+        text = json.dumps({"score": 40, "verdict": "Suspicious", "flags": [], "reasoning": "r"})
+        return {"body": io.BytesIO(json.dumps({"content": [{"text": text}]}).encode())}
+
+
+@pytest.fixture
+def bedrock(monkeypatch):
+    """Leave demo mode, with a fake Bedrock that counts calls."""
+    fake = _FakeBedrock()
+    monkeypatch.setenv("AWS_REGION", "ap-south-1")
+    monkeypatch.setattr(text_engine, "get_client", lambda service: fake)
+    monkeypatch.setattr(image_engine, "get_client", lambda service: fake)
+    monkeypatch.setattr(text_engine, "_result_cache", text_engine.AnalysisResultCache(ttl=0))
+    return fake
+
+
+def _analyze(price: int, description: str, image=None) -> dict:
+    listing = {
+        "title": "2BHK flat", "description": description, "price": price,
+        "locality": "Koramangala", "city": "Bangalore", "property_type": "2BHK",
+        "phone_number": None,
+    }
+    return asyncio.run(analyze_listing_form(listing, image))
+
+
+def test_text_estimate_goes_low_without_red_flags():
+    assert text_engine.local_text_analysis(ListingContext("2BHK flat", SPECIFIC))["score"] == text_engine.ESTIMATE_BASE
+    assert text_engine.local_text_analysis(ListingContext("2BHK flat", PRESSURE))["score"] >= 85
+
+
+def test_low_band_needs_a_verified_price():
+    genuine_text = {"score": 15}
+    no_image = analysis_graph.NO_IMAGE_RESULT
+    assert risk_scorer.early_exit_band({"score": 10, "market_median": 38000}, genuine_text, no_image, 5) == "low"
+    assert risk_scorer.early_exit_band({"score": 30, "market_median": None}, genuine_text, no_image, 5) is None
+
+
+def test_decisively_low_listing_skips_the_llm(bedrock):
+    results = _analyze(45000, SPECIFIC, image=(b"jpeg", "image/jpeg"))
+
+    assert results["screen"]["band"] == "low"
+    assert results["text"]["skipped"] and results["image"]["skipped"]
+    assert results["fusion"]["final_score"] <= risk_scorer.GENUINE_MAX
+    assert bedrock.calls == 0
+
+
+def test_decisively_high_listing_skips_the_llm(bedrock):
+    results = _analyze(15000, PRESSURE, image=(b"jpeg", "image/jpeg"))
+
+    assert results["screen"]["band"] == "high"
+    assert results["text"]["skipped"] and results["image"]["skipped"]
+    assert results["fusion"]["final_score"] > risk_scorer.SUSPICIOUS_MAX
+    assert bedrock.calls == 0
+
+
+def test_undecided_listing_runs_the_llm(bedrock):
+    results = _analyze(38000, "Urgent, call now. " + SPECIFIC)
+
+    assert results["screen"] is None
+    assert "skipped" not in results["text"]
+    assert bedrock.calls == 1
+
+
+def test_demo_mode_never_skips_the_free_engines(monkeypatch):
+    monkeypatch.delenv("AWS_REGION", raising=False)
+    monkeypatch.delenv("AWS_ACCESS_KEY_ID", raising=False)
+
+    results = _analyze(15000, PRESSURE)
+
+    assert results["screen"] is None
+    assert "skipped" not in results["text"]
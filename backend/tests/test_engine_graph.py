@@ -0,0 +1,156 @@
+import asyncio
+import time
+
+import pytest
+
+from ai_layer.engine_graph import Engine, EngineGraph
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_engines_start_as_soon_as_their_dependencies_finish():
+    events = []
+
+    def stage(name, delay):
+        async def fn(results):
+            events.append(f"start {name}")
+            await asyncio.sleep(delay)
+            events.append(f"end {name}")
+            return name
+        return fn
+
+    graph = EngineGraph([
+        Engine("a", stage("a", 0.05), deps=("x",)),
+        Engine("slow", stage("slow", 0.2), deps=("x",)),
+        Engine("b", stage("b", 0.0), deps=("a",)),
+        Engine("c", lambda r: (r["b"], r["slow"]), deps=("b", "slow")),
+    ])
+
+    results = run(graph.run({"x": 1}, targets=("c",)))
+
+    assert results["c"] == ("b", "slow")
+    # a and slow overlap; b does not wait for slow
+    assert events.index("start slow") < events.index("end a")
+    assert events.index("end b") < events.index("end slow")
+
+
+def test_plan_runs_only_what_targets_need_and_skips_provided_inputs():
+    calls = []
+    graph = EngineGraph([
+        Engine("listing", lambda r: calls.append("listing") or {"t": r["url"]}, deps=("url",)),
+        Engine("model", lambda r: calls.append("model") or 1, deps=("listing",)),
+        Engine("unused", lambda r: calls.append("unused"), deps=("url",)),
+    ])
+
+    assert graph.plan(("model",), provided=("url",)) == ["listing", "model"]
+    results = run(graph.run({"listing": {"t": "given"}}, targets=("model",)))
+    assert calls == ["model"]
+    assert results["listing"] == {"t": "given"}
+
+    with pytest.raises(KeyError):
+        graph.plan(("model",), provided=())
+
+
+def test_cycles_and_duplicates_are_rejected():
+    with pytest.raises(ValueError, match="cycle"):
+        EngineGraph([Engine("a", lambda r: 1, deps=("b",)), Engine("b", lambda r: 1, deps=("a",))])
+    with pytest.raises(ValueError, match="Duplicate"):
+        EngineGraph([Engine("a", lambda r: 1), Engine("a", lambda r: 2)])
+
+
+def test_timeout_uses_the_fallback():
+    async def slow(results):
+        await asyncio.sleep(5)
+
+    graph = EngineGraph([
+        Engine("slow", slow, timeout=0.05, fallback={"score": 50}),
+        Engine("blocking", lambda r: time.sleep(0.3), blocking=True, timeout=0.05, fallback={"score": 20}),
+        Engine("per_run", slow, timeout=lambda r: r["budget"], fallback=lambda r: {"budget": r["budget"]}),
+    ])
+
+    start = time.monotonic()
+    results = run(graph.run({"budget": 0.05}, targets=("slow", "blocking", "per_run")))
+
+    assert results["slow"] == {"score": 50}
+    assert results["blocking"] == {"score": 20}
+    assert results["per_run"] == {"budget": 0.05}
+    assert time.monotonic() - start < 1.0
+
+
+def test_fallback_is_copied_and_absorbs_errors():
+    fallback = {"score": 50}
+
+    def broken(results):
+        raise RuntimeError("engine down")
+
+    graph = EngineGraph([Engine("broken", broken, fallback=fallback)])
+    result = run(graph.run({}, targets=("broken",)))["broken"]
+
+    assert result == fallback and result is not fallback
+
+
+def test_error_without_fallback_fails_the_run_and_cancels_engines_in_flight():
+    cancelled = asyncio.Event()
+
+    async def long_running(results):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def failing(results):
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    graph = EngineGraph([Engine("long", long_running), Engine("fail", failing)])
+
+    async def scenario():
+        with pytest.raises(RuntimeError, match="boom"):
+            await graph.run({}, targets=("long", "fail"))
+        await asyncio.sleep(0)
+        return cancelled.is_set()
+
+    assert run(scenario()) is True
+
+
+def test_closing_iter_run_early_cancels_remaining_engines():
+    cancelled = asyncio.Event()
+
+    async def long_running(results):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    graph = EngineGraph([Engine("fast", lambda r: "done"), Engine("long", long_running)])
+
+    async def scenario():
+        stream = graph.iter_run({}, targets=("fast", "long"))
+        assert await stream.__anext__() == ("fast", "done")
+        await stream.aclose()          # e.g. the streaming client went away
+        await asyncio.sleep(0)
+        return cancelled.is_set()
+
+    assert run(scenario()) is True
+
+
+def test_iter_run_yields_in_completion_order():
+    def after(delay, value):
+        async def fn(results):
+            await asyncio.sleep(delay)
+            return value
+        return fn
+
+    graph = EngineGraph([
+        Engine("late", after(0.1, "late")),
+        Engine("early", after(0.01, "early")),
+    ])
+
+    async def scenario():
+        return [name async for name, _ in graph.iter_run({}, targets=("late", "early"))]
+
+    assert run(scenario()) == ["early", "late"]
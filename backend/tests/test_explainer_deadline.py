@@ -0,0 +1,79 @@
+import asyncio
+import io
+import json
+import time
+
+import pytest
+
+from ai_layer.deadline import Deadline
+from ai_layer.llm_explainer import explainer as explainer_module
+from ai_layer.llm_explainer.explainer import LLMExplainer
+from ai_layer.pipeline import ArgusAIPipeline
+
+LISTING = {"city": "bangalore", "price": 12000}
+PREDICTION = {
+    "listing_id": "l1",
+    "risk_level": "High Risk",
+    "risk_score": 0.9,
+    "features_used": {"price_vs_city_median": 0.4, "urgency_keyword_count": 2},
+}
+
+
+class _SlowBedrock:
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def invoke_model(self, **kwargs):
+        time.sleep(self.delay)
+        body = json.dumps({"content": [{"text": "LLM explanation"}]}).encode()
+        return {"body": io.BytesIO(body)}
+
+
+@pytest.fixture
+def bedrock(monkeypatch):
+    def install(delay: float):
+        client = _SlowBedrock(delay)
+        monkeypatch.setattr(explainer_module, "_bedrock_client", lambda: client)
+    return install
+
+
+def test_bedrock_answer_within_deadline_is_used(bedrock):
+    bedrock(0.0)
+    explainer = LLMExplainer(provider="bedrock")
+    assert explainer.explain(LISTING, PREDICTION, Deadline(5.0)) == "LLM explanation"
+
+
+def test_slow_bedrock_call_is_abandoned_at_the_deadline(bedrock):
+    bedrock(3.0)
+    explainer = LLMExplainer(provider="bedrock")
+
+    start = time.monotonic()
+    text = explainer.explain(LISTING, PREDICTION, Deadline(2.0))
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 2.0
+    assert text == explainer._fallback_explanation(LISTING, PREDICTION)
+
+
+def test_explanation_engine_falls_back_when_it_overruns_the_deadline(monkeypatch):
+    pipeline = ArgusAIPipeline(llm_provider="mock")
+
+    def stuck_explain(listing, prediction, deadline=None):
+        time.sleep(1.0)
+        return "too late", False
+
+    monkeypatch.setattr(pipeline, "_explain", stuck_explain)
+
+    async def run():
+        start = time.monotonic()
+        results = await pipeline.graph.run(
+            {"listing": LISTING, "model": PREDICTION, "deadline": Deadline(0.2)},
+            targets=("explanation",),
+        )
+        return results, time.monotonic() - start
+
+    results, elapsed = asyncio.run(run())
+    explanation, degraded = results["explanation"]
+    assert elapsed < 0.8
+    assert degraded is True
+    assert explanation == pipeline._get_explainer()._fallback_explanation(LISTING, PREDICTION)
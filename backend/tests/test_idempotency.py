@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+
+from services.idempotency import (
+    MAX_KEY_LENGTH,
+    IdempotencyKeyError,
+    IdempotencyStore,
+    request_fingerprint,
+)
+
+
+def _counting_compute():
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"run": len(calls)}
+
+    return compute, calls
+
+
+def test_same_key_replays_the_stored_response():
+    store = IdempotencyStore()
+    compute, calls = _counting_compute()
+    fingerprint = request_fingerprint("https://example.com/a")
+
+    async def scenario():
+        first = await store.run("url", "k1", fingerprint, compute)
+        second = await store.run("url", "k1", fingerprint, compute)
+        return first, second
+
+    assert asyncio.run(scenario()) == (({"run": 1}, False), ({"run": 1}, True))
+    assert len(calls) == 1
+
+
+def test_without_a_key_every_request_runs():
+    store = IdempotencyStore()
+    compute, calls = _counting_compute()
+
+    async def scenario():
+        return [await store.run("url", None, "f", compute) for _ in range(2)]
+
+    assert asyncio.run(scenario()) == [({"run": 1}, False), ({"run": 2}, False)]
+
+
+def test_concurrent_retry_shares_the_in_flight_run():
+    store = IdempotencyStore()
+    compute, calls = _counting_compute()
+
+    async def scenario():
+        return await asyncio.gather(*(store.run("url", "k1", "f", compute) for _ in range(3)))
+
+    results = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert [response for response, _ in results] == [{"run": 1}] * 3
+    assert sorted(replayed for _, replayed in results) == [False, True, True]
+
+
+def test_failures_are_not_stored():
+    store = IdempotencyStore()
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("engine down")
+        return {"ok": True}
+
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            await store.run("url", "k1", "f", flaky)
+        return await store.run("url", "k1", "f", flaky)
+
+    assert asyncio.run(scenario()) == ({"ok": True}, False)
+
+
+def test_key_reused_for_a_different_request_is_rejected():
+    store = IdempotencyStore()
+    compute, calls = _counting_compute()
+
+    async def scenario():
+        await store.run("url", "k1", request_fingerprint("https://example.com/a"), compute)
+        await store.run("url", "k1", request_fingerprint("https://example.com/b"), compute)
+
+    with pytest.raises(IdempotencyKeyError):
+        asyncio.run(scenario())
+    assert len(calls) == 1
+
+
+def test_keys_are_scoped_per_endpoint():
+    store = IdempotencyStore()
+    compute, calls = _counting_compute()
+
+    async def scenario():
+        await store.run("url", "k1", "f1", compute)
+        return await store.run("analyze", "k1", "f2", compute)
+
+    assert asyncio.run(scenario()) == ({"run": 2}, False)
+
+
+def test_overlong_key_is_rejected():
+    store = IdempotencyStore()
+    compute, calls = _counting_compute()
+    with pytest.raises(IdempotencyKeyError):
+        asyncio.run(store.run("url", "k" * (MAX_KEY_LENGTH + 1), "f", compute))
+    assert calls == []
+
+
+def test_fingerprint_hashes_bytes_by_content():
+    assert request_fingerprint({"a": 1, "b": 2}, b"img") == request_fingerprint({"b": 2, "a": 1}, b"img")
+    assert request_fingerprint({"a": 1}, b"img") != request_fingerprint({"a": 1}, b"other")
@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from services import jobs
+from services.jobs import (
+    JOB_FAILED,
+    JOB_SUCCEEDED,
+    InMemoryJobStore,
+    JobRunner,
+    QueueFullError,
+)
+
+
+def test_jobs_run_and_record_results_and_failures():
+    async def handler(url):
+        await asyncio.sleep(0.01)
+        if "bad" in url:
+            raise ValueError("unreachable listing")
+        return {"url": url}
+
+    async def scenario():
+        runner = JobRunner(handler, workers=2, max_queue=10)
+        await runner.start()
+        ok = runner.submit({"url": "https://example.com/a"})
+        bad = runner.submit({"url": "https://example.com/bad"})
+        await runner._queue.join()
+        await runner.stop()
+        return runner.get(ok), runner.get(bad)
+
+    ok, bad = asyncio.run(scenario())
+    assert ok["status"] == JOB_SUCCEEDED
+    assert ok["result"] == {"url": "https://example.com/a"}
+    assert ok["started_at"] <= ok["finished_at"]
+    assert bad["status"] == JOB_FAILED
+    assert bad["error"] == "unreachable listing"
+
+
+def test_worker_pool_bounds_concurrency():
+    running, peak = 0, 0
+
+    async def handler(n):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return {"n": n}
+
+    async def scenario():
+        runner = JobRunner(handler, workers=3, max_queue=20)
+        await runner.start()
+        for n in range(12):
+            runner.submit({"n": n})
+        await runner._queue.join()
+        await runner.stop()
+
+    asyncio.run(scenario())
+    assert peak == 3
+
+
+def test_full_queue_fails_fast_with_retry_after():
+    release = None
+
+    async def handler():
+        await release.wait()
+        return {}
+
+    async def scenario():
+        nonlocal release
+        release = asyncio.Event()
+        runner = JobRunner(handler, workers=1, max_queue=1, retry_after=7)
+        await runner.start()
+        runner.submit({})
+        await asyncio.sleep(0)   # the worker takes the first job
+        runner.submit({})
+        with pytest.raises(QueueFullError) as excinfo:
+            runner.submit({})
+        release.set()
+        await runner._queue.join()
+        await runner.stop()
+        return excinfo.value
+
+    assert asyncio.run(scenario()).retry_after == 7
+
+
+def test_submit_before_start_is_an_error():
+    async def handler():
+        return {}
+
+    with pytest.raises(RuntimeError):
+        JobRunner(handler).submit({})
+
+
+def test_finished_jobs_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(jobs.time, "time", lambda: now[0])
+    store = InMemoryJobStore(ttl=60)
+    store.create({"job_id": "j", "status": JOB_SUCCEEDED, "finished_at": now[0]})
+    assert store.get("j") is not None
+    now[0] += 61
+    store.create({"job_id": "k", "status": "queued", "finished_at": None})
+    assert store.get("j") is None
+    assert store.get("k") is not None
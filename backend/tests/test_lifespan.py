@@ -0,0 +1,31 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+import main
+from routers import analyze
+from services import warmup
+
+
+def test_shutdown_waits_for_the_cancelled_warmup(monkeypatch):
+    events = []
+
+    async def slow_warmup():
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            await asyncio.sleep(0.05)   # cleanup that still needs the loop
+            events.append("warmup cleaned up")
+            raise
+
+    stop_jobs = analyze.url_jobs.stop
+
+    async def stop():
+        events.append("jobs stopped")
+        await stop_jobs()
+
+    monkeypatch.setattr(warmup, "run_warmup", slow_warmup)
+    monkeypatch.setattr(analyze.url_jobs, "stop", stop)
+    with TestClient(main.app):
+        pass
+    assert events == ["warmup cleaned up", "jobs stopped"]
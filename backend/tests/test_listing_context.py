@@ -0,0 +1,55 @@
+import io
+import json
+
+import pytest
+
+from ai_layer.listing_context import ListingContext, parse_price
+from services import text_engine
+
+
+def test_derived_values():
+    ctx = ListingContext(
+        "URGENT 2BHK", "Pay token advance today. Urgent!", price="₹25,000",
+        city=" Bangalore ", locality="Koramangala",
+    )
+    assert ctx.price == 25000
+    assert ctx.city_key == "bangalore"
+    assert ctx.count(["urgent", "token"]) == 2
+    assert ctx.contains_any(["2bhk"]) is False
+    assert ctx.contains_any(["2bhk"], include_title=True) is True
+
+
+@pytest.mark.parametrize("value, expected", [(None, None), (True, None), (12.9, 12), ("Rs 1,200", 1200), ("n/a", None)])
+def test_parse_price(value, expected):
+    assert parse_price(value) == expected
+
+
+def test_content_hash_ignores_case_and_spacing_but_not_content():
+    base = ListingContext("Nice flat", "Near  the metro", contact_number="98")
+    assert base.content_hash == ListingContext("NICE FLAT", "near the\nmetro", contact_number="98").content_hash
+    assert base.content_hash != ListingContext("Nice flat", "Near the metro", contact_number="99").content_hash
+    assert base.content_hash != ListingContext("Nice flat", "Far from the metro", contact_number="98").content_hash
+
+
+class _FakeBedrock:
+    def __init__(self):
+        self.calls = 0
+
+    def invoke_model(self, **kwargs):
+        self.calls += 1
+        text = json.dumps({"score": 80, "verdict": "High Scam Risk", "flags": ["token"], "reasoning": "r"})
+        return {"body": io.BytesIO(json.dumps({"content": [{"text": text}]}).encode())}
+
+
+def test_text_engine_reuses_bedrock_result_for_the_same_text(monkeypatch):
+    bedrock = _FakeBedrock()
+    monkeypatch.setenv("AWS_REGION", "ap-south-1")
+    monkeypatch.setattr(text_engine, "get_client", lambda service: bedrock)
+    monkeypatch.setattr(text_engine, "_result_cache", text_engine.AnalysisResultCache(ttl=60, max_entries=8))
+
+    first = text_engine.analyze_text("Flat", "Pay token now", "98")
+    again = text_engine.analyze_text("FLAT", "pay  token now", "98")
+    other = text_engine.analyze_text("Flat", "Pay token now", "99")
+
+    assert first == again == other
+    assert bedrock.calls == 2
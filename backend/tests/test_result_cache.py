@@ -0,0 +1,122 @@
+import asyncio
+
+import pytest
+
+from services import result_cache
+from services.result_cache import AnalysisResultCache, canonicalize_url
+
+
+@pytest.mark.parametrize("variant", [
+    "https://www.Example.com/listing/42/",
+    "HTTPS://example.com:443/listing/42",
+    "https://example.com/listing/42?utm_source=wa&fbclid=x",
+    "https://example.com/listing/42#photos",
+])
+def test_url_variants_share_one_key(variant):
+    assert canonicalize_url(variant) == canonicalize_url("https://example.com/listing/42")
+
+
+def test_meaningful_query_params_are_kept_and_sorted():
+    assert canonicalize_url("https://example.com/s?b=2&a=1") == "https://example.com/s?a=1&b=2"
+    assert canonicalize_url("https://example.com/s?id=1") != canonicalize_url("https://example.com/s?id=2")
+    assert canonicalize_url("http://example.com:8080/x") == "http://example.com:8080/x"
+
+
+def _slow_compute(calls, result=None, error=None):
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        if error is not None:
+            raise error
+        return dict(result or {"run": len(calls)})
+
+    return compute
+
+
+def test_concurrent_requests_share_one_run():
+    cache = AnalysisResultCache()
+    calls = []
+
+    async def scenario():
+        compute = _slow_compute(calls)
+        return await asyncio.gather(*(cache.get_or_compute("k", compute) for _ in range(5)))
+
+    results = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert results == [{"run": 1}] * 5
+    stats = cache.stats()
+    assert (stats["misses"], stats["coalesced"]) == (1, 4)
+
+
+def test_callers_get_independent_copies():
+    cache = AnalysisResultCache()
+
+    async def scenario():
+        first = await cache.get_or_compute("k", _slow_compute([], {"signals": {"a": 1}}))
+        first["signals"]["a"] = 99
+        return await cache.get_or_compute("k", _slow_compute([]))
+
+    assert asyncio.run(scenario()) == {"signals": {"a": 1}}
+
+
+def test_failures_reach_every_waiter_and_are_not_cached():
+    cache = AnalysisResultCache()
+    calls = []
+
+    async def scenario():
+        failing = _slow_compute(calls, error=RuntimeError("scrape failed"))
+        outcomes = await asyncio.gather(
+            *(cache.get_or_compute("k", failing) for _ in range(3)), return_exceptions=True
+        )
+        retried = await cache.get_or_compute("k", _slow_compute(calls))
+        return outcomes, retried
+
+    outcomes, retried = asyncio.run(scenario())
+    assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+    assert retried == {"run": 2}
+
+
+def test_a_cancelled_waiter_does_not_cancel_the_shared_run():
+    cache = AnalysisResultCache()
+    calls = []
+
+    async def scenario():
+        compute = _slow_compute(calls)
+        leaver = asyncio.ensure_future(cache.get_or_compute("k", compute))
+        stayer = asyncio.ensure_future(cache.get_or_compute("k", compute))
+        await asyncio.sleep(0)
+        leaver.cancel()
+        return await stayer
+
+    assert asyncio.run(scenario()) == {"run": 1}
+    assert cache.get("k") == {"run": 1}
+
+
+def test_entries_expire_and_evict(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(result_cache.time, "monotonic", lambda: now[0])
+    cache = AnalysisResultCache(ttl=10, max_entries=2)
+    cache.put("a", {"v": 1})
+    cache.put("b", {"v": 2})
+    cache.get("a")
+    cache.put("c", {"v": 3})
+    assert cache.get("b") is None
+    assert cache.stats()["evictions"] == 1
+
+    now[0] += 11
+    assert cache.get("a") is None
+    assert cache.lookup("c") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_disabled_cache_always_computes():
+    cache = AnalysisResultCache(ttl=0)
+    calls = []
+
+    async def scenario():
+        compute = _slow_compute(calls)
+        await cache.get_or_compute("k", compute)
+        await cache.get_or_compute("k", compute)
+
+    asyncio.run(scenario())
+    assert len(calls) == 2
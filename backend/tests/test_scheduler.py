@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+
+from services import scheduler as scheduler_module
+from services.scheduler import BATCH, INTERACTIVE, FairScheduler, QuotaExceededError, TokenBucket
+
+
+def _grant_order(scheduler: FairScheduler, waiters: list[tuple[str, str, str]]) -> list[str]:
+    """Queue `waiters` (priority, client, tag) behind a held slot, release it, return grant order."""
+    order = []
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def hold():
+            async with scheduler.slot(INTERACTIVE, "holder"):
+                await release.wait()
+
+        async def wait_for_slot(priority, client, tag):
+            async with scheduler.slot(priority, client):
+                order.append(tag)
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        tasks = [asyncio.create_task(wait_for_slot(*w)) for w in waiters]
+        await asyncio.sleep(0)
+        assert scheduler.stats()["in_use"] == 1
+        release.set()
+        await asyncio.gather(holder, *tasks)
+
+    asyncio.run(scenario())
+    return order
+
+
+def test_weighted_fair_queuing_serves_classes_by_weight():
+    scheduler = FairScheduler(capacity=1, weights={INTERACTIVE: 2.0, BATCH: 1.0}, rate=0)
+    waiters = [(BATCH, "b", f"b{i}") for i in range(6)] + [(INTERACTIVE, "i", f"i{i}") for i in range(6)]
+
+    order = _grant_order(scheduler, waiters)
+
+    # While both classes are backlogged, interactive gets two of every three slots
+    first_six = order[:6]
+    assert sum(tag.startswith("i") for tag in first_six) == 4
+    assert sum(tag.startswith("b") for tag in first_six) == 2
+    # Batch is never starved and every waiter is eventually served in FIFO order per class
+    assert [t for t in order if t.startswith("b")] == [f"b{i}" for i in range(6)]
+    assert [t for t in order if t.startswith("i")] == [f"i{i}" for i in range(6)]
+    assert scheduler.stats()["in_use"] == 0
+
+
+def test_idle_class_restarts_at_current_virtual_time():
+    scheduler = FairScheduler(capacity=1, weights={INTERACTIVE: 1.0, BATCH: 1.0}, rate=0)
+    # Interactive alone runs far ahead in virtual time...
+    _grant_order(scheduler, [(INTERACTIVE, "i", f"warm{i}") for i in range(5)])
+
+    # ...but does not then lose out to a class that was idle all along
+    order = _grant_order(scheduler, [(BATCH, "b", "b0"), (BATCH, "b", "b1"), (INTERACTIVE, "i", "i0")])
+    assert order.index("i0") < order.index("b1")
+
+
+def test_round_robin_between_clients_within_a_class():
+    scheduler = FairScheduler(capacity=1, weights={INTERACTIVE: 1.0}, rate=0)
+    waiters = [(INTERACTIVE, "greedy", f"g{i}") for i in range(3)] + [(INTERACTIVE, "other", "o0"), (INTERACTIVE, "other", "o1")]
+
+    assert _grant_order(scheduler, waiters) == ["g0", "o0", "g1", "o1", "g2"]
+
+
+def test_cancelled_waiter_does_not_leak_its_slot():
+    scheduler = FairScheduler(capacity=1, weights={INTERACTIVE: 1.0}, rate=0)
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def hold():
+            async with scheduler.slot(INTERACTIVE, "holder"):
+                await release.wait()
+
+        async def wait_for_slot():
+            async with scheduler.slot(INTERACTIVE, "c"):
+                pass
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(wait_for_slot())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        release.set()
+        await holder
+        # The slot is free again and nobody is left queued
+        async with scheduler.slot(INTERACTIVE, "later"):
+            pass
+
+    asyncio.run(scenario())
+    assert scheduler.stats()["in_use"] == 0
+    assert scheduler.stats()["waiting"] == {INTERACTIVE: 0}
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(scheduler_module.time, "monotonic", clock)
+    return clock
+
+
+def test_token_bucket_refills_at_rate_up_to_burst(clock):
+    bucket = TokenBucket(rate=2.0, burst=4.0)
+    for _ in range(4):
+        assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == pytest.approx(0.5)
+
+    clock.now += 1.0          # two tokens back
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() > 0
+
+    clock.now += 60.0         # never more than the burst
+    for _ in range(4):
+        assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() > 0
+
+
+def test_check_quota_raises_with_retry_after_per_client(clock):
+    scheduler = FairScheduler(rate=0.5, burst=2.0)
+    scheduler.check_quota("a")
+    scheduler.check_quota("a")
+    with pytest.raises(QuotaExceededError) as exc:
+        scheduler.check_quota("a")
+    assert exc.value.retry_after == 2
+    # Quotas are per client
+    scheduler.check_quota("b")
+    clock.now += 2.0
+    scheduler.check_quota("a")
+    assert scheduler.stats()["quota_rejections"] == 1
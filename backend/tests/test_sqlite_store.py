@@ -0,0 +1,96 @@
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from routers import submissions as submissions_router
+from services.submission_cache import submission_read_cache
+from services.submission_store import InvalidCursorError, SQLiteSubmissionRepository, create_repository
+
+
+def _item(listing_id, timestamp, city="Pune", risk_level="High Risk"):
+    return {
+        "listing_id": listing_id,
+        "timestamp": timestamp,
+        "city": city,
+        "risk_level": risk_level,
+        "final_score": Decimal("81.5"),
+    }
+
+
+ITEMS = [
+    _item("a", "2026-10-18T09:00:00"),
+    _item("b", "2026-10-18T09:00:00", risk_level="Suspicious"),  # same timestamp as "a"
+    _item("c", "2026-10-17T20:00:00", city="Mumbai"),
+    _item("d", "2026-10-16T08:00:00", risk_level="Suspicious"),
+    _item("e", "2026-10-15T07:00:00", city="mumbai"),
+]
+
+
+@pytest.fixture
+def repository(tmp_path):
+    repository = SQLiteSubmissionRepository(tmp_path / "subs.db")
+    repository.put_batch(ITEMS)
+    return repository
+
+
+def _all_pages(repository, **kwargs):
+    pages, cursor = [], None
+    while True:
+        items, cursor = repository.list(cursor=cursor, **kwargs)
+        pages.append([item["listing_id"] for item in items])
+        if cursor is None:
+            return pages
+
+
+def test_keyset_pages_are_newest_first_without_gaps(repository):
+    assert _all_pages(repository, limit=2) == [["b", "a"], ["c", "d"], ["e"]]
+
+
+def test_filters(repository):
+    assert _all_pages(repository, limit=1, city="MUMBAI") == [["c"], ["e"]]
+    assert _all_pages(repository, limit=5, risk_level="Suspicious") == [["b", "d"]]
+
+
+def test_items_round_trip(repository):
+    item = repository.get("a")
+    assert item["final_score"] == 81.5
+    assert item["city"] == "Pune"
+    assert repository.get("missing") is None
+
+
+def test_invalid_cursor(repository):
+    with pytest.raises(InvalidCursorError):
+        repository.list(cursor="bm90IGpzb24")
+
+
+def test_create_repository_picks_sqlite_without_aws(monkeypatch):
+    monkeypatch.delenv("AWS_ACCESS_KEY_ID", raising=False)
+    monkeypatch.delenv("AWS_REGION", raising=False)
+    assert create_repository("auto").name == "sqlite"
+
+
+def test_list_endpoint_pages_with_cursor(repository, monkeypatch):
+    monkeypatch.setattr(submissions_router, "get_repository", lambda: repository)
+    submission_read_cache.clear()
+    with TestClient(main.app) as client:
+        first = client.get("/submissions/", params={"limit": 3}).json()
+        assert [s["listing_id"] for s in first["submissions"]] == ["b", "a", "c"]
+        second = client.get("/submissions/", params={"limit": 3, "cursor": first["next_cursor"]}).json()
+        assert [s["listing_id"] for s in second["submissions"]] == ["d", "e"]
+        assert second["next_cursor"] is None
+        assert client.get("/submissions/", params={"cursor": "%%%"}).status_code == 400
+    submission_read_cache.clear()
+
+
+def test_list_endpoint_clamps_oversized_limits(repository, monkeypatch):
+    monkeypatch.setattr(submissions_router, "get_repository", lambda: repository)
+    monkeypatch.setattr(submissions_router, "MAX_PAGE_SIZE", 2)
+    submission_read_cache.clear()
+    with TestClient(main.app) as client:
+        r = client.get("/submissions/", params={"limit": 500})
+        assert r.status_code == 200
+        assert [s["listing_id"] for s in r.json()["submissions"]] == ["b", "a"]
+        assert client.get("/submissions/", params={"limit": 0}).status_code == 422
+    submission_read_cache.clear()
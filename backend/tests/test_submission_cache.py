@@ -0,0 +1,157 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from routers import submissions as submissions_router
+from services import submission_writer
+from services.submission_cache import CachedResponse, SubmissionReadCache, submission_read_cache
+from services.submission_store import SQLiteSubmissionRepository
+
+
+def _renderer(content):
+    calls = []
+
+    def render():
+        calls.append(1)
+        return content
+
+    return render, calls
+
+
+def test_etag_depends_only_on_content():
+    a = CachedResponse.render({"a": 1, "b": [1, 2]})
+    b = CachedResponse.render({"b": [1, 2], "a": 1})
+    assert a.body == b.body and a.etag == b.etag
+    assert CachedResponse.render({"a": 2}).etag != a.etag
+
+
+def test_if_none_match_uses_weak_comparison():
+    response = CachedResponse.render({"a": 1})
+    assert response.matches(response.etag)
+    assert response.matches(f"W/{response.etag}")
+    assert response.matches(f'"other", {response.etag}')
+    assert response.matches("*")
+    assert not response.matches('"other"')
+    assert not response.matches(None)
+
+
+def test_hit_skips_render():
+    cache = SubmissionReadCache()
+    render, calls = _renderer({"a": 1})
+    first = cache.get_or_render(("item", "x"), render)
+    second = cache.get_or_render(("item", "x"), render)
+    assert second is first
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_disabled_cache_renders_every_time():
+    cache = SubmissionReadCache(ttl=0)
+    render, calls = _renderer({"a": 1})
+    cache.get_or_render(("stats",), render)
+    cache.get_or_render(("stats",), render)
+    assert len(calls) == 2
+
+
+def test_render_errors_are_not_cached():
+    cache = SubmissionReadCache()
+
+    def missing():
+        raise LookupError("gone")
+
+    with pytest.raises(LookupError):
+        cache.get_or_render(("item", "x"), missing)
+    assert cache.get(("item", "x")) is None
+
+
+def test_invalidate_drops_written_items_and_aggregates():
+    cache = SubmissionReadCache()
+    for key in [("item", "a"), ("item", "b"), ("list", 10, None, None, None), ("stats",)]:
+        cache.get_or_render(key, lambda: {"key": list(key)})
+
+    cache.invalidate([{"listing_id": "a"}])
+    assert cache.get(("item", "a")) is None
+    assert cache.get(("list", 10, None, None, None)) is None
+    assert cache.get(("stats",)) is None
+    assert cache.get(("item", "b")) is not None
+
+
+def test_render_racing_a_write_is_not_stored():
+    cache = SubmissionReadCache()
+
+    def render():
+        # The write lands while the old data is being rendered
+        cache.invalidate([{"listing_id": "a"}])
+        return {"stale": True}
+
+    cache.get_or_render(("item", "a"), render)
+    assert cache.get(("item", "a")) is None
+
+
+def test_lru_eviction():
+    cache = SubmissionReadCache(max_entries=2)
+    cache.get_or_render(("item", "a"), lambda: 1)
+    cache.get_or_render(("item", "b"), lambda: 2)
+    cache.get(("item", "a"))
+    cache.get_or_render(("item", "c"), lambda: 3)
+    assert cache.get(("item", "b")) is None
+    assert cache.get(("item", "a")) is not None
+    assert cache.stats()["evictions"] == 1
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    repository = SQLiteSubmissionRepository(tmp_path / "cache.db")
+    monkeypatch.setattr(submissions_router, "get_repository", lambda: repository)
+    monkeypatch.setattr(submission_writer, "get_repository", lambda: repository)
+    submission_read_cache.clear()
+    with TestClient(main.app) as client:
+        yield client
+    submission_read_cache.clear()
+
+
+def _item(listing_id, risk_level="High Risk"):
+    return {
+        "listing_id": listing_id,
+        "timestamp": "2026-10-18T10:00:00",
+        "city": "Pune",
+        "risk_level": risk_level,
+        "final_score": 80,
+    }
+
+
+def test_endpoint_revalidates_with_304(client):
+    submission_writer._persist([_item("a")])
+
+    r = client.get("/submissions/a")
+    assert r.status_code == 200
+    assert r.headers["cache-control"] == "no-cache"
+    etag = r.headers["etag"]
+
+    r = client.get("/submissions/a", headers={"If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.headers["etag"] == etag
+    assert r.content == b""
+
+
+def test_write_invalidates_cached_responses(client):
+    submission_writer._persist([_item("a")])
+    item = client.get("/submissions/a")
+    stats = client.get("/submissions/stats")
+    assert stats.json()["total"] == 1
+
+    submission_writer._persist([_item("a", risk_level="Suspicious"), _item("b")])
+
+    r = client.get("/submissions/a", headers={"If-None-Match": item.headers["etag"]})
+    assert r.status_code == 200
+    assert r.json()["risk_level"] == "Suspicious"
+    r = client.get("/submissions/stats", headers={"If-None-Match": stats.headers["etag"]})
+    assert r.status_code == 200
+    assert r.json()["total"] == 2
+
+
+def test_missing_submission_is_not_cached(client):
+    assert client.get("/submissions/late").status_code == 404
+    # Written by another process sharing the store: no invalidation reaches this cache
+    submissions_router.get_repository().put_batch([_item("late")])
+    assert client.get("/submissions/late").status_code == 200
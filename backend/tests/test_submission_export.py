@@ -0,0 +1,110 @@
+"""Exports read back to the stored submissions, in both formats."""
+
+import io
+import json
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from routers import submissions as submissions_router
+from services import submission_export
+from services.submission_export import EXPORT_COLUMNS, export_chunks
+from services.submission_store import SQLiteSubmissionRepository
+
+
+def _items(count):
+    return [
+        {
+            "listing_id": f"sub-{i:03d}",
+            "timestamp": f"2026-10-18T10:{i // 60:02d}:{i % 60:02d}",
+            "city": "Pune",
+            "city_key": "pune",
+            "locality": "Baner",
+            "property_type": "2BHK",
+            "price": Decimal(20000 + i),
+            "final_score": Decimal("42.5"),
+            "risk_level": "Suspicious",
+            "title": f"Flat {i}",
+            "extra": {"source": "test"},
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def repository(tmp_path, monkeypatch):
+    repository = SQLiteSubmissionRepository(tmp_path / "export.db")
+    repository.put_batch(_items(25))
+    monkeypatch.setattr(submissions_router, "get_repository", lambda: repository)
+    return repository
+
+
+def test_ndjson_round_trip(repository):
+    lines = b"".join(export_chunks(repository, "ndjson", batch_size=10)).decode().splitlines()
+    rows = [json.loads(line) for line in lines]
+    assert [row["listing_id"] for row in rows] == [f"sub-{i:03d}" for i in range(25)]
+    assert rows[3]["price"] == 20003
+    assert rows[3]["extra"] == {"source": "test"}
+
+
+def test_parquet_round_trip(repository):
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    data = b"".join(export_chunks(repository, "parquet", batch_size=10))
+    parquet = pq.ParquetFile(io.BytesIO(data))
+    # One row group per batch read from the store
+    assert parquet.num_row_groups == 3
+    table = parquet.read()
+    assert table.column_names == list(EXPORT_COLUMNS)
+    rows = table.to_pylist()
+    assert [row["listing_id"] for row in rows] == [f"sub-{i:03d}" for i in range(25)]
+    assert rows[3]["price"] == 20003.0
+    assert rows[3]["final_score"] == 42.5
+    assert rows[3]["verdict"] is None
+
+
+def test_parquet_endpoint_round_trip(repository):
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    with TestClient(main.app) as client:
+        r = client.get("/submissions/export", params={"format": "parquet"})
+    assert r.status_code == 200
+    assert r.headers["content-disposition"] == 'attachment; filename="submissions.parquet"'
+    table = pq.read_table(io.BytesIO(r.content))
+    assert table.num_rows == 25
+
+
+def test_unknown_format_is_rejected(repository):
+    with TestClient(main.app) as client:
+        r = client.get("/submissions/export", params={"format": "csv"})
+    assert r.status_code == 400
+
+
+def test_cli_loads_dotenv_before_choosing_the_store(tmp_path, monkeypatch):
+    env_store = tmp_path / "from-dotenv.db"
+    SQLiteSubmissionRepository(env_store).put_batch(_items(3))
+
+    def load_env():
+        # Stands in for .env: the store only exists in the loaded settings
+        monkeypatch.setenv("SUBMISSION_STORE", "sqlite")
+        monkeypatch.setenv("SQLITE_SUBMISSIONS_PATH", str(env_store))
+        monkeypatch.setenv("SUBMISSIONS_EXPORT_BATCH_SIZE", "2")
+
+    monkeypatch.delenv("SUBMISSION_STORE", raising=False)
+    monkeypatch.delenv("SQLITE_SUBMISSIONS_PATH", raising=False)
+    monkeypatch.setattr(submission_export, "load_env", load_env)
+    batches = []
+    original = SQLiteSubmissionRepository.export_batches
+
+    def export_batches(self, batch_size=1000):
+        batches.append(batch_size)
+        return original(self, batch_size)
+
+    monkeypatch.setattr(SQLiteSubmissionRepository, "export_batches", export_batches)
+
+    output = tmp_path / "out.ndjson"
+    assert submission_export.main(["--output", str(output)]) == 0
+    assert len(output.read_text().splitlines()) == 3
+    assert batches == [2]
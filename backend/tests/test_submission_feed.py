@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+
+from decimal import Decimal
+
+from services import submission_writer
+from services.submission_feed import SubmissionFeed, submission_feed
+
+
+def _collect(feed: SubmissionFeed, since, count: int) -> list:
+    async def scenario():
+        events = []
+        async for event in feed.subscribe(since):
+            events.append(event)
+            if len(events) == count:
+                break
+        return events
+
+    return asyncio.run(scenario())
+
+
+def test_replay_resumes_after_last_event_id():
+    feed = SubmissionFeed(replay_size=3, first_id=1)
+    for n in range(5):
+        feed.publish({"n": n})
+
+    # Only the last three are kept; ids keep increasing
+    assert _collect(feed, 0, 3) == [(3, {"n": 2}), (4, {"n": 3}), (5, {"n": 4})]
+    assert _collect(feed, 4, 1) == [(5, {"n": 4})]
+
+
+def test_live_events_reach_subscribers_from_other_threads():
+    feed = SubmissionFeed(heartbeat=5, first_id=1)
+
+    async def scenario():
+        received = []
+
+        async def subscriber():
+            async for event in feed.subscribe(None):
+                received.append(event)
+                return
+
+        task = asyncio.create_task(subscriber())
+        await asyncio.sleep(0.01)
+        await asyncio.to_thread(feed.publish, {"listing_id": "x"})
+        await asyncio.wait_for(task, timeout=2)
+        return received
+
+    assert asyncio.run(scenario()) == [(1, {"listing_id": "x"})]
+
+
+def test_slow_subscriber_is_disconnected():
+    feed = SubmissionFeed(max_pending=2, heartbeat=5, first_id=1)
+
+    async def scenario():
+        stream = feed.subscribe(None)
+        first = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0.01)
+        for n in range(5):
+            feed.publish({"n": n})
+        assert await first == (1, {"n": 0})
+        rest = [event async for event in stream]
+        return rest
+
+    asyncio.run(scenario())
+    assert feed.stats()["disconnected_slow"] == 1
+
+
+def test_ids_keep_increasing_across_restarts():
+    before = SubmissionFeed()
+    last_seen = before.publish({"n": 0})
+    # A later process (restart, deploy) starts from a later epoch
+    after = SubmissionFeed(first_id=last_seen + 1000)
+    assert after.publish({"n": 1}) > last_seen
+
+
+def test_last_event_id_from_an_earlier_process_replays_everything():
+    # The client's id is from a process whose counter was ahead of this one
+    feed = SubmissionFeed(heartbeat=5, first_id=1)
+    feed.publish({"n": 0})
+
+    async def scenario():
+        events = []
+        async for event in feed.subscribe(5000):
+            events.append(event)
+            if len(events) == 1:
+                await asyncio.to_thread(feed.publish, {"n": 1})
+            else:
+                return events
+
+    assert asyncio.run(scenario()) == [(1, {"n": 0}), (2, {"n": 1})]
+
+
+class _Repository:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.saved = []
+
+    def put_batch(self, items):
+        if self.fail:
+            raise RuntimeError("store down")
+        self.saved.extend(items)
+
+
+def test_items_are_published_only_once_persisted(monkeypatch):
+    repo = _Repository(fail=True)
+    monkeypatch.setattr(submission_writer, "get_repository", lambda: repo)
+    before = submission_feed.stats()["last_event_id"]
+    item = {"listing_id": "feed-1", "final_score": Decimal("72"), "price": Decimal("12.5")}
+
+    with pytest.raises(RuntimeError):
+        submission_writer._persist([item])
+    assert submission_feed.stats()["last_event_id"] == before
+
+    repo.fail = False
+    submission_writer._persist([item])
+    assert repo.saved == [item]
+    event = _collect(submission_feed, before, 1)[0]
+    # Published with plain JSON numbers, not the store's Decimals
+    assert event == (before + 1, {"listing_id": "feed-1", "final_score": 72, "price": 12.5})
@@ -0,0 +1,190 @@
+"""Submission counters stay equal to a recount of the stored rows, overwrites included."""
+
+import sqlite3
+from collections import Counter
+from contextlib import contextmanager
+
+import pytest
+
+from services import dynamo_submissions
+from services.argus_service import format_result
+from services.submission_stats import batch_deltas
+from services.submission_store import SQLiteSubmissionRepository
+
+
+def _item(listing_id, risk_level="High Risk", score=80, city="Pune"):
+    return {
+        "listing_id": listing_id,
+        "timestamp": "2026-10-18T10:00:00",
+        "city": city,
+        "locality": "Baner",
+        "risk_level": risk_level,
+        "final_score": score,
+    }
+
+
+def _recount(path):
+    """Stats as a fresh rebuild from the stored rows computes them."""
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("DELETE FROM submission_stats")
+    conn.close()
+    return SQLiteSubmissionRepository(path).stats()
+
+
+def test_overwrite_replaces_the_previous_contribution(tmp_path):
+    path = tmp_path / "subs.db"
+    repo = SQLiteSubmissionRepository(path)
+    repo.put_batch([_item("a"), _item("b")])
+    repo.put_batch([_item("a", risk_level="Likely Genuine", score=10)])
+
+    stats = repo.stats()
+    assert stats["total"] == 2
+    assert stats["by_risk_level"]["High Risk"] == 1
+    assert stats["by_risk_level"]["Likely Genuine"] == 1
+    assert stats["score_histogram"]["80-89"] == 1
+    assert stats["score_histogram"]["10-19"] == 1
+    assert stats["cities"]["pune"]["localities"]["baner"]["total"] == 2
+    assert stats == _recount(path)
+
+
+def test_repeated_id_within_a_batch_counts_once(tmp_path):
+    path = tmp_path / "subs.db"
+    repo = SQLiteSubmissionRepository(path)
+    repo.put_batch([_item("a"), _item("a", risk_level="Suspicious", score=50), _item("a", score=95)])
+
+    stats = repo.stats()
+    assert stats["total"] == 1
+    assert stats["by_risk_level"] == {"High Risk": 1, "Suspicious": 0, "Likely Genuine": 0}
+    assert stats["score_histogram"]["90-100"] == 1
+    assert stats == _recount(path)
+
+
+def test_overwrite_moving_city_moves_the_counts(tmp_path):
+    path = tmp_path / "subs.db"
+    repo = SQLiteSubmissionRepository(path)
+    repo.put_batch([_item("a", city="Pune")])
+    repo.put_batch([_item("a", city="Mumbai")])
+
+    stats = repo.stats()
+    assert stats["total"] == 1
+    assert stats["cities"]["pune"]["total"] == 0
+    assert stats["cities"]["mumbai"]["total"] == 1
+    assert stats["total"] == _recount(path)["total"]
+
+
+def test_batch_deltas_drops_changes_that_cancel_out():
+    assert batch_deltas([_item("a")], [_item("a")]) == {}
+    deltas = batch_deltas([_item("a", risk_level="Suspicious")], [_item("a")])
+    assert deltas[("all", "risk:Suspicious")] == 1
+    assert deltas[("all", "risk:High Risk")] == -1
+    assert ("all", "total") not in deltas
+
+
+class _FakeDynamoDB:
+    """Submissions table, stats table and BatchGetItem, in memory."""
+
+    def __init__(self):
+        self.items = {}
+        self.counters = Counter()
+        self.batch_gets = 0
+        self.writers = 0
+        self.fail_after = None   # puts that land before the next batch_writer fails
+        self.unprocessed_once = False
+        self.name = "argus-submissions"
+
+    def table(self, name=None):
+        return self
+
+    # Table
+    @contextmanager
+    def batch_writer(self, overwrite_by_pkeys=None):
+        self.writers += 1
+        buffer = {}
+
+        class Writer:
+            def put_item(_, Item):
+                buffer[Item["listing_id"]] = Item
+
+        yield Writer()
+        for landed, item in enumerate(buffer.values()):
+            if self.fail_after is not None and landed >= self.fail_after:
+                self.fail_after = None
+                raise RuntimeError("throttled")
+            self.items[item["listing_id"]] = item
+
+    def update_item(self, Key, UpdateExpression, ExpressionAttributeNames, ExpressionAttributeValues):
+        for i in range(len(ExpressionAttributeNames)):
+            metric = ExpressionAttributeNames[f"#m{i}"]
+            self.counters[(Key["scope"], metric)] += ExpressionAttributeValues[f":v{i}"]
+
+    # Resource
+    def batch_get_item(self, RequestItems):
+        self.batch_gets += 1
+        keys = RequestItems[self.name]["Keys"]
+        if self.unprocessed_once:
+            self.unprocessed_once = False
+            return {"Responses": {self.name: []}, "UnprocessedKeys": RequestItems}
+        found = [self.items[k["listing_id"]] for k in keys if k["listing_id"] in self.items]
+        return {"Responses": {self.name: found}, "UnprocessedKeys": {}}
+
+    def recount(self):
+        return batch_deltas(self.items.values())
+
+    def counted(self):
+        return {key: n for key, n in self.counters.items() if n}
+
+
+@pytest.fixture
+def dynamodb(monkeypatch):
+    fake = _FakeDynamoDB()
+    monkeypatch.setattr(dynamo_submissions, "get_table", fake.table)
+    monkeypatch.setattr(dynamo_submissions, "get_resource", lambda service: fake)
+    monkeypatch.setattr(dynamo_submissions.time, "sleep", lambda seconds: None)
+    return fake
+
+
+def test_dynamodb_overwrites_keep_counters_equal_to_a_recount(dynamodb):
+    repo = dynamo_submissions.DynamoDBSubmissionRepository()
+    repo.put_batch([_item("a"), _item("b")])
+    repo.put_batch([
+        _item("a", risk_level="Likely Genuine", score=10),
+        _item("c"),
+        _item("c", risk_level="Suspicious", score=55),
+    ])
+
+    assert dynamodb.counted() == dynamodb.recount()
+    assert dynamodb.counted()[("all", "total")] == 3
+    # Still one batch_writer pass and one BatchGetItem per flush
+    assert (dynamodb.writers, dynamodb.batch_gets) == (2, 2)
+
+
+def test_dynamodb_partial_failure_then_retry_counts_every_item_once(dynamodb):
+    repo = dynamo_submissions.DynamoDBSubmissionRepository()
+    repo.put_batch([_item("old")])
+    batch = [_item(f"n{i}") for i in range(10)] + [_item("old", risk_level="Suspicious")]
+
+    dynamodb.fail_after = 4
+    with pytest.raises(RuntimeError):
+        repo.put_batch(batch)
+    assert dynamodb.counted() == dynamodb.recount()
+
+    repo.put_batch(batch)   # the write-behind queue's retry
+    assert dynamodb.counted() == dynamodb.recount()
+    assert dynamodb.counted()[("all", "total")] == 11
+
+
+def test_dynamodb_unprocessed_keys_are_asked_for_again(dynamodb):
+    repo = dynamo_submissions.DynamoDBSubmissionRepository()
+    repo.put_batch([_item("a")])
+    dynamodb.unprocessed_once = True
+    repo.put_batch([_item("a", risk_level="Suspicious")])
+    assert dynamodb.counted() == dynamodb.recount()
+
+
+def test_url_results_get_a_submission_id():
+    first = format_result({"risk_score": 0.1})
+    second = format_result({"risk_score": 0.1})
+    assert first["listing_id"] not in ("", "unknown")
+    assert first["listing_id"] != second["listing_id"]
+    assert format_result({"listing_id": "given"})["listing_id"] == "given"
@@ -0,0 +1,79 @@
+import threading
+
+import pytest
+
+from services import submission_writer
+from services.submission_writer import WriteBehindQueue
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record backoff sleeps instead of taking them; no jitter."""
+    delays = []
+    monkeypatch.setattr(submission_writer.time, "sleep", delays.append)
+    monkeypatch.setattr(submission_writer.random, "uniform", lambda a, b: 0.0)
+    return delays
+
+
+def _flaky_sink(failures):
+    batches = []
+
+    def sink(batch):
+        if len(batches) < failures:
+            batches.append(None)
+            raise RuntimeError("store unavailable")
+        batches.append(list(batch))
+
+    return sink, batches
+
+
+def test_failed_flush_retries_with_exponential_backoff(sleeps):
+    sink, batches = _flaky_sink(failures=3)
+    writer = WriteBehindQueue(sink, max_retries=5, backoff_base=0.2)
+    writer._flush([{"listing_id": "a"}])
+
+    assert batches[-1] == [{"listing_id": "a"}]
+    assert sleeps == pytest.approx([0.2, 0.4, 0.8])
+    stats = writer.stats()
+    assert (stats["written"], stats["failed"], stats["flushes"]) == (1, 0, 1)
+
+
+def test_gives_up_after_max_retries(sleeps):
+    sink, batches = _flaky_sink(failures=99)
+    writer = WriteBehindQueue(sink, max_retries=3, backoff_base=0.1)
+    writer._flush([{"listing_id": "a"}, {"listing_id": "b"}])
+
+    assert len(batches) == 3
+    # No sleep after the last attempt
+    assert sleeps == pytest.approx([0.1, 0.2])
+    stats = writer.stats()
+    assert (stats["written"], stats["failed"], stats["flushes"]) == (0, 2, 0)
+
+
+def test_stop_drains_everything_queued():
+    written = []
+    lock = threading.Lock()
+
+    def sink(batch):
+        with lock:
+            written.append(len(batch))
+
+    writer = WriteBehindQueue(sink, max_batch=25, flush_interval=0.2)
+    for i in range(60):
+        assert writer.enqueue({"listing_id": str(i)})
+    writer.start()
+    writer.stop(timeout=5.0)
+
+    assert sum(written) == 60
+    assert max(written) <= 25
+    assert writer.stats()["queue_depth"] == 0
+    assert writer.stats()["written"] == 60
+
+
+def test_enqueue_drops_when_the_queue_is_full():
+    writer = WriteBehindQueue(lambda batch: None, max_queue=2)
+    assert writer.enqueue({"listing_id": "a"})
+    assert writer.enqueue({"listing_id": "b"})
+    assert not writer.enqueue({"listing_id": "c"})
+    stats = writer.stats()
+    assert (stats["enqueued"], stats["dropped"], stats["queue_depth"]) == (2, 1, 2)
@@ -0,0 +1,52 @@
+import io
+import json
+
+import pytest
+
+from ai_layer.listing_context import ListingContext
+from services import text_engine
+
+
+class _FakeBedrock:
+    def __init__(self):
+        self.models = []
+
+    def invoke_model(self, modelId, body):
+        self.models.append(modelId)
+        text = json.dumps({"score": 70, "verdict": "Suspicious", "flags": [], "reasoning": "r"})
+        return {"body": io.BytesIO(json.dumps({"content": [{"text": text}]}).encode())}
+
+
+@pytest.fixture
+def bedrock(monkeypatch):
+    fake = _FakeBedrock()
+    monkeypatch.setenv("AWS_REGION", "ap-south-1")
+    monkeypatch.setattr(text_engine, "get_client", lambda service: fake)
+    monkeypatch.setattr(text_engine, "_result_cache", text_engine.AnalysisResultCache(ttl=60))
+    return fake
+
+
+def _analyze(description="Pay token advance today, WhatsApp only"):
+    return text_engine.analyze_text("2BHK flat", description, context=ListingContext("2BHK flat", description))
+
+
+def test_identical_text_is_sent_to_bedrock_once(bedrock):
+    assert _analyze() == _analyze()
+    assert len(bedrock.models) == 1
+    _analyze("A different description")
+    assert len(bedrock.models) == 2
+
+
+def test_cached_verdicts_do_not_survive_a_model_change(bedrock, monkeypatch):
+    monkeypatch.setenv("BEDROCK_MODEL_ID", "model-a")
+    _analyze()
+    monkeypatch.setenv("BEDROCK_MODEL_ID", "model-b")
+    _analyze()
+    assert bedrock.models == ["model-a", "model-b"]
+
+
+def test_cached_verdicts_do_not_survive_a_prompt_change(bedrock, monkeypatch):
+    _analyze()
+    monkeypatch.setattr(text_engine, "PROMPT_VERSION", "edited")
+    _analyze()
+    assert len(bedrock.models) == 2
@@ -28,3 +28,16 @@ export const getSubmissionById = async (listingId) => {
   const response = await api.get(`/submissions/${listingId}`);
   return response.data;
 };
+
+// Live feed of new submissions (Server-Sent Events) — use instead of polling
+// getRecentSubmissions. EventSource reconnects on its own and resumes from the
+// last event it saw. Returns a function that closes the feed.
+export const subscribeToSubmissions = (onSubmission, { since } = {}) => {
+  const url = new URL('/submissions/feed', API_URL);
+  if (since !== undefined) url.searchParams.set('since', since);
+  const source = new EventSource(url);
+  source.addEventListener('submission', (event) => {
+    onSubmission(JSON.parse(event.data));
+  });
+  return () => source.close();
+};